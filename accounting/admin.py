@@ -3,6 +3,7 @@ from accounting.models.chart import Account
 from accounting.models.journal import Journal, JournalLine
 from accounting.models.period_lock import AccountingPeriodLock
 from accounting.models.settings import  AccountingSettings
+from accounting.models.balance import AccountDailyBalance
 
 
 @admin.register(AccountingPeriodLock)
@@ -13,4 +14,10 @@ class AccountingPeriodLockAdmin(admin.ModelAdmin):
 
 @admin.register(AccountingSettings)
 class AccountingSettingsAdmin(admin.ModelAdmin):
-    list_display = ("active_fiscal_year",)
\ No newline at end of file
+    list_display = ("active_fiscal_year",)
+
+@admin.register(AccountDailyBalance)
+class AccountDailyBalanceAdmin(admin.ModelAdmin):
+    list_display = ("account", "date", "debit", "credit")
+    list_filter = ("date",)
+    search_fields = ("account__code", "account__name")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from accounting.services.balances import rebuild_balances
+
+
+class Command(BaseCommand):
+    help = "Rebuild AccountDailyBalance snapshot from posted journal lines"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        written = rebuild_balances(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Account balances rebuilt. rows={written}"))
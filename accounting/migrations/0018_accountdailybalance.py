@@ -0,0 +1,41 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:09
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+def backfill_daily_balances(apps, schema_editor):
+    # logika sama persis dengan command rebuild_account_balances
+    from accounting.services.balances import rebuild_balances_for
+
+    rebuild_balances_for(
+        apps.get_model("accounting", "AccountDailyBalance"),
+        apps.get_model("accounting", "JournalLine"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0017_accountingsettings_auto_create_job_costing_journal_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountDailyBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('debit', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=18)),
+                ('credit', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=18)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_balances', to='accounting.account')),
+            ],
+            options={
+                'ordering': ['account_id', 'date'],
+                'indexes': [models.Index(fields=['date', 'account'], name='accounting__date_259266_idx')],
+                'constraints': [models.UniqueConstraint(fields=('account', 'date'), name='uniq_account_daily_balance')],
+            },
+        ),
+        migrations.RunPython(backfill_daily_balances, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+from decimal import Decimal
+from django.db import models
+from .chart import Account
+
+
+class AccountDailyBalance(models.Model):
+    """
+    Snapshot mutasi per (account, tanggal) dari journal yang sudah POSTED.
+    Di-maintain incremental oleh post_journal(), backfill via:
+      python manage.py rebuild_account_balances
+    """
+
+    account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name="daily_balances")
+    date = models.DateField()
+    debit = models.DecimalField(max_digits=18, decimal_places=2, default=Decimal("0.00"))
+    credit = models.DecimalField(max_digits=18, decimal_places=2, default=Decimal("0.00"))
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["account", "date"],
+                name="uniq_account_daily_balance",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["date", "account"]),
+        ]
+        ordering = ["account_id", "date"]
+
+    def __str__(self):
+        return f"{self.account_id} @ {self.date}: D {self.debit} / C {self.credit}"
@@ -85,6 +85,10 @@ class Account(models.Model):
 
         # 5) enforce parent otomatis non-postable
         if self.parent_id:
-            Account.objects.filter(pk=self.parent_id, is_postable=True).update(
+            changed = Account.objects.filter(pk=self.parent_id, is_postable=True).update(
                 is_postable=False
             )
+            if changed:
+                # .update() tidak memicu post_save -> invalidate tree manual
+                from accounting.services.account_tree import invalidate_account_tree
+                invalidate_account_tree()
@@ -125,6 +125,12 @@ class AccountingSettings(models.Model):
 
     @classmethod
     def get_solo(cls):
+        from core.services.config_snapshot import solo
+
+        return solo(cls, cls._load_solo)
+
+    @classmethod
+    def _load_solo(cls):
         obj, _ = cls.objects.get_or_create(pk=1)
         return obj
 
@@ -0,0 +1,147 @@
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.core.cache import cache
+
+from accounting.models.chart import Account
+from core.services.cache_versions import bump_version, get_version
+
+
+DEC0 = Decimal("0.00")
+
+VERSION_KEY = "accounting:coa_tree:version"
+TREE_KEY = "accounting:coa_tree:v{version}"
+CACHE_TTL_SECONDS = 60 * 60 * 24
+
+
+@dataclass
+class AccountNode:
+    id: int
+    code: str
+    name: str
+    type: str
+    parent_id: int | None
+    chart_year: int
+    is_postable: bool
+    is_active: bool
+    level: int = 0
+    lft: int = 0   # posisi preorder
+    rght: int = 0  # posisi preorder descendant terakhir (inklusif)
+
+
+class AccountTree:
+    """
+    Chart of accounts dalam urutan preorder (sibling urut code).
+    - nodes[i].lft == i, subtree node = nodes[lft..rght]
+    - parent selalu muncul sebelum child -> roll-up cukup 1x pass terbalik
+    """
+
+    def __init__(self, nodes: list[AccountNode]):
+        self.nodes = nodes
+        self.by_id = {n.id: n for n in nodes}
+
+    @classmethod
+    def build(cls, accounts) -> "AccountTree":
+        accounts = sorted(accounts, key=lambda a: a.code)
+        known = {a.id for a in accounts}
+
+        children = {}
+        roots = []
+        for a in accounts:
+            # parent tidak ada (harusnya tidak terjadi) -> anggap root
+            if a.parent_id and a.parent_id in known:
+                children.setdefault(a.parent_id, []).append(a)
+            else:
+                roots.append(a)
+
+        ordered: list[AccountNode] = []
+        # iteratif (tanpa recursion) -> aman untuk chart yang dalam
+        stack = [(a, 0) for a in reversed(roots)]
+        while stack:
+            a, level = stack.pop()
+            ordered.append(a)
+            a.level = level
+            a.lft = len(ordered) - 1
+            for ch in reversed(children.get(a.id, [])):
+                stack.append((ch, level + 1))
+
+        # rght = lft + jumlah descendant
+        size = [1] * len(ordered)
+        pos = {n.id: n.lft for n in ordered}
+        for n in reversed(ordered):
+            if n.parent_id in pos and n.parent_id != n.id:
+                size[pos[n.parent_id]] += size[n.lft]
+        for n in ordered:
+            n.rght = n.lft + size[n.lft] - 1
+
+        return cls(ordered)
+
+    @property
+    def roots(self) -> list[AccountNode]:
+        return [n for n in self.nodes if n.level == 0]
+
+    def for_year(self, chart_year: int) -> list[AccountNode]:
+        return [n for n in self.nodes if n.chart_year == chart_year]
+
+    def subtree(self, node: AccountNode) -> list[AccountNode]:
+        return self.nodes[node.lft:node.rght + 1]
+
+    def rollup(self, leaf_amounts: dict) -> dict:
+        """
+        leaf_amounts: {account_id: (debit, credit)}
+        Return {account_id: (debit, credit)} termasuk total semua descendant.
+        Linear: 1x pass dari node terakhir preorder ke atas.
+        """
+        debit = {n.id: DEC0 for n in self.nodes}
+        credit = {n.id: DEC0 for n in self.nodes}
+        for aid, (d, c) in leaf_amounts.items():
+            if aid in debit:
+                debit[aid] += d
+                credit[aid] += c
+
+        for n in reversed(self.nodes):
+            if n.level and n.parent_id in debit:
+                debit[n.parent_id] += debit[n.id]
+                credit[n.parent_id] += credit[n.id]
+
+        return {aid: (debit[aid], credit[aid]) for aid in debit}
+
+
+_local = {"version": None, "tree": None}
+
+
+def _load_tree() -> AccountTree:
+    rows = Account.objects.values(
+        "id", "code", "name", "type", "parent_id", "chart_year", "is_postable", "is_active",
+    )
+    return AccountTree.build(AccountNode(**r) for r in rows)
+
+
+def current_version() -> str:
+    # versi di DB (bukan LocMem) -> edit COA di 1 worker terlihat di worker lain
+    return get_version(VERSION_KEY)
+
+
+def get_account_tree() -> AccountTree:
+    """
+    Tree COA ter-cache (per versi). Versi di-bump oleh signal save/delete Account.
+    """
+    version = current_version()
+    if _local["version"] == version and _local["tree"] is not None:
+        return _local["tree"]
+
+    key = TREE_KEY.format(version=version)
+    tree = cache.get(key)
+    if tree is None:
+        tree = _load_tree()
+        cache.set(key, tree, CACHE_TTL_SECONDS)
+
+    _local["version"] = version
+    _local["tree"] = tree
+    return tree
+
+
+def invalidate_account_tree() -> None:
+    bump_version(VERSION_KEY)
+    _local["version"] = None
+    _local["tree"] = None
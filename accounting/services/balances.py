@@ -0,0 +1,117 @@
+from datetime import date
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Sum
+
+from accounting.models.balance import AccountDailyBalance
+from accounting.models.journal import Journal, JournalLine
+
+
+D0 = Decimal("0.00")
+
+
+@transaction.atomic
+def apply_journal_to_balances(journal: Journal) -> None:
+    """
+    Tambahkan mutasi 1 journal (yang baru di-POST) ke AccountDailyBalance.
+    Query konstan, tidak tergantung jumlah line:
+      1) aggregate line per account
+      2) insert row kosong yang belum ada (ignore_conflicts -> aman race)
+      3) lock row (select_for_update)
+      4) bulk_update debit/credit
+    """
+    agg = (
+        JournalLine.objects
+        .filter(journal=journal)
+        .values("account_id")
+        .annotate(debit=Sum("debit"), credit=Sum("credit"))
+    )
+    deltas = {r["account_id"]: (r["debit"] or D0, r["credit"] or D0) for r in agg}
+    if not deltas:
+        return
+
+    AccountDailyBalance.objects.bulk_create(
+        [AccountDailyBalance(account_id=aid, date=journal.date) for aid in deltas],
+        ignore_conflicts=True,
+    )
+
+    rows = list(
+        AccountDailyBalance.objects
+        .select_for_update()
+        .filter(date=journal.date, account_id__in=deltas.keys())
+    )
+    for row in rows:
+        d, c = deltas[row.account_id]
+        row.debit += d
+        row.credit += c
+
+    AccountDailyBalance.objects.bulk_update(rows, ["debit", "credit"])
+
+
+def period_totals(date_from: date, date_to: date, *, account_ids=None) -> dict:
+    """
+    Return {account_id: (debit, credit)} untuk range tanggal (inklusif).
+    """
+    q = AccountDailyBalance.objects.filter(date__gte=date_from, date__lte=date_to)
+    if account_ids is not None:
+        q = q.filter(account_id__in=account_ids)
+
+    agg = q.values("account_id").annotate(debit=Sum("debit"), credit=Sum("credit"))
+    return {r["account_id"]: (r["debit"] or D0, r["credit"] or D0) for r in agg}
+
+
+def balance_before(account_id: int, before: date) -> Decimal:
+    """
+    Saldo (debit - credit) account sebelum tanggal `before`.
+    """
+    agg = AccountDailyBalance.objects.filter(account_id=account_id, date__lt=before).aggregate(
+        debit=Sum("debit"),
+        credit=Sum("credit"),
+    )
+    return (agg["debit"] or D0) - (agg["credit"] or D0)
+
+
+@transaction.atomic
+def rebuild_balances(*, chunk_size: int = 2000) -> int:
+    """
+    Hapus & hitung ulang seluruh snapshot dari JournalLine posted.
+    Return jumlah row snapshot yang ditulis.
+    """
+    return rebuild_balances_for(AccountDailyBalance, JournalLine, chunk_size=chunk_size)
+
+
+def rebuild_balances_for(balance_model, line_model, *, chunk_size: int = 2000) -> int:
+    """
+    Isi rebuild_balances() dengan model sebagai parameter -> dipakai juga oleh migrasi 0018
+    (backfill, model historis dari apps.get_model).
+    """
+    balance_model.objects.all().delete()
+
+    agg = (
+        line_model.objects
+        .filter(journal__posted=True)
+        .values("account_id", "journal__date")
+        .annotate(debit=Sum("debit"), credit=Sum("credit"))
+        .order_by("journal__date", "account_id")
+    )
+
+    written = 0
+    batch = []
+    for r in agg.iterator(chunk_size=chunk_size):
+        batch.append(balance_model(
+            account_id=r["account_id"],
+            date=r["journal__date"],
+            debit=r["debit"] or D0,
+            credit=r["credit"] or D0,
+        ))
+        if len(batch) >= chunk_size:
+            balance_model.objects.bulk_create(batch)
+            written += len(batch)
+            batch = []
+
+    if batch:
+        balance_model.objects.bulk_create(batch)
+        written += len(batch)
+
+    return written
@@ -109,6 +109,7 @@ def create_journal_from_invoice(invoice):
         ref=invoice.number,
         description=f"Sales Invoice {invoice.number}",
         lines=lines,
+        bulk=True,
     )
 
     post_journal(journal)
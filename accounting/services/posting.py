@@ -5,6 +5,7 @@ from django.core.exceptions import ValidationError
 from accounting.models.journal import Journal, JournalLine
 from accounting.models.chart import Account
 from accounting.services.periods import is_period_locked
+from accounting.services.balances import apply_journal_to_balances
 
 
 def _d(v) -> Decimal:
@@ -15,13 +16,95 @@ def _d(v) -> Decimal:
     return Decimal(str(v))
 
 
+def _resolve_accounts(lines: list[dict]) -> dict:
+    """
+    Ambil semua Account yang direferensikan by id dalam 1 query.
+    Return {id: Account}.
+    """
+    ids = {ln["account"] for ln in lines if isinstance(ln["account"], int)}
+    if not ids:
+        return {}
+    found = Account.objects.in_bulk(ids)
+    missing = sorted(ids - set(found))
+    if missing:
+        raise ValidationError(f"Account not found: {', '.join(str(i) for i in missing)}")
+    return found
+
+
+def _build_lines(lines: list[dict]) -> tuple[list[JournalLine], Decimal, Decimal]:
+    """
+    Validasi semua line di memory (tanpa query per line).
+    Return (unsaved JournalLine list, total_debit, total_credit).
+    """
+    accounts = _resolve_accounts(lines)
+
+    built = []
+    total_debit = Decimal("0.00")
+    total_credit = Decimal("0.00")
+
+    for ln in lines:
+        acct = ln["account"]
+        if isinstance(acct, int):
+            acct = accounts[acct]
+
+        debit = _d(ln.get("debit"))
+        credit = _d(ln.get("credit"))
+        label = (ln.get("label") or "").strip()
+
+        jl = JournalLine(account=acct, debit=debit, credit=credit, label=label)
+        # journal belum ada & account sudah di-resolve -> skip FK lookup per line
+        jl.clean_fields(exclude=["journal", "account"])
+        jl.clean()
+        built.append(jl)
+
+        total_debit += debit
+        total_credit += credit
+
+    return built, total_debit, total_credit
+
+
 @transaction.atomic
-def create_journal(*, number: str, date, description: str = "", ref: str = "", lines: list[dict], user=None) -> Journal:
+def create_journal(
+    *,
+    number: str,
+    date,
+    description: str = "",
+    ref: str = "",
+    lines: list[dict],
+    user=None,
+    bulk: bool = False,
+    source_type: str | None = None,
+    source_ref: str | None = None,
+    currency=None,
+) -> Journal:
     """
     lines item:
       {"account": Account|id, "debit": 100, "credit": 0, "label": "text"}
+
+    bulk=True:
+      - semua line divalidasi di memory, account id di-resolve 1 query
+      - balance dicek SEBELUM journal ditulis
+      - line ditulis dengan 1 bulk_create (jumlah query konstan, tidak tergantung jumlah line)
     """
-    j = Journal.objects.create(number=number, date=date, description=description, ref=ref, posted=False,created_by=user)
+    if bulk:
+        built, total_debit, total_credit = _build_lines(lines)
+        if total_debit != total_credit:
+            raise ValidationError(f"Journal not balanced: debit={total_debit} credit={total_credit}")
+
+        j = Journal.objects.create(
+            number=number, date=date, description=description, ref=ref, posted=False, created_by=user,
+            source_type=source_type, source_ref=source_ref, currency=currency,
+        )
+
+        for jl in built:
+            jl.journal = j
+        JournalLine.objects.bulk_create(built)
+        return j
+
+    j = Journal.objects.create(
+        number=number, date=date, description=description, ref=ref, posted=False, created_by=user,
+        source_type=source_type, source_ref=source_ref, currency=currency,
+    )
 
     total_debit = Decimal("0.00")
     total_credit = Decimal("0.00")
@@ -68,4 +151,7 @@ def post_journal(journal: Journal,*, user=None) -> Journal:
     journal.posted_by = user
     journal.full_clean()
     journal.save(update_fields=["posted"])
+
+    # ✅ snapshot saldo harian (dipakai Trial Balance / General Ledger)
+    apply_journal_to_balances(journal)
     return journal
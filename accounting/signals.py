@@ -0,0 +1,15 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from accounting.models.chart import Account
+from accounting.services.account_tree import invalidate_account_tree
+
+
+@receiver(post_save, sender=Account)
+def _account_saved(sender, instance, **kwargs):
+    invalidate_account_tree()
+
+
+@receiver(post_delete, sender=Account)
+def _account_deleted(sender, instance, **kwargs):
+    invalidate_account_tree()
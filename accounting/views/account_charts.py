@@ -23,6 +23,7 @@ from accounting.models.chart import Account
 from django.views.generic import DetailView, UpdateView  # ← INI YANG KURANG
 from accounting.models.settings import AccountingSettings
 from accounting.services.account import account_is_used
+from accounting.services.account_tree import get_account_tree
 
 
 
@@ -35,28 +36,22 @@ class AccountListView(LoginRequiredMixin, TemplateView):
 
         active_year = AccountingSettings.get_active_year()
 
-        qs = (
-            Account.objects
-            .filter(chart_year=active_year)
-            .select_related("parent")
-            .order_by("type", "code")
-        )
-
-        # ambil type yang benar-benar ada di DB
-        db_types = list(qs.values_list("type", flat=True).distinct())
+        # tree COA ter-cache (0 query saat cache hangat)
+        nodes = sorted(get_account_tree().for_year(active_year), key=lambda n: (n.type, n.code))
 
         # label map dari TYPE_CHOICES (kalau match)
         type_labels = dict(Account.TYPE_CHOICES)
 
-        # bikin groups berdasarkan urutan DB (atau sort kalau mau)
-        groups = []
-        for t in db_types:
-            items = list(qs.filter(type=t))
-            if items:
-                groups.append((t, type_labels.get(t, t), items))
+        # group per type (1x pass, tanpa query per type)
+        by_type = defaultdict(list)
+        for n in nodes:
+            by_type[n.type].append(n)
+        db_types = list(by_type)
+
+        groups = [(t, type_labels.get(t, t), by_type[t]) for t in db_types]
 
         ctx["groups"] = groups
-        ctx["coa_count"] = qs.count()
+        ctx["coa_count"] = len(nodes)
 
         # debug helper (boleh hapus nanti)
         ctx["db_types"] = db_types[:10]
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from billing.services.numbering import SEQUENCES, seed_sequence_from_data
+
+
+class Command(BaseCommand):
+    help = "Seed billing number sequences (receipt, vendor payment) from existing documents"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--code", choices=sorted(SEQUENCES), help="Seed one sequence only")
+
+    def handle(self, *args, **options):
+        codes = [options["code"]] if options.get("code") else list(SEQUENCES)
+
+        for code in codes:
+            seq, last = seed_sequence_from_data(code)
+            self.stdout.write(self.style.SUCCESS(
+                f"{seq.app_label}/{seq.code}: last_number={last} period={seq.period_year}-{seq.period_month:02d}"
+            ))
@@ -178,6 +178,13 @@ class Invoice(TimeStampedModel):
     def __str__(self):
         return self.number
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        obj = super().from_db(db, field_names, values)
+        # job lama diingat -> invoice dipindah ke job lain, ringkasan job lama ikut dihitung ulang
+        obj._loaded_job_order_id = obj.__dict__.get("job_order_id")
+        return obj
+
     def save(self, *args, **kwargs):
         if not self.number:
             self.number = get_next_number("sales", "INVOICE")
@@ -286,34 +293,36 @@ class Invoice(TimeStampedModel):
         if self.invoice_type == self.INV_REGULAR and self.job_order:
             raise ValidationError("Regular invoice should not be linked to a Job Order.")
 
+        old = Invoice.objects.filter(pk=self.pk).first() if self.pk else None
+
+        # invoice ini sendiri sudah ikut dihitung di ringkasan job? (edit invoice DP/FINAL yang sama)
+        counted = (
+            old is not None
+            and old.job_order_id == self.job_order_id
+            and old.invoice_type in [self.INV_DP, self.INV_FINAL]
+        )
+
         # ===== DP DUPLICATE PROTECTION =====
+        # ✅ pakai ringkasan di JobOrder (job.services.invoice_summary), tanpa query exists()
         if self.invoice_type == self.INV_DP and self.job_order:
-            existing_dp = Invoice.objects.filter(
-                job_order=self.job_order,
-                invoice_type=self.INV_DP
-            ).exclude(pk=self.pk)
-
-            if existing_dp.exists():
+            own_dp = counted and old.invoice_type == self.INV_DP
+            if self.job_order.dp_invoiced and not own_dp:
                 raise ValidationError("Down Payment invoice already exists for this Job Order.")
 
         # ===== OVERBILLING PROTECTION =====
         if self.job_order and self.invoice_type in [self.INV_DP, self.INV_FINAL]:
-            total_other = Invoice.objects.filter(
-                job_order=self.job_order
-            ).exclude(pk=self.pk).aggregate(
-                total=Sum("total_amount")
-            )["total"] or Decimal("0.00")
+            total_other = self.job_order.invoiced_total or Decimal("0.00")
+            if counted:
+                total_other -= old.total_amount or Decimal("0.00")
 
             if total_other + (self.total_amount or Decimal("0.00")) > self.job_order.grand_total:
                 raise ValidationError("Invoice total exceeds Job Order contract value.")
             
 
         # Prevent tax change after confirm
-        if self.pk:
-            old = Invoice.objects.filter(pk=self.pk).first()
-            if old and old.status != self.ST_DRAFT:
-                if self.tax_id != old.tax_id:
-                    raise ValidationError("Tax cannot be changed after invoice is confirmed.")
+        if old and old.status != self.ST_DRAFT:
+            if self.tax_id != old.tax_id:
+                raise ValidationError("Tax cannot be changed after invoice is confirmed.")
 
 
 class InvoiceLine(TimeStampedModel):
@@ -6,6 +6,7 @@ from partners.models import Vendor
 from core.models.currencies import Currency
 from accounting.models.chart import Account
 from billing.models.vendor_bills import VendorBill  # ganti kalau beda
+from billing.services.numbering import next_vendor_payment_no
 
 class VendorPayment(models.Model):
     vb_number = models.CharField(max_length=30, unique=True, blank=True, default="")   # untuk finance
@@ -33,6 +34,10 @@ class VendorPayment(models.Model):
        
         db_table="vendor_payments"
 
+    def save(self, *args, **kwargs):
+        if not self.vb_number:
+            self.vb_number = next_vendor_payment_no()
+        return super().save(*args, **kwargs)
 
     def recalc_total(self):
         self.total_amount = sum((x.amount for x in self.lines.all()), 0)
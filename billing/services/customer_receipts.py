@@ -1,24 +1,14 @@
 from decimal import Decimal
-from django.utils import timezone
 from django.db import transaction
 from django.core.exceptions import ValidationError
 
 from accounting.models.settings import AccountingSettings
 from accounting.services.posting import create_journal, post_journal
 from billing.models.customer_receipt import CustomerReceipt
+from billing.services.numbering import next_receipt_no
 
 
 
-def next_receipt_no():
-    today = timezone.now().date()
-    prefix = f"RCPT-{today:%Y%m}-"
-    last = CustomerReceipt.objects.filter(receipt_no__startswith=prefix).order_by("-receipt_no").first()
-    if not last or not last.receipt_no:
-        return prefix + "0001"
-    n = int(last.receipt_no.split("-")[-1])
-    return prefix + f"{n+1:04d}"
-
-
 @transaction.atomic
 def post_receipt(rcpt: CustomerReceipt):
     if not rcpt.can_post:
@@ -73,6 +63,7 @@ def post_receipt(rcpt: CustomerReceipt):
         ref=rcpt.receipt_no,
         description=f"CustomerReceipt {rcpt.receipt_no} for Invoice {inv.number}",
         lines=lines,
+        bulk=True,
     )
     post_journal(j)
 
@@ -0,0 +1,110 @@
+import os
+import re
+from datetime import date
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.models.number_sequences import NumberSequence
+from core.services.number_allocator import allocator, compile_format
+from core.utils.numbering import get_next_number
+
+
+APP_LABEL = "billing"
+
+# Default sequence billing (dipakai saat row NumberSequence belum ada).
+# Format/prefix bisa diubah dari menu Numbering tanpa ubah kode.
+SEQUENCES = {
+    "CUSTOMER_RECEIPT": {
+        "model": "billing.CustomerReceipt",
+        "field": "receipt_no",
+        "defaults": {
+            "name": "Customer Receipt",
+            "prefix": "RCPT",
+            "format": "{prefix}-{year:04d}{month:02d}-{seq:04d}",
+            "reset": NumberSequence.RESET_MONTHLY,
+            "padding": 4,
+        },
+    },
+    "VENDOR_PAYMENT": {
+        "model": "billing.VendorPayment",
+        "field": "vb_number",
+        "defaults": {
+            "name": "Vendor Payment",
+            "prefix": "VP",
+            "format": "{prefix}-{year:04d}{month:02d}-{seq:04d}",
+            "reset": NumberSequence.RESET_MONTHLY,
+            "padding": 4,
+        },
+    },
+}
+
+
+def next_billing_number(code: str, today: date | None = None) -> str:
+    return get_next_number(APP_LABEL, code, today=today, defaults=SEQUENCES[code]["defaults"])
+
+
+def next_receipt_no(today: date | None = None) -> str:
+    return next_billing_number("CUSTOMER_RECEIPT", today=today)
+
+
+def next_vendor_payment_no(today: date | None = None) -> str:
+    return next_billing_number("VENDOR_PAYMENT", today=today)
+
+
+def _number_head(seq: NumberSequence, today: date) -> str:
+    """
+    Bagian nomor sebelum counter untuk periode `today` (mis. "RCPT-202601-").
+    """
+    render = compile_format(seq.format, seq.prefix or "", seq.padding or 0)
+    # counter lebih lebar dari padding -> common prefix berhenti tepat sebelum counter
+    a = render(today.year, today.month, today.day, 2)
+    b = render(today.year, today.month, today.day, 10 ** 12)
+    return os.path.commonprefix([a, b])
+
+
+@transaction.atomic
+def seed_sequence_from_data(code: str, today: date | None = None) -> tuple[NumberSequence, int]:
+    """
+    One-shot: set last_number sequence = counter tertinggi yang sudah terpakai
+    di periode berjalan (scan sekali, bukan per nomor baru).
+    Return (sequence, last_number).
+    """
+    from django.apps import apps
+
+    today = today or timezone.localdate()
+    spec = SEQUENCES[code]
+    model = apps.get_model(spec["model"])
+    field = spec["field"]
+
+    seq, _ = NumberSequence.objects.select_for_update().get_or_create(
+        app_label=APP_LABEL,
+        code=code,
+        defaults={
+            **spec["defaults"],
+            "last_number": 0,
+            "period_year": today.year,
+            "period_month": today.month,
+        },
+    )
+
+    head = _number_head(seq, today)
+    used = 0
+    for value in model.objects.filter(**{f"{field}__startswith": head}).values_list(field, flat=True):
+        m = re.match(r"\d+", value[len(head):])
+        if m:
+            used = max(used, int(m.group()))
+
+    same_period = (seq.period_year, seq.period_month) == (today.year, today.month)
+    if seq.reset == NumberSequence.RESET_YEARLY:
+        same_period = seq.period_year == today.year
+    elif seq.reset == NumberSequence.RESET_NONE:
+        same_period = True
+
+    current = (seq.last_number or 0) if same_period else 0
+    seq.last_number = max(current, used)
+    seq.period_year, seq.period_month = today.year, today.month
+    seq.save(update_fields=["last_number", "period_year", "period_month"])
+
+    allocator.clear(APP_LABEL, code)
+    return seq, seq.last_number
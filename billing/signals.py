@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from billing.models.customer_invoice import Invoice
+from job.services.invoice_summary import refresh_invoice_summary, reload_invoice_summary
+
+
+# field Invoice yang mempengaruhi ringkasan di JobOrder
+SUMMARY_SOURCE_FIELDS = {"job_order", "job_order_id", "invoice_type", "total_amount", "amount_paid"}
+
+
+def _refresh_job_summary(instance) -> None:
+    job_ids = {instance.job_order_id, getattr(instance, "_loaded_job_order_id", None)}
+    refresh_invoice_summary(job_ids)
+    instance._loaded_job_order_id = instance.job_order_id
+
+    if instance.job_order_id and Invoice.job_order.is_cached(instance):
+        reload_invoice_summary(instance.job_order)
+
+
+@receiver(post_save, sender=Invoice)
+def _invoice_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not (set(update_fields) & SUMMARY_SOURCE_FIELDS):
+        return
+    _refresh_job_summary(instance)
+
+
+@receiver(post_delete, sender=Invoice)
+def _invoice_deleted(sender, instance, **kwargs):
+    _refresh_job_summary(instance)
@@ -4,50 +4,48 @@ from billing.models.customer_invoice import Invoice, InvoiceLine
 from django.core.exceptions import ValidationError
 from decimal import Decimal, ROUND_HALF_UP
 
+from core.services.tax_engine import ROUND_PER_LINE, ROUND_PER_TAX, document_taxes
+
 
 
 def _dec(value):
     return Decimal(str(value or 0))
 
-def recalc_invoice_totals(invoice):
-    """
-    Final rule:
-    - subtotal = sum(line.quantity × line.price)
-    - tax_amount = sum(line tax per rate)
-    - total_amount = subtotal + tax_amount
-    """
 
-    lines_qs = (
-        invoice.lines.all()
-        if hasattr(invoice, "lines")
-        else invoice.invoiceline_set.all()
-    ).prefetch_related("taxes")
+# DPP baris invoice = quantity × price
+# - ROUND_PER_TAX (default, layar invoice): PPN dari total DPP per tax, 1x pembulatan per tax
+# - ROUND_PER_LINE (generate DP dari job): pajak dibulatkan per baris per tax (rule lama utils ini)
+INVOICE_TAX_BASE = ("quantity", "price")
 
-    subtotal = Decimal("0.00")
-    tax_total = Decimal("0.00")
 
-    for line in lines_qs:
-        qty = _dec(line.quantity)
-        price = _dec(line.price)
+def invoice_taxes(invoice, *, rounding=ROUND_PER_TAX, refresh=False):
+    """
+    TaxBreakdown invoice (core.services.tax_engine), di-memo di instance invoice.
+    """
+    return document_taxes(invoice, base=INVOICE_TAX_BASE, rounding=rounding, refresh=refresh)
 
-        base = (qty * price).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-        subtotal += base
 
-        for tax in line.taxes.all():
-            rate = _dec(getattr(tax, "rate", 0))
-            tax_total += (base * rate / Decimal("100")).quantize(
-                Decimal("0.01"),
-                rounding=ROUND_HALF_UP
-            )
+def recalc_invoice_totals(invoice, *, rounding=ROUND_PER_TAX):
+    """
+    Final rule:
+    - subtotal = sum(line.quantity × line.price)
+    - tax_amount = sum pajak (pembulatan sesuai `rounding`, lihat INVOICE_TAX_BASE)
+    - total_amount = subtotal + tax_amount
+    - exchange_rate / total_idr ikut dihitung ulang (Invoice.recalc_total_idr)
+    """
+    taxes = invoice_taxes(invoice, rounding=rounding, refresh=True)
 
-    invoice.subtotal_amount = subtotal
-    invoice.tax_amount = tax_total
-    invoice.total_amount = subtotal + tax_total
+    invoice.subtotal_amount = taxes.subtotal
+    invoice.tax_amount = taxes.tax_total
+    invoice.total_amount = taxes.subtotal + taxes.tax_total
+    invoice.recalc_total_idr()
 
     invoice.save(update_fields=[
         "subtotal_amount",
         "tax_amount",
-        "total_amount"
+        "total_amount",
+        "exchange_rate",
+        "total_idr",
     ])
 
     return invoice
@@ -211,7 +209,7 @@ def generate_invoice_from_job(job, invoice_type, user):
             if job.service and hasattr(job.service, "taxes"):
                 line.taxes.set(job.service.taxes.all())
 
-            # DP boleh hitung ulang
-            recalc_invoice_totals(invoice)
+            # DP boleh hitung ulang (pembulatan per baris, sama dengan rule lama generate DP)
+            recalc_invoice_totals(invoice, rounding=ROUND_PER_LINE)
 
             return invoice
\ No newline at end of file
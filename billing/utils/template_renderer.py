@@ -1,8 +1,51 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
 from django.template import Context, Template
 from billing.models.config import BillingConfig
 
 
-def render_billing_text(template_string, invoice):
+# ✅ Template hasil compile di-cache per proses (key = hash isi template, LRU)
+# -> teks config yang sama tidak di-parse ulang tiap render; config diubah -> hash baru
+TEMPLATE_CACHE_SIZE = 64
+
+_lock = threading.Lock()
+_compiled = OrderedDict()  # sha1(template_string) -> Template
+
+
+def compile_billing_template(template_string):
+    key = hashlib.sha1(template_string.encode("utf-8")).hexdigest()
+    with _lock:
+        template = _compiled.get(key)
+        if template is not None:
+            _compiled.move_to_end(key)
+            return template
+
+    template = Template(template_string)
+
+    with _lock:
+        _compiled[key] = template
+        _compiled.move_to_end(key)
+        while len(_compiled) > TEMPLATE_CACHE_SIZE:
+            _compiled.popitem(last=False)
+    return template
+
+
+def clear_billing_template_cache():
+    with _lock:
+        _compiled.clear()
+
+
+def _invoice_context(invoice):
+    return {
+        "invoice": invoice,
+        "job": invoice.job_order,
+        "customer": invoice.customer,
+    }
+
+
+def render_billing_text(template_string, invoice, config=None):
     """
     Render dynamic billing text using Django template engine.
     Available context:
@@ -10,19 +53,37 @@ def render_billing_text(template_string, invoice):
         - job
         - customer
         - config
+    config boleh di-pass dari caller (mis. view yang sudah ambil BillingConfig.get_solo()).
     """
 
     if not template_string:
         return ""
 
-    config = BillingConfig.get_solo()
+    # teks polos tanpa tag/variable -> tidak perlu engine template
+    if "{" not in template_string:
+        return template_string
 
-    context = Context({
-        "invoice": invoice,
-        "job": invoice.job_order,
-        "customer": invoice.customer,
-        "config": config,
-    })
+    template = compile_billing_template(template_string)
+    context = Context({"config": config or BillingConfig.get_solo()})
+    context.update(_invoice_context(invoice))
+    return template.render(context)
 
-    template = Template(template_string)
-    return template.render(context)
\ No newline at end of file
+
+def render_billing_texts(template_string, invoices, config=None):
+    """
+    Batch: 1 template ter-compile + 1 base context (config) untuk banyak invoice.
+    Return {invoice.pk: text}.
+    """
+    invoices = list(invoices)
+    if not template_string or "{" not in template_string:
+        text = template_string or ""
+        return {inv.pk: text for inv in invoices}
+
+    template = compile_billing_template(template_string)
+    context = Context({"config": config or BillingConfig.get_solo()})
+
+    rendered = {}
+    for inv in invoices:
+        with context.push(_invoice_context(inv)):
+            rendered[inv.pk] = template.render(context)
+    return rendered
@@ -1,12 +1,11 @@
 # sales/views/invoice_pdf_html.py
 
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from django.template.loader import render_to_string
 from django.views import View
 
-from weasyprint import HTML
+from core.services.pdf_render import pdf_response
 from billing.models.customer_invoice import Invoice
 
 
@@ -27,20 +26,17 @@ class InvoicePdfHtmlView(LoginRequiredMixin, View):
             request=request,
         )
 
-        # penting agar static() dan image kebaca
-        base_url = request.build_absolute_uri("/")
-
-        pdf_file = HTML(
-            string=html_string,
-            base_url=base_url
-        ).write_pdf()
-
         filename = (
             f"INV-{invoice.number}.pdf"
             if getattr(invoice, "number", None)
             else "Invoice.pdf"
         )
 
-        response = HttpResponse(pdf_file, content_type="application/pdf")
-        response["Content-Disposition"] = f'inline; filename="{filename}"'
-        return response
\ No newline at end of file
+        # penting agar static() dan image kebaca -> base_url
+        return pdf_response(
+            request,
+            engine="weasyprint",
+            html=html_string,
+            filename=filename,
+            options={"base_url": request.build_absolute_uri("/")},
+        )
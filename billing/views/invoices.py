@@ -10,6 +10,7 @@ from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 from django.views import View
 from django.views.generic import ListView, DetailView, CreateView
+from core.utils.keyset_pagination import KeysetPaginationMixin
 
 #from sales.job_order_model import JobOrder
 from job.models.job_orders import JobOrder
@@ -18,7 +19,7 @@ from billing.models.customer_invoice import Invoice,InvoiceLine
 
 from billing.forms.invoices import InvoiceForm, InvoiceLineFormSet
 
-from billing.utils.invoices import build_invoice_description
+from billing.utils.invoices import build_invoice_description, invoice_taxes, recalc_invoice_totals
 from decimal import Decimal, ROUND_HALF_UP
 from core.models.taxes import Tax
 from billing.utils.permissions import is_finance
@@ -87,38 +88,6 @@ def _line_price_field_name():
 def _q2(x):
     return (x or Decimal("0")).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
 
-def recalc_invoice_totals(invoice: Invoice):
-    lines = invoice.lines.all().prefetch_related("taxes")
-
-    subtotal = Decimal("0")
-    base_by_tax = {}  # tax_id -> base amount
-
-    for ln in lines:
-        amt = _q2((ln.quantity or 0) * (ln.price or 0))
-        subtotal += amt
-        for tx in ln.taxes.all():
-            base_by_tax[tx.id] = base_by_tax.get(tx.id, Decimal("0")) + amt
-
-    tax_total = Decimal("0")
-    if base_by_tax:
-        taxes = Tax.objects.in_bulk(base_by_tax.keys())
-        for tax_id, base in base_by_tax.items():
-            tx = taxes.get(tax_id)
-            if not tx:
-                continue
-            rate = Decimal(str(tx.rate or 0))
-            tax_total += _q2(base * rate / Decimal("100"))
-
-    subtotal = _q2(subtotal)
-    tax_total = _q2(tax_total)
-    total = _q2(subtotal + tax_total)
-
-    invoice.subtotal_amount = subtotal
-    invoice.tax_amount = tax_total
-    invoice.total_amount = total
-    invoice.recalc_total_idr()
-    invoice.save(update_fields=["subtotal_amount", "tax_amount", "total_amount", "exchange_rate", "total_idr"])
-
 from decimal import Decimal
 from django.core.exceptions import ObjectDoesNotExist, MultipleObjectsReturned
 
@@ -140,7 +109,7 @@ def get_ppn_11_tax():
 # =========================================================
 # Views
 # =========================================================
-class InvoiceListView(LoginRequiredMixin, ListView):
+class InvoiceListView(KeysetPaginationMixin, LoginRequiredMixin, ListView):
     model = Invoice
     template_name = "customer_invoices/list.html"
     context_object_name = "invoices"
@@ -164,23 +133,10 @@ class InvoiceDetailView(LoginRequiredMixin, DetailView):
     context_object_name = "invoice"
     job = None 
 
+    @staticmethod
     def calc_invoice_totals(invoice):
-        sub = Decimal("0.00")
-        tax = Decimal("0.00")
-
-        for ln in invoice.lines.all():  # related_name="lines" :contentReference[oaicite:1]{index=1}
-            line_amount = ln.amount or Decimal("0.00")  # amount sudah ada :contentReference[oaicite:2]{index=2}
-            sub += line_amount
-
-            # taxes = M2M :contentReference[oaicite:3]{index=3}
-            for tx in ln.taxes.all():
-                # asumsi tx.rate adalah persen (mis. 11 untuk 11%)
-                rate = getattr(tx, "rate", None)
-                if rate:
-                    tax += (line_amount * Decimal(str(rate)) / Decimal("100"))
-
-        total = sub + tax
-        return sub, tax, total
+        taxes = invoice_taxes(invoice)
+        return taxes.subtotal, taxes.tax_total, taxes.subtotal + taxes.tax_total
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
@@ -239,12 +195,14 @@ class InvoiceDetailView(LoginRequiredMixin, DetailView):
 
         ctx["rendered_terms"] = render_billing_text(
             config.default_terms_conditions,
-            inv
+            inv,
+            config=config,
         )
 
         ctx["rendered_customer_note"] = render_billing_text(
             config.default_customer_note,
-            inv
+            inv,
+            config=config,
         )
 
         return ctx
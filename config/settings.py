@@ -190,6 +190,21 @@ SESSION_COOKIE_SAMESITE = "Lax"      # atau "Strict" sesuai kebutuhan
 
 WKHTMLTOPDF_CMD = r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe"
 
+# PDF render (core.services.pdf_render): pool worker + cache disk (content-addressed)
+PDF_RENDER_POOL = "process"        # "process" | "thread"
+PDF_RENDER_WORKERS = 2
+PDF_RENDER_WAIT_SECONDS = 1        # maks 1 detik worker gunicorn ditahan; lewat itu -> halaman polling (202)
+PDF_CACHE_DIR = None               # default: MEDIA_ROOT / "pdf_cache"
+PDF_CACHE_MAX_AGE_SECONDS = 7 * 24 * 60 * 60   # tidak dipakai > 7 hari -> dihapus
+PDF_CACHE_MAX_BYTES = 2 * 1024 ** 3             # total cache dibatasi 2 GB (yang paling lama dibuang dulu)
+
+
+
+# Nomor dokumen: ukuran blok yang di-reserve per proses ("app_label/CODE" atau "*").
+# 1 = tanpa celah nomor. Naikkan hanya untuk dokumen yang boleh bercelah.
+NUMBERING_BLOCK_SIZES = {
+    "*": 1,
+}
 
 
 MEDIA_URL = "/media/"
@@ -228,6 +243,18 @@ else:
 
 DEFAULT_FROM_EMAIL = "CargoChains <no-reply@domainclient.com>"
 
+# Outbox email (core.services.email_outbox): dikirim oleh `manage.py send_outbox [--loop]`
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_BACKOFF_SECONDS = 60          # retry ke-n tunggu 60 * 2^(n-1) detik
+EMAIL_OUTBOX_BACKOFF_MAX_SECONDS = 60 * 60
+
+# Versi cache lintas worker (core.services.cache_versions): tiap proses cek token di DB
+# maksimal 1x per N detik -> perubahan COA/kurs/config terlihat di semua worker setelah <= N detik
+CACHE_VERSION_CHECK_SECONDS = 2
+
+# Payload public tracking di cache per worker; worker lain lihat perubahan setelah <= N detik
+TRACKING_CACHE_TTL_SECONDS = 30
+
 
 SUMMERNOTE_CONFIG = {
     "iframe": True,
@@ -11,6 +11,9 @@ from .models.setup import SetupState
 from .models.exchange_rates import ExchangeRate
 from .models.taxes   import Tax
 from .models.user_profile import UserProfile
+from .models.sweeps import SweepCheckpoint
+from .models.outbox import OutboundEmail
+from .models.cache_versions import CacheVersion
 
 
 
@@ -57,6 +60,31 @@ class CoreSettingAdmin(admin.ModelAdmin):
     list_display = ("code", "int_value", "char_value", "notes")
     search_fields = ("code",)
 
+@admin.register(SweepCheckpoint)
+class SweepCheckpointAdmin(admin.ModelAdmin):
+    list_display = ("name", "last_id", "processed", "started_at", "finished_at", "updated_at")
+    search_fields = ("name",)
+
+@admin.register(CacheVersion)
+class CacheVersionAdmin(admin.ModelAdmin):
+    list_display = ("key", "token", "updated_at")
+    search_fields = ("key",)
+    readonly_fields = ("key", "token", "updated_at")
+
+@admin.action(description="Kirim ulang (reset attempts)")
+def retry_outbound_emails(modeladmin, request, queryset):
+    from .services.email_outbox import retry_emails
+
+    modeladmin.message_user(request, f"Dijadwalkan ulang: {retry_emails(queryset)} email.")
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ("id", "subject", "ref", "status", "attempts", "next_attempt_at", "created_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("subject", "ref")
+    readonly_fields = ("claimed_at", "sent_at", "created_at", "created_by")
+    actions = [retry_outbound_emails]
+
 @admin.register(UOM)
 class UOMdmin(admin.ModelAdmin):
     list_display = ("code", "name", "category", "is_active")
@@ -0,0 +1,59 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core.models.number_sequences import NumberSequence
+from core.services.number_allocator import NumberAllocator
+
+
+class Command(BaseCommand):
+    help = "Benchmark document number allocation (allocations/sec) under N parallel workers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument("--count", type=int, default=200, help="Allocations per worker")
+        parser.add_argument("--block-sizes", default="1,10,50", help="Comma separated block sizes to compare")
+        parser.add_argument("--code", default="BENCHMARK")
+        parser.add_argument("--keep", action="store_true", help="Keep the benchmark sequence row")
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        count = options["count"]
+        code = options["code"]
+        sizes = [int(s) for s in options["block_sizes"].split(",") if s.strip()]
+
+        for size in sizes:
+            NumberSequence.objects.filter(app_label="benchmark", code=code).delete()
+
+            # 1 allocator per worker = simulasi 1 proses gunicorn per worker
+            allocators = [NumberAllocator() for _ in range(workers)]
+
+            def run(alloc):
+                out = []
+                try:
+                    for _ in range(count):
+                        out.append(alloc.next_number("benchmark", code, block_size=size))
+                finally:
+                    connection.close()
+                return out
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(run, allocators))
+            elapsed = time.perf_counter() - started
+
+            numbers = [n for r in results for n in r]
+            total = len(numbers)
+            dupes = total - len(set(numbers))
+            rate = total / elapsed if elapsed else 0
+
+            style = self.style.SUCCESS if not dupes else self.style.ERROR
+            self.stdout.write(style(
+                f"block={size:<4} workers={workers} allocations={total} "
+                f"time={elapsed:.2f}s rate={rate:,.0f}/s duplicates={dupes}"
+            ))
+
+        if not options["keep"]:
+            NumberSequence.objects.filter(app_label="benchmark", code=code).delete()
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from core.services.pdf_render import prune_cache
+
+
+class Command(BaseCommand):
+    help = "Delete old PDF cache files (PDF_CACHE_MAX_AGE_SECONDS) and trim the cache to PDF_CACHE_MAX_BYTES"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--max-age-seconds", type=float, default=None)
+        parser.add_argument("--max-bytes", type=int, default=None)
+
+    def handle(self, *args, **options):
+        removed = prune_cache(max_age_seconds=options["max_age_seconds"], max_bytes=options["max_bytes"])
+        self.stdout.write(self.style.SUCCESS(
+            f"PDF cache pruned. files={removed['files']} bytes={removed['bytes']}"
+        ))
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.email_outbox import send_outbox
+
+
+class Command(BaseCommand):
+    help = "Send queued outbound emails (core.OutboundEmail) in batches over one SMTP connection"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50, help="Emails per batch / SMTP connection")
+        parser.add_argument("--max-batches", type=int, default=None, help="Stop after N batches")
+        parser.add_argument("--loop", action="store_true", help="Keep running, poll the queue every --interval seconds")
+        parser.add_argument("--interval", type=float, default=10, help="Seconds between polls when --loop is used")
+
+    def handle(self, *args, **options):
+        while True:
+            result = send_outbox(batch_size=options["batch_size"], max_batches=options["max_batches"])
+            if result.batches or not options["loop"]:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Outbox: sent {result.sent}, retry later {result.retried}, "
+                    f"failed {result.failed} (batches: {result.batches})"
+                ))
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
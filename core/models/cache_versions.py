@@ -0,0 +1,18 @@
+from django.db import models
+
+
+class CacheVersion(models.Model):
+    """
+    Versi cache lintas proses/worker (core.services.cache_versions).
+    Cache lokal (LocMem per worker) di-key dengan token ini -> perubahan di 1 worker
+    terlihat di worker lain setelah commit.
+    """
+    key = models.CharField(max_length=100, unique=True)
+    token = models.CharField(max_length=32)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "core_cache_versions"
+
+    def __str__(self):
+        return f"{self.key} @ {self.token}"
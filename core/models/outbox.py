@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.db import models
+
+
+class OutboundEmail(models.Model):
+    """
+    Antrian email keluar (core.services.email_outbox).
+    View cukup enqueue; pengiriman SMTP dilakukan command send_outbox (batch, 1 koneksi).
+    """
+
+    ST_PENDING = "PENDING"
+    ST_SENDING = "SENDING"
+    ST_SENT = "SENT"
+    ST_FAILED = "FAILED"
+
+    STATUS_CHOICES = [
+        (ST_PENDING, "Pending"),
+        (ST_SENDING, "Sending"),
+        (ST_SENT, "Sent"),
+        (ST_FAILED, "Failed"),
+    ]
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=ST_PENDING)
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField(blank=True, default="")
+    html_body = models.TextField(blank=True, default="")
+    from_email = models.CharField(max_length=255, blank=True, default="")
+    to = models.JSONField(default=list)
+    cc = models.JSONField(default=list, blank=True)
+    bcc = models.JSONField(default=list, blank=True)
+    reply_to = models.JSONField(default=list, blank=True)
+
+    # [{"filename", "mimetype", "pdf": {"engine", "html", "options"}} | {"filename", "mimetype", "content_b64"}]
+    attachments = models.JSONField(default=list, blank=True)
+
+    # penanda asal email, mis. "quotation:12" / "shipment:34"
+    ref = models.CharField(max_length=100, blank=True, default="", db_index=True)
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "core_outbound_emails"
+        ordering = ["-id"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outbox_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to or [])} [{self.status}]"
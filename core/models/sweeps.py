@@ -0,0 +1,24 @@
+from django.db import models
+
+
+class SweepCheckpoint(models.Model):
+    """
+    Posisi terakhir job periodik (core.services.batch_sweep) -> bisa lanjut kalau terputus.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "core_sweep_checkpoints"
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_id}"
+
+    @property
+    def is_running(self):
+        return bool(self.started_at and not self.finished_at)
@@ -0,0 +1,95 @@
+# core/services/batch_sweep.py
+"""
+Runner untuk job periodik yang meng-update banyak baris (expire, close, cleanup, ...):
+- jalan per batch id (urut pk, maksimal batch_size baris), tiap batch transaksi pendek sendiri
+- baris yang sedang dikunci user di-skip (SELECT ... FOR UPDATE SKIP LOCKED), tidak ditunggu
+  -> ikut ter-proses di run berikutnya
+- posisi terakhir disimpan di SweepCheckpoint (commit bareng batch) -> run yang terputus
+  lanjut dari batch berikutnya; run yang selesai mulai lagi dari awal
+"""
+import time
+from dataclasses import dataclass
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.models.sweeps import SweepCheckpoint
+
+
+@dataclass
+class SweepResult:
+    name: str
+    batches: int = 0
+    candidates: int = 0
+    processed: int = 0
+    resumed_from: int = 0
+
+
+def _lock(qs):
+    if not connection.features.has_select_for_update:
+        return qs
+    if connection.features.has_select_for_update_skip_locked:
+        return qs.select_for_update(skip_locked=True)
+    return qs.select_for_update()
+
+
+def _checkpoint(name: str, restart: bool) -> SweepCheckpoint:
+    cp, _ = SweepCheckpoint.objects.get_or_create(name=name)
+    if restart or not cp.is_running:
+        # run baru dari awal
+        cp.last_id = 0
+        cp.processed = 0
+        cp.started_at = timezone.now()
+        cp.finished_at = None
+        cp.save(update_fields=["last_id", "processed", "started_at", "finished_at", "updated_at"])
+    return cp
+
+
+def run_sweep(
+    name: str,
+    queryset,
+    apply,
+    *,
+    batch_size: int = 500,
+    pause: float = 0,
+    restart: bool = False,
+    max_batches: int | None = None,
+) -> SweepResult:
+    """
+    queryset = kandidat (filter kondisi, tanpa lock). apply(batch_qs) -> jumlah baris yang diproses;
+    batch_qs = queryset yang sama dibatasi ke pk batch ini yang berhasil dikunci.
+    pause = jeda (detik) antar batch supaya tidak membebani DB.
+    max_batches = berhenti setelah N batch (sisanya lanjut di run berikutnya via checkpoint).
+    """
+    cp = _checkpoint(name, restart)
+    result = SweepResult(name=name, resumed_from=cp.last_id)
+    candidates = queryset.order_by("pk")
+
+    while max_batches is None or result.batches < max_batches:
+        with transaction.atomic():
+            ids = list(
+                _lock(candidates.filter(pk__gt=cp.last_id))
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+
+            n = apply(queryset.filter(pk__in=ids)) or 0
+
+            cp.last_id = ids[-1]
+            cp.processed += n
+            cp.save(update_fields=["last_id", "processed", "updated_at"])
+
+        result.batches += 1
+        result.candidates += len(ids)
+        result.processed += n
+
+        if pause:
+            time.sleep(pause)
+    else:
+        # berhenti karena max_batches -> checkpoint tetap "running", run berikutnya lanjut
+        return result
+
+    cp.finished_at = timezone.now()
+    cp.save(update_fields=["finished_at", "updated_at"])
+    return result
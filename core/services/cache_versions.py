@@ -0,0 +1,77 @@
+# core/services/cache_versions.py
+"""
+Versi cache yang disimpan di DB (core.CacheVersion), bukan di django cache:
+- CACHES default = LocMem per proses -> versi di cache hanya terlihat di worker yang menyimpan
+- get_version(key): token terakhir dari DB, dicek maksimal 1x per CACHE_VERSION_CHECK_SECONDS per proses
+- bump_version(key): token baru (random, bukan counter), ikut transaksi penulis
+  -> worker lain lihat setelah commit
+- di dalam transaksi penulis, get_version() langsung return token baru: data yang di-load di sana
+  ter-cache di bawah token itu; kalau rollback token tidak pernah muncul di DB -> tidak terpakai
+"""
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from core.models.cache_versions import CacheVersion
+
+
+INITIAL_TOKEN = "0"
+
+_lock = threading.Lock()
+_memo = {}                    # key -> (token, checked_at), per proses
+_pending = threading.local()  # key -> token yang di-bump di transaksi thread ini
+
+
+def _check_seconds() -> float:
+    return getattr(settings, "CACHE_VERSION_CHECK_SECONDS", 2.0)
+
+
+def _pending_tokens() -> dict:
+    tokens = getattr(_pending, "tokens", None)
+    if tokens is None:
+        tokens = _pending.tokens = {}
+    return tokens
+
+
+def get_version(key: str) -> str:
+    pending = _pending_tokens()
+    if key in pending:
+        if connection.in_atomic_block:
+            return pending[key]
+        # transaksi sudah selesai (rollback) -> token pending tidak berlaku
+        pending.pop(key, None)
+
+    now = time.monotonic()
+    hit = _memo.get(key)
+    if hit is not None and now - hit[1] < _check_seconds():
+        return hit[0]
+
+    token = CacheVersion.objects.filter(key=key).values_list("token", flat=True).first() or INITIAL_TOKEN
+    with _lock:
+        _memo[key] = (token, now)
+    return token
+
+
+def _committed(keys) -> None:
+    pending = _pending_tokens()
+    with _lock:
+        for key in keys:
+            _memo.pop(key, None)
+            pending.pop(key, None)
+
+
+def bump_version(*keys) -> None:
+    tokens = {}
+    for key in keys:
+        token = tokens[key] = uuid.uuid4().hex
+        if not CacheVersion.objects.filter(key=key).update(token=token):
+            obj, created = CacheVersion.objects.get_or_create(key=key, defaults={"token": token})
+            if not created:
+                CacheVersion.objects.filter(pk=obj.pk).update(token=token)
+
+    if connection.in_atomic_block:
+        _pending_tokens().update(tokens)
+    transaction.on_commit(lambda: _committed(keys))
@@ -0,0 +1,118 @@
+# core/services/config_snapshot.py
+"""
+Snapshot config per proses:
+- semua CoreSetting dimuat sekali -> dict (category, code) -> value (lookup O(1))
+- singleton config (AccountingSettings, BillingConfig, SalesConfig) dimuat sekali per model
+- versi global di DB (core.CacheVersion), di-bump oleh post_save/post_delete (core.signals)
+  -> proses lain reload saat versi berubah (dicek maksimal 1x per CACHE_VERSION_CHECK_SECONDS)
+Steady state: tanpa query DB (selain cek versi yang di-throttle).
+"""
+import copy
+import threading
+
+from core.services.cache_versions import bump_version, get_version
+
+
+VERSION_KEY = "core:config_snapshot:version"
+
+# model yang perubahannya mem-bump versi snapshot (dipakai core.signals)
+SNAPSHOT_MODELS = [
+    "core.CoreSetting",
+    "accounting.AccountingSettings",
+    "billing.BillingConfig",
+    "sales.SalesConfig",
+]
+
+_lock = threading.Lock()
+_state = {
+    "version": None,
+    "settings": None,  # {(category, code): value}
+    "solo": {},        # {model label: instance}
+}
+
+
+def current_version() -> str:
+    # LocMem per worker -> versi di cache tidak terlihat worker lain, jadi disimpan di DB ✅
+    return get_version(VERSION_KEY)
+
+
+def _sync() -> None:
+    """
+    Buang snapshot lokal kalau versi global sudah berubah (get_version sudah throttled).
+    """
+    version = current_version()
+    if _state["version"] == version:
+        return
+    with _lock:
+        if _state["version"] != version:
+            _state["settings"] = None
+            _state["solo"] = {}
+            _state["version"] = version
+
+
+def invalidate_config_snapshot() -> None:
+    bump_version(VERSION_KEY)
+    with _lock:
+        _state["version"] = None
+        _state["settings"] = None
+        _state["solo"] = {}
+
+
+# ======================================================================
+# CoreSetting
+# ======================================================================
+
+def _setting_value(obj):
+    # urutan prioritas: text_value -> int_value -> char_value
+    if obj.text_value not in (None, ""):
+        return obj.text_value
+    if obj.int_value is not None:
+        return obj.int_value
+    if obj.char_value not in (None, ""):
+        return obj.char_value
+    return None
+
+
+def _load_settings() -> dict:
+    from core.models.settings import CoreSetting
+
+    return {
+        ((obj.category or "").lower(), (obj.code or "").lower()): _setting_value(obj)
+        for obj in CoreSetting.objects.only("category", "code", "int_value", "char_value", "text_value")
+    }
+
+
+def setting(category, code, default=None):
+    _sync()
+    settings_map = _state["settings"]
+    if settings_map is None:
+        version = _state["version"]
+        settings_map = _load_settings()
+        with _lock:
+            # jangan simpan hasil load kalau di tengah jalan sudah di-invalidate
+            if _state["version"] == version:
+                _state["settings"] = settings_map
+
+    val = settings_map.get((str(category).lower(), str(code).lower()))
+    return default if val is None else val
+
+
+# ======================================================================
+# Singleton config
+# ======================================================================
+
+def solo(model, loader):
+    """
+    Instance singleton ter-snapshot. loader() = cara lama ambil/buat row (get_or_create).
+    Return copy -> form / caller yang mengubah field tidak mengotori snapshot.
+    """
+    _sync()
+    label = model._meta.label
+    obj = _state["solo"].get(label)
+    if obj is None:
+        version = _state["version"]
+        obj = loader()
+        with _lock:
+            if _state["version"] == version:
+                _state["solo"][label] = obj
+    return copy.copy(obj)
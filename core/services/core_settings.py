@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Optional
 from django.core.cache import cache
 from core.models.settings  import CoreSetting
+from core.services import config_snapshot
 
 from datetime import timedelta
 from django.utils import timezone
@@ -10,33 +11,13 @@ from django.utils import timezone
 import json
 
 
-CACHE_TTL_SECONDS = 60  # boleh 0 kalau tidak mau cache
-
-
 # core/services/core_settings.py
 def get_setting(category, code, default=None):
-    cache_key = f"core_setting:{category.lower()}:{code.lower()}"
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return cached
-
-    obj = CoreSetting.objects.filter(category__iexact=category, code__iexact=code).first()
-    if not obj:
-        cache.set(cache_key, default, CACHE_TTL_SECONDS)
-        return default
-
-    # urutan prioritas: text_value -> int_value -> char_value
-    if obj.text_value not in (None, ""):
-        val = obj.text_value
-    elif obj.int_value is not None:
-        val = obj.int_value
-    elif obj.char_value not in (None, ""):
-        val = obj.char_value
-    else:
-        val = default
-
-    cache.set(cache_key, val, CACHE_TTL_SECONDS)
-    return val
+    """
+    Lookup dari snapshot per proses (tanpa query di steady state).
+    Urutan prioritas value tetap: text_value -> int_value -> char_value.
+    """
+    return config_snapshot.setting(category, code, default)
 
 def get_setting_json(category, code, default=None):
     """
@@ -93,9 +74,7 @@ def set_setting(category, code, *, int_value=None, char_value=None, text_value=N
         obj.notes = notes or ""
     obj.save()
 
-    # invalidate cache
-    cache_key = f"core_setting:{category.lower()}:{code.lower()}"
-    cache.delete(cache_key)
+    # snapshot config di-invalidate oleh signal post_save (core.signals)
 
     return obj
 
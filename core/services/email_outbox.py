@@ -0,0 +1,245 @@
+# core/services/email_outbox.py
+"""
+Outbox email:
+- view memanggil enqueue_email() -> 1 baris OutboundEmail (ikut transaksi request), langsung return
+- render PDF attachment + SMTP dikerjakan command send_outbox, bukan worker gunicorn
+- pengiriman per batch: baris di-claim dengan SKIP LOCKED (aman >1 worker),
+  semua email 1 batch lewat 1 koneksi SMTP
+- gagal -> retry dengan backoff eksponensial sampai max_attempts, lalu FAILED
+- EMAIL_OUTBOX_MAX_ATTEMPTS / EMAIL_OUTBOX_BACKOFF_SECONDS / EMAIL_OUTBOX_BACKOFF_MAX_SECONDS di settings
+"""
+import base64
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connection as db_connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models.outbox import OutboundEmail
+from core.services.pdf_render import render_pdf_sync
+
+
+logger = logging.getLogger(__name__)
+
+# SENDING lebih lama dari ini dianggap worker-nya mati -> boleh di-claim ulang
+STALE_CLAIM_SECONDS = 15 * 60
+
+
+def _as_list(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return [v for v in value if v]
+
+
+# ======================================================================
+# Enqueue
+# ======================================================================
+
+def pdf_attachment(filename: str, *, html: str, engine: str = "weasyprint", options: dict | None = None) -> dict:
+    """
+    Attachment PDF yang baru di-render oleh worker (HTML sudah final saat enqueue).
+    """
+    return {
+        "filename": filename,
+        "mimetype": "application/pdf",
+        "pdf": {"engine": engine, "html": html, "options": options or {}},
+    }
+
+
+def file_attachment(filename: str, content: bytes, mimetype: str = "application/octet-stream") -> dict:
+    return {
+        "filename": filename,
+        "mimetype": mimetype,
+        "content_b64": base64.b64encode(content).decode("ascii"),
+    }
+
+
+def enqueue_email(
+    *,
+    subject: str,
+    to,
+    body: str = "",
+    html_body: str = "",
+    from_email: str | None = None,
+    cc=None,
+    bcc=None,
+    reply_to=None,
+    attachments: list[dict] | None = None,
+    ref: str = "",
+    user=None,
+) -> OutboundEmail:
+    to = _as_list(to)
+    if not to:
+        raise ValueError("Email tujuan wajib diisi.")
+
+    return OutboundEmail.objects.create(
+        subject=subject,
+        body=body or "",
+        html_body=html_body or "",
+        from_email=from_email or getattr(settings, "DEFAULT_FROM_EMAIL", "") or "",
+        to=to,
+        cc=_as_list(cc),
+        bcc=_as_list(bcc),
+        reply_to=_as_list(reply_to),
+        attachments=attachments or [],
+        ref=ref or "",
+        max_attempts=getattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 5),
+        created_by=user if getattr(user, "is_authenticated", False) else None,
+    )
+
+
+# ======================================================================
+# Worker
+# ======================================================================
+
+@dataclass
+class OutboxResult:
+    batches: int = 0
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+
+
+def backoff_seconds(attempts: int) -> int:
+    base = getattr(settings, "EMAIL_OUTBOX_BACKOFF_SECONDS", 60)
+    cap = getattr(settings, "EMAIL_OUTBOX_BACKOFF_MAX_SECONDS", 60 * 60)
+    return int(min(cap, base * (2 ** max(attempts - 1, 0))))
+
+
+def _due(now):
+    stale = now - timedelta(seconds=STALE_CLAIM_SECONDS)
+    pending = Q(status=OutboundEmail.ST_PENDING) & (
+        Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now)
+    )
+    abandoned = Q(status=OutboundEmail.ST_SENDING, claimed_at__lt=stale)
+    return OutboundEmail.objects.filter(pending | abandoned)
+
+
+def _claim(batch_size: int) -> list[OutboundEmail]:
+    """
+    Ambil maksimal batch_size email yang jatuh tempo, tandai SENDING (transaksi pendek).
+    Baris yang sedang di-claim worker lain di-skip.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        qs = _due(now).order_by("id")
+        if db_connection.features.has_select_for_update_skip_locked:
+            qs = qs.select_for_update(skip_locked=True)
+        elif db_connection.features.has_select_for_update:
+            qs = qs.select_for_update()
+        ids = list(qs.values_list("id", flat=True)[:batch_size])
+        if not ids:
+            return []
+        OutboundEmail.objects.filter(pk__in=ids).update(status=OutboundEmail.ST_SENDING, claimed_at=now)
+    return list(OutboundEmail.objects.filter(pk__in=ids).order_by("id"))
+
+
+def build_message(item: OutboundEmail, connection=None) -> EmailMultiAlternatives:
+    msg = EmailMultiAlternatives(
+        subject=item.subject,
+        body=item.body,
+        from_email=item.from_email or None,
+        to=item.to,
+        cc=item.cc,
+        bcc=item.bcc,
+        reply_to=item.reply_to,
+        connection=connection,
+    )
+    if item.html_body:
+        msg.attach_alternative(item.html_body, "text/html")
+
+    for att in item.attachments or []:
+        filename = att.get("filename") or "attachment"
+        mimetype = att.get("mimetype") or "application/octet-stream"
+        if att.get("pdf"):
+            spec = att["pdf"]
+            path = render_pdf_sync(spec.get("engine") or "weasyprint", spec["html"], spec.get("options"))
+            msg.attach(filename, path.read_bytes(), mimetype)
+        elif att.get("content_b64"):
+            msg.attach(filename, base64.b64decode(att["content_b64"]), mimetype)
+    return msg
+
+
+def _mark_sent(item: OutboundEmail):
+    OutboundEmail.objects.filter(pk=item.pk).update(
+        status=OutboundEmail.ST_SENT,
+        attempts=item.attempts + 1,
+        sent_at=timezone.now(),
+        claimed_at=None,
+        last_error="",
+    )
+
+
+def _mark_failed(item: OutboundEmail, exc: Exception) -> bool:
+    """
+    Return True kalau masih akan di-retry.
+    """
+    attempts = item.attempts + 1
+    retry = attempts < item.max_attempts
+    OutboundEmail.objects.filter(pk=item.pk).update(
+        status=OutboundEmail.ST_PENDING if retry else OutboundEmail.ST_FAILED,
+        attempts=attempts,
+        next_attempt_at=timezone.now() + timedelta(seconds=backoff_seconds(attempts)) if retry else None,
+        claimed_at=None,
+        last_error=f"{type(exc).__name__}: {exc}"[:2000],
+    )
+    return retry
+
+
+def send_batch(items: list[OutboundEmail], result: OutboxResult, connection=None) -> None:
+    """
+    Kirim items lewat 1 koneksi SMTP. Error per email tidak menghentikan batch;
+    koneksi ditutup setelah error supaya email berikutnya membuka koneksi baru.
+    """
+    conn = connection or get_connection(fail_silently=False)
+    try:
+        for item in items:
+            try:
+                msg = build_message(item, connection=conn)
+                # open() eksplisit: kalau send_messages yang membuka, koneksi ditutup lagi tiap email
+                conn.open()
+                conn.send_messages([msg])
+            except Exception as exc:
+                logger.warning("Outbox email %s gagal (attempt %s): %s", item.pk, item.attempts + 1, exc)
+                if _mark_failed(item, exc):
+                    result.retried += 1
+                else:
+                    result.failed += 1
+                conn.close()
+            else:
+                _mark_sent(item)
+                result.sent += 1
+    finally:
+        conn.close()
+
+
+def send_outbox(*, batch_size: int = 50, max_batches: int | None = None, connection=None) -> OutboxResult:
+    """
+    Kirim semua email yang jatuh tempo, batch demi batch. max_batches=None -> sampai antrian kosong.
+    """
+    result = OutboxResult()
+    while max_batches is None or result.batches < max_batches:
+        items = _claim(batch_size)
+        if not items:
+            break
+        send_batch(items, result, connection=connection)
+        result.batches += 1
+    return result
+
+
+def retry_emails(queryset) -> int:
+    """
+    Admin action: jadwalkan ulang email FAILED/PENDING sekarang juga.
+    """
+    return queryset.exclude(status=OutboundEmail.ST_SENT).update(
+        status=OutboundEmail.ST_PENDING,
+        attempts=0,
+        next_attempt_at=None,
+        claimed_at=None,
+    )
@@ -1,5 +1,121 @@
+# core/services/exchange_rates.py
+"""
+Kurs ke IDR dari "rate curve" di memory (per proses):
+- semua ExchangeRate aktif dimuat sekali -> per currency: dates[] + rates[] (urut rate_date)
+- "rate per tanggal X" = bisect di dates (tanpa query)
+- convert_to_idr_many() untuk konversi banyak (currency, date, amount) sekaligus
+- versi global di DB (core.CacheVersion), di-bump oleh post_save/post_delete ExchangeRate/Currency
+  (core.signals); dicek maksimal 1x per CACHE_VERSION_CHECK_SECONDS per proses
+"""
+import threading
+from bisect import bisect_right
 from decimal import Decimal
+
+from core.models.currencies import Currency
 from core.models.exchange_rates import ExchangeRate
+from core.services.cache_versions import bump_version, get_version
+
+
+VERSION_KEY = "core:exchange_rates:version"
+
+IDR = "IDR"
+ONE = Decimal("1.0")
+
+_lock = threading.Lock()
+_state = {
+    "version": None,
+    "curve": None,
+}
+
+
+class RateCurve:
+    def __init__(self, codes: dict, rows):
+        self.codes = codes            # currency_id -> code
+        self.ids = {c: pk for pk, c in codes.items()}
+        self.dates = {}               # currency_id -> [rate_date, ...] (urut)
+        self.rates = {}               # currency_id -> [rate_to_idr, ...]
+        for currency_id, rate_date, rate in rows:
+            self.dates.setdefault(currency_id, []).append(rate_date)
+            self.rates.setdefault(currency_id, []).append(rate)
+
+    @classmethod
+    def build(cls) -> "RateCurve":
+        codes = {pk: (code or "").upper() for pk, code in Currency.objects.values_list("id", "code")}
+        rows = (
+            ExchangeRate.objects
+            .filter(is_active=True)
+            # id = tiebreak deterministik (uq_rate_date_currency mestinya sudah cegah tanggal kembar)
+            .order_by("currency_id", "rate_date", "id")
+            .values_list("currency_id", "rate_date", "rate_to_idr")
+        )
+        return cls(codes, rows)
+
+    def currency_id(self, currency):
+        """
+        Terima instance Currency, pk, atau kode ("USD").
+        """
+        if currency is None or currency == "":
+            return None
+        if isinstance(currency, str):
+            return int(currency) if currency.isdigit() else self.ids.get(currency.upper())
+        return getattr(currency, "pk", currency)
+
+    def is_idr(self, currency, currency_id) -> bool:
+        code = getattr(currency, "code", None) or self.codes.get(currency_id) or ""
+        return code.upper() == IDR
+
+    def rate(self, currency, on_date):
+        cid = self.currency_id(currency)
+        if cid is None:
+            return None
+        if self.is_idr(currency, cid):
+            return ONE
+
+        dates = self.dates.get(cid)
+        if not dates:
+            return None
+        if on_date is None:
+            return self.rates[cid][-1]
+        i = bisect_right(dates, on_date)
+        return self.rates[cid][i - 1] if i else None
+
+    def latest(self, currency):
+        """
+        (rate_date, rate_to_idr) terakhir yang aktif, atau None.
+        """
+        cid = self.currency_id(currency)
+        dates = self.dates.get(cid)
+        if not dates:
+            return None
+        return dates[-1], self.rates[cid][-1]
+
+
+def current_version() -> str:
+    # LocMem per worker -> versi di cache tidak terlihat worker lain, jadi disimpan di DB ✅
+    return get_version(VERSION_KEY)
+
+
+def invalidate_exchange_rates() -> None:
+    bump_version(VERSION_KEY)
+    with _lock:
+        _state["version"] = None
+        _state["curve"] = None
+
+
+def get_rate_curve() -> RateCurve:
+    version = current_version()  # throttled di get_version
+    curve = _state["curve"]
+    if curve is not None and _state["version"] == version:
+        return curve
+
+    curve = RateCurve.build()
+    with _lock:
+        # jangan simpan hasil load kalau di tengah jalan sudah di-invalidate
+        if current_version() == version:
+            _state["curve"] = curve
+            _state["version"] = version
+    return curve
+
 
 def get_rate_to_idr(currency, on_date):
     """
@@ -10,13 +126,32 @@ def get_rate_to_idr(currency, on_date):
         return None
 
     code = (getattr(currency, "code", "") or "").upper()
-    if code == "IDR":
-        return Decimal("1.0")
-
-    return (
-        ExchangeRate.objects
-        .filter(currency=currency, is_active=True, rate_date__lte=on_date)
-        .order_by("-rate_date")
-        .values_list("rate_to_idr", flat=True)
-        .first()
-    )
+    if code == IDR:
+        return ONE
+
+    return get_rate_curve().rate(currency, on_date)
+
+
+def get_rates_to_idr(pairs) -> list:
+    """
+    Batch: [(currency, on_date), ...] -> [Decimal | None, ...] (urutan sama).
+    """
+    curve = get_rate_curve()
+    return [curve.rate(currency, on_date) for currency, on_date in pairs]
+
+
+def convert_to_idr_many(items, quantize=Decimal("0.01")) -> list:
+    """
+    Batch: [(currency, on_date, amount), ...] -> [amount IDR | None, ...] (urutan sama).
+    None kalau kurs tidak ditemukan; quantize=None -> tanpa pembulatan.
+    """
+    curve = get_rate_curve()
+    out = []
+    for currency, on_date, amount in items:
+        rate = curve.rate(currency, on_date)
+        if rate is None or amount is None:
+            out.append(None)
+            continue
+        value = Decimal(amount) * rate
+        out.append(value.quantize(quantize) if quantize is not None else value)
+    return out
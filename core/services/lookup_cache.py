@@ -0,0 +1,52 @@
+# core/services/lookup_cache.py
+"""
+Daftar ringan {id, name} untuk dropdown filter (customer, vendor, service, ...) dari cache.
+- 1 key per jenis list, ber-versi -> invalidate_lookup(name) cukup bump versi
+  (versi di DB/core.CacheVersion: LocMem per worker, bump harus terlihat di semua worker)
+- isi list = dict biasa (id/pk/name), bukan instance model -> template tetap bisa c.id / s.pk / c.name
+- yang memanggil invalidate: signals di app pemilik model (partners.signals, core.signals)
+"""
+from django.core.cache import cache
+
+from core.services.cache_versions import bump_version, get_version
+
+
+VERSION_KEY = "lookup:{name}:version"
+DATA_KEY = "lookup:{name}:v{version}"
+CACHE_TTL_SECONDS = 60 * 60 * 6
+
+
+def _version(name: str) -> str:
+    return get_version(VERSION_KEY.format(name=name))
+
+
+def invalidate_lookup(*names) -> None:
+    bump_version(*(VERSION_KEY.format(name=name) for name in names))
+
+
+def lookup_choices(name: str, queryset, label_field: str = "name") -> list[dict]:
+    """
+    queryset = sumber data (sudah difilter); hanya dievaluasi saat cache miss.
+    """
+    key = DATA_KEY.format(name=name, version=_version(name))
+    rows = cache.get(key)
+    if rows is None:
+        rows = [
+            {"id": pk, "pk": pk, "name": label}
+            for pk, label in queryset.order_by(label_field, "pk").values_list("pk", label_field)
+        ]
+        cache.set(key, rows, CACHE_TTL_SECONDS)
+    return rows
+
+
+# ======================================================================
+# Lookup milik core
+# ======================================================================
+
+SERVICE_LOOKUP = "core.services"
+
+
+def service_choices() -> list[dict]:
+    from core.models.services import Service
+
+    return lookup_choices(SERVICE_LOOKUP, Service.objects.all())
@@ -0,0 +1,227 @@
+# core/services/number_allocator.py
+from __future__ import annotations
+
+import threading
+from datetime import date
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.models.number_sequences import NumberSequence
+
+
+DEFAULT_FORMAT = "{prefix}-{month:02d}{yy:02d}-{seq:04d}"
+
+
+# ======================================================================
+# Format: dikompilasi 1x per (format, prefix, padding)
+# ======================================================================
+
+@lru_cache(maxsize=256)
+def compile_format(fmt: str | None, prefix: str = "", padding: int = 0):
+    """
+    Validasi & normalisasi format sekali saja, return callable(year, month, day, n) -> str.
+    Aturan sama dengan get_next_number lama:
+    - format kosong / kurung kurawal tidak seimbang -> DEFAULT_FORMAT
+    - "prefix}" tanpa "{" -> diperbaiki
+    - tanpa {seq...} -> seq di-zfill manual pakai padding
+    - format error -> DEFAULT_FORMAT
+    """
+    fmt = fmt or DEFAULT_FORMAT
+    prefix = prefix or ""
+
+    if "prefix}" in fmt and "{prefix}" not in fmt:
+        fmt = fmt.replace("prefix}", "{prefix}")
+    if fmt.count("{") != fmt.count("}"):
+        fmt = DEFAULT_FORMAT
+
+    pad_manually = "{seq" not in fmt
+
+    def _seq(n):
+        return str(n).zfill(padding or 0) if pad_manually else n
+
+    try:
+        fmt.format(prefix=prefix, year=2000, yy=0, month=1, day=1, seq=_seq(1))
+    except Exception:
+        fmt = DEFAULT_FORMAT
+
+    def render(year: int, month: int, day: int, n: int) -> str:
+        return fmt.format(prefix=prefix, year=year, yy=year % 100, month=month, day=day, seq=_seq(n))
+
+    return render
+
+
+# ======================================================================
+# Allocator
+# ======================================================================
+
+def _period_key(reset: str, today: date) -> tuple:
+    if reset == NumberSequence.RESET_YEARLY:
+        return (today.year,)
+    if reset == NumberSequence.RESET_NONE:
+        return ()
+    return (today.year, today.month)
+
+
+def _block_size(app_label: str, code: str) -> int:
+    """
+    settings.NUMBERING_BLOCK_SIZES = {"shipments/SHIPMENT": 20, "*": 1}
+    Default 1 -> tanpa celah nomor (aman untuk dokumen pajak / journal).
+    """
+    sizes = getattr(settings, "NUMBERING_BLOCK_SIZES", None) or {}
+    n = sizes.get(f"{app_label}/{code}", sizes.get("*", 1))
+    return max(int(n or 1), 1)
+
+
+class _Block:
+    __slots__ = ("period", "next", "end", "render", "owner", "hook")
+
+    def __init__(self, period, start, end, render):
+        self.period = period
+        self.next = start
+        self.end = end
+        self.render = render
+        self.owner = None  # thread yang me-reserve di dalam transaksi (belum commit)
+        self.hook = None   # callback on_commit penanda blok sudah commit
+
+    def _committed(self):
+        self.owner = None
+        self.hook = None
+
+    def track_commit(self):
+        """
+        Reserve terjadi di dalam transaksi caller -> UPDATE counter baru permanen saat commit.
+        Sampai commit, blok hanya boleh dipakai thread/transaksi yang sama.
+        """
+        self.owner = threading.get_ident()
+        self.hook = self._committed
+        transaction.on_commit(self.hook)
+
+    def usable(self) -> bool:
+        if self.hook is None:
+            return True
+        if self.owner != threading.get_ident():
+            return False
+        # callback on_commit dibuang Django saat rollback (transaksi / savepoint) -> counter di DB
+        # sudah mundur, sisa blok tidak boleh dibagikan lagi
+        return any(item[1] is self.hook for item in connection.run_on_commit)
+
+
+class NumberAllocator:
+    """
+    Alokasi nomor dokumen per proses.
+    - Reserve blok [last+1 .. last+N] dengan 1 UPDATE kondisional (tanpa select_for_update).
+    - Nomor dibagikan dari memory sampai blok habis / periode berganti.
+    - Reset monthly/yearly dilakukan oleh UPDATE kondisional yang sama (hanya 1 worker yang menang).
+    Sisa blok yang tidak terpakai (proses restart / ganti periode) menjadi celah nomor.
+    Reserve di dalam transaksi caller ikut transaksi itu: kalau rollback, blok dibuang
+    (counter di DB mundur, sisa nomor bisa dipakai worker lain).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._blocks: dict[tuple, _Block] = {}
+
+    def clear(self, app_label: str | None = None, code: str | None = None):
+        with self._lock:
+            if app_label is None:
+                self._blocks.clear()
+            else:
+                self._blocks.pop((app_label, code), None)
+
+    def next_number(
+        self,
+        app_label: str,
+        code: str,
+        today: date | None = None,
+        *,
+        block_size: int | None = None,
+        defaults: dict | None = None,
+    ) -> str:
+        """
+        defaults: field NumberSequence (prefix/format/reset/padding) saat row sequence belum ada.
+        """
+        today = today or timezone.localdate()
+        key = (app_label, code)
+
+        with self._lock:
+            blk = self._blocks.get(key)
+            if blk and not blk.usable():
+                if blk.owner == threading.get_ident():
+                    self._blocks.pop(key, None)
+                blk = None
+            if blk and blk.next <= blk.end and blk.period == _period_key_for(blk, today):
+                n = blk.next
+                blk.next += 1
+                return blk.render(today.year, today.month, today.day, n)
+
+        blk = self._reserve(app_label, code, today, block_size or _block_size(app_label, code), defaults)
+        with self._lock:
+            n = blk.next
+            blk.next += 1
+            self._blocks[key] = blk
+        return blk.render(today.year, today.month, today.day, n)
+
+    def _reserve(self, app_label: str, code: str, today: date, size: int, defaults: dict | None = None) -> _Block:
+        year, month = today.year, today.month
+
+        in_caller_transaction = connection.in_atomic_block
+
+        with transaction.atomic():
+            seq, _ = NumberSequence.objects.get_or_create(
+                app_label=app_label,
+                code=code,
+                defaults={
+                    "name": f"{app_label}/{code}",
+                    "prefix": "",
+                    "format": DEFAULT_FORMAT,
+                    "reset": NumberSequence.RESET_MONTHLY,
+                    "last_number": 0,
+                    "period_year": year,
+                    "period_month": month,
+                    "padding": 4,
+                    **(defaults or {}),
+                },
+            )
+            reset = seq.reset or NumberSequence.RESET_MONTHLY
+
+            same_period = Q()
+            if reset == NumberSequence.RESET_YEARLY:
+                same_period = Q(period_year=year)
+            elif reset == NumberSequence.RESET_MONTHLY:
+                same_period = Q(period_year=year, period_month=month)
+
+            base = NumberSequence.objects.filter(pk=seq.pk)
+
+            # 1) periode sama -> naikkan counter sebanyak blok
+            updated = base.filter(same_period).update(last_number=F("last_number") + size)
+
+            # 2) periode berubah -> reset (UPDATE kondisional, aman race)
+            if not updated and reset != NumberSequence.RESET_NONE:
+                updated = base.filter(~same_period).update(
+                    last_number=size, period_year=year, period_month=month,
+                )
+                if not updated:
+                    # worker lain sudah reset duluan -> ulangi increment
+                    base.filter(same_period).update(last_number=F("last_number") + size)
+
+            row = base.values("last_number", "format", "prefix", "padding", "reset").get()
+
+        end = row["last_number"]
+        render = compile_format(row["format"], row["prefix"] or "", row["padding"] or 0)
+        blk = _Block(_period_key(row["reset"], today), end - size + 1, end, render)
+        if in_caller_transaction:
+            blk.track_commit()
+        return blk
+
+
+def _period_key_for(blk: _Block, today: date) -> tuple:
+    # panjang period key blok menentukan jenis reset (yearly=1, monthly=2, none=0)
+    return (today.year, today.month)[:len(blk.period)]
+
+
+allocator = NumberAllocator()
+
@@ -0,0 +1,330 @@
+# core/services/pdf_render.py
+"""
+Shared PDF service:
+- render di worker pool (process/thread), bukan di thread request
+- cache output di disk, key = sha256(engine + options + HTML final)
+  -> HTML final sudah mencakup template + isi dokumen (versi dokumen),
+     jadi dokumen yang berubah otomatis dapat key baru
+- view cukup memanggil pdf_response(); kalau belum jadi -> halaman "sedang diproses"
+  yang polling ke core.views.pdf_result.PdfResultView
+- file cache lama dibuang otomatis (umur / total ukuran), lihat prune_cache()
+  + command `manage.py prune_pdf_cache`
+- PDF_RENDER_WORKERS / PDF_RENDER_POOL / PDF_RENDER_WAIT_SECONDS / PDF_CACHE_DIR /
+  PDF_CACHE_MAX_AGE_SECONDS / PDF_CACHE_MAX_BYTES di settings
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.shortcuts import render
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from core.utils.pdf_engines import ENGINES, render_to_file
+
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_executor = None
+_inflight = {}  # key -> Future
+_last_prune = {"at": 0.0}
+
+PRUNE_INTERVAL_SECONDS = 60 * 60
+# file dengan mtime lebih tua dari ini di-touch saat dipakai -> umur = sejak terakhir dipakai
+TOUCH_AFTER_SECONDS = 60 * 60
+
+KEY_RE = re.compile(r"[0-9a-f]{64}")
+
+
+def cache_dir() -> Path:
+    path = Path(getattr(settings, "PDF_CACHE_DIR", None) or Path(settings.MEDIA_ROOT) / "pdf_cache")
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def pdf_key(engine: str, html: str, options: dict | None = None) -> str:
+    h = hashlib.sha256()
+    h.update(engine.encode("utf-8"))
+    h.update(json.dumps(options or {}, sort_keys=True, default=str).encode("utf-8"))
+    h.update(html.encode("utf-8"))
+    return h.hexdigest()
+
+
+def _pdf_path(key: str) -> Path:
+    return cache_dir() / f"{key}.pdf"
+
+
+def _job_path(key: str) -> Path:
+    return cache_dir() / f"{key}.job.json"
+
+
+def _err_path(key: str) -> Path:
+    return cache_dir() / f"{key}.err"
+
+
+def cached_pdf(key: str) -> Path | None:
+    path = _pdf_path(key)
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    if time.time() - mtime > TOUCH_AFTER_SECONDS:
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+    return path
+
+
+@lru_cache(maxsize=1)
+def xhtml2pdf_options() -> dict:
+    """
+    Options xhtml2pdf: folder static untuk link_callback di worker PDF.
+    Dihitung di sini (proses web, Django siap) -> worker tidak perlu import Django / view.
+    """
+    from django.contrib.staticfiles.finders import AppDirectoriesFinder
+
+    dirs = [str(Path(settings.BASE_DIR) / "static")]
+    for entry in getattr(settings, "STATICFILES_DIRS", []) or []:
+        dirs.append(str(entry[1] if isinstance(entry, (list, tuple)) else entry))
+    if getattr(settings, "STATIC_ROOT", None):
+        dirs.append(str(settings.STATIC_ROOT))
+    for storage in AppDirectoriesFinder().storages.values():
+        dirs.append(str(storage.location))
+
+    unique = list(dict.fromkeys(d for d in dirs if os.path.isdir(d)))
+    return {"static_links": {"url": settings.STATIC_URL, "dirs": unique}}
+
+
+def prune_cache(*, max_age_seconds: float | None = None, max_bytes: int | None = None) -> dict:
+    """
+    Buang file cache PDF:
+    - lebih tua dari max_age_seconds (mtime; PDF yang dipakai ulang di-touch oleh cached_pdf)
+    - lalu yang paling lama tidak dipakai sampai total ukuran <= max_bytes
+    Job yang sedang jalan di proses ini tidak disentuh. Return {"files", "bytes"} yang dihapus.
+    """
+    if max_age_seconds is None:
+        max_age_seconds = getattr(settings, "PDF_CACHE_MAX_AGE_SECONDS", 7 * 24 * 60 * 60)
+    if max_bytes is None:
+        max_bytes = getattr(settings, "PDF_CACHE_MAX_BYTES", 2 * 1024 ** 3)
+
+    with _lock:
+        busy = set(_inflight)
+
+    entries = []
+    for entry in os.scandir(cache_dir()):
+        if not entry.is_file() or entry.name.split(".", 1)[0] in busy:
+            continue
+        try:
+            st = entry.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime, st.st_size, entry.path))
+
+    now = time.time()
+    removed = {"files": 0, "bytes": 0}
+
+    def _remove(size, path):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            return
+        removed["files"] += 1
+        removed["bytes"] += size
+
+    keep = []
+    for mtime, size, path in entries:
+        if max_age_seconds and now - mtime > max_age_seconds:
+            _remove(size, path)
+        else:
+            keep.append((mtime, size, path))
+
+    total = sum(size for _, size, _ in keep)
+    if max_bytes:
+        for mtime, size, path in sorted(keep):
+            if total <= max_bytes:
+                break
+            _remove(size, path)
+            total -= size
+
+    return removed
+
+
+def _maybe_prune():
+    now = time.monotonic()
+    with _lock:
+        if now - _last_prune["at"] < PRUNE_INTERVAL_SECONDS:
+            return
+        _last_prune["at"] = now
+    try:
+        prune_cache()
+    except OSError as exc:
+        logger.warning("PDF cache prune failed: %s", exc)
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            workers = getattr(settings, "PDF_RENDER_WORKERS", 2)
+            if getattr(settings, "PDF_RENDER_POOL", "process") == "thread":
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf")
+            else:
+                _executor = ProcessPoolExecutor(max_workers=workers)
+        return _executor
+
+
+def _done(key, future):
+    with _lock:
+        _inflight.pop(key, None)
+    exc = future.exception()
+    if exc:
+        logger.error("PDF render failed key=%s: %s", key, exc)
+        _err_path(key).write_text(str(exc), encoding="utf-8")
+    # sukses -> PDF sudah di disk; gagal -> job dibuang supaya tidak di-resume terus
+    _job_path(key).unlink(missing_ok=True)
+
+
+def _pop_error(key: str) -> bool:
+    """
+    Render gagal -> lapor 1x lalu hapus marker (request berikutnya boleh coba lagi).
+    """
+    path = _err_path(key)
+    if not path.exists():
+        return False
+    path.unlink(missing_ok=True)
+    return True
+
+
+def submit(engine: str, html: str, options: dict | None = None) -> str:
+    """
+    Antrikan render (idempotent per key). Return key.
+    Job spec disimpan ke disk supaya worker gunicorn lain bisa melanjutkan saat polling.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown PDF engine: {engine}")
+
+    options = options or {}
+    key = pdf_key(engine, html, options)
+    if cached_pdf(key):
+        return key
+
+    with _lock:
+        if key in _inflight:
+            return key
+
+    _maybe_prune()
+
+    job = _job_path(key)
+    if not job.exists():
+        job.write_text(json.dumps({"engine": engine, "options": options, "html": html}), encoding="utf-8")
+    _err_path(key).unlink(missing_ok=True)
+
+    _start(key, engine, html, options)
+    return key
+
+
+def _start(key, engine, html, options):
+    future = _get_executor().submit(render_to_file, engine, html, options, str(_pdf_path(key)))
+    with _lock:
+        _inflight[key] = future
+    future.add_done_callback(lambda f: _done(key, f))
+    return future
+
+
+def resume(key: str) -> bool:
+    """
+    Polling dari proses lain: job ada di disk tapi tidak sedang jalan di proses ini -> jalankan.
+    Return False kalau job tidak dikenal.
+    """
+    with _lock:
+        if key in _inflight:
+            return True
+
+    job = _job_path(key)
+    if not job.exists():
+        return False
+
+    spec = json.loads(job.read_text(encoding="utf-8"))
+    _start(key, spec["engine"], spec["html"], spec["options"])
+    return True
+
+
+def render_pdf_sync(engine: str, html: str, options: dict | None = None) -> Path:
+    """
+    Render langsung di proses ini (untuk worker/command, bukan request), pakai cache disk yang sama.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown PDF engine: {engine}")
+    options = options or {}
+    key = pdf_key(engine, html, options)
+    return cached_pdf(key) or Path(render_to_file(engine, html, options, str(_pdf_path(key))))
+
+
+def wait(key: str, timeout: float) -> Path | None:
+    with _lock:
+        future = _inflight.get(key)
+    if future and timeout > 0:
+        try:
+            future.result(timeout=timeout)
+        except TimeoutError:
+            pass
+    return cached_pdf(key)
+
+
+def _file_response(path: Path, filename: str):
+    resp = FileResponse(open(path, "rb"), content_type="application/pdf")
+    resp["Content-Disposition"] = f'inline; filename="{filename}"'
+    return resp
+
+
+def _pending_response(request, key: str, filename: str):
+    poll_url = reverse("core:pdf_result", kwargs={"key": key}) + "?" + urlencode({"f": filename})
+    return render(
+        request,
+        "print/pdf_pending.html",
+        {"poll_url": poll_url, "filename": filename, "refresh_seconds": 2},
+        status=202,
+    )
+
+
+def pdf_response(request, *, engine: str, html: str, filename: str, options: dict | None = None):
+    """
+    Entry point untuk view PDF:
+    - sudah ada di cache disk -> langsung dikirim
+    - belum -> antrikan, tunggu sebentar (PDF_RENDER_WAIT_SECONDS, default 0), lalu
+      kirim PDF atau halaman "sedang diproses" (202) yang polling otomatis
+      -> jaga wait tetap kecil (0-1 detik): selama menunggu, worker gunicorn ikut tertahan
+    """
+    key = submit(engine, html, options)
+    path = cached_pdf(key) or wait(key, getattr(settings, "PDF_RENDER_WAIT_SECONDS", 0))
+    if path:
+        return _file_response(path, filename)
+    if _pop_error(key):
+        return HttpResponse("Gagal membuat PDF.", status=500)
+    return _pending_response(request, key, filename)
+
+
+def pdf_result(request, key: str):
+    if not KEY_RE.fullmatch(key):
+        raise Http404("PDF not found.")
+
+    filename = (request.GET.get("f") or "document.pdf").replace('"', "")
+    path = cached_pdf(key)
+    if path:
+        return _file_response(path, filename)
+    if _pop_error(key):
+        return HttpResponse("Gagal membuat PDF.", status=500)
+    if not resume(key):
+        raise Http404("PDF not found.")
+    return _pending_response(request, key, filename)
@@ -0,0 +1,129 @@
+# core/services/tax_engine.py
+"""
+Hitung pajak dokumen (invoice, vendor booking, ...) dalam 1 query + 1 pass:
+- baris dokumen LEFT JOIN taxes (M2M) -> (line id, DPP, tax id, rate, group) sekaligus
+- hasil: subtotal, pajak per baris, total per group (PPN/PPH/OTHER), rate per group, tax_total
+- document_taxes() menyimpan hasil di instance dokumen (memo per request);
+  fungsi recalc yang baru mengubah baris memanggil dengan refresh=True
+
+Pembulatan (HALF_UP, 2 desimal):
+- ROUND_PER_LINE: pajak dibulatkan per baris per tax (vendor booking / print)
+- ROUND_PER_TAX : DPP dijumlah per tax dulu, lalu dibulatkan 1x per tax (invoice)
+"""
+from dataclasses import dataclass, field
+from decimal import Decimal, ROUND_HALF_UP
+
+
+Q2 = Decimal("0.01")
+ZERO = Decimal("0.00")
+HUNDRED = Decimal("100")
+
+ROUND_PER_LINE = "line"
+ROUND_PER_TAX = "tax"
+
+MEMO_ATTR = "_tax_breakdowns"
+
+
+def q2(value) -> Decimal:
+    return Decimal(value or 0).quantize(Q2, rounding=ROUND_HALF_UP)
+
+
+def format_rate(rate) -> str:
+    # 11.00 -> "11", 1.10 -> "1.1" (tanpa notasi 1E+1)
+    return format(Decimal(rate).normalize(), "f")
+
+
+@dataclass
+class TaxBreakdown:
+    subtotal: Decimal = ZERO
+    tax_total: Decimal = ZERO
+    line_bases: dict = field(default_factory=dict)   # line id -> DPP
+    line_taxes: dict = field(default_factory=dict)   # line id -> total pajak baris
+    groups: dict = field(default_factory=dict)       # "PPN" -> amount
+    rates: dict = field(default_factory=dict)        # "PPN" -> [Decimal rate, ...] (urut, unik)
+
+    def group_amount(self, group: str) -> Decimal:
+        return self.groups.get((group or "").upper(), ZERO)
+
+    def line_tax(self, line_id) -> Decimal:
+        return self.line_taxes.get(line_id, ZERO)
+
+    def rate_label(self, group: str, prefix: str | None = None) -> str:
+        """
+        "PPN 1.1% + 11%" atau "-" kalau group tidak dipakai.
+        """
+        group = (group or "").upper()
+        rates = self.rates.get(group)
+        if not rates:
+            return "-"
+        return f"{prefix or group} " + " + ".join(f"{format_rate(r)}%" for r in rates)
+
+
+def compute_taxes(lines, *, base=("amount",), rounding: str = ROUND_PER_LINE) -> TaxBreakdown:
+    """
+    lines = queryset baris dokumen (mis. invoice.lines.all()) dengan M2M `taxes`.
+    base  = field DPP per baris; >1 field dikalikan (mis. ("quantity", "price")).
+    """
+    rows = lines.order_by().values_list("pk", *base, "taxes__id", "taxes__rate", "taxes__group")
+
+    result = TaxBreakdown()
+    tax_bases = {}   # tax id -> (DPP total, rate, group)  [ROUND_PER_TAX]
+    rates = {}
+
+    for row in rows:
+        line_id = row[0]
+        tax_id, rate, group = row[-3:]
+
+        if line_id not in result.line_bases:
+            amount = Decimal("1")
+            for value in row[1:1 + len(base)]:
+                amount *= Decimal(value or 0)
+            amount = q2(amount)
+            result.line_bases[line_id] = amount
+            result.line_taxes[line_id] = ZERO
+            result.subtotal += amount
+
+        if tax_id is None:
+            continue
+
+        amount = result.line_bases[line_id]
+        rate = Decimal(rate or 0)
+        group = (group or "").upper()
+        rates.setdefault(group, set()).add(rate)
+
+        if rounding == ROUND_PER_TAX:
+            prev = tax_bases.get(tax_id, (ZERO, rate, group))[0]
+            tax_bases[tax_id] = (prev + amount, rate, group)
+            result.line_taxes[line_id] += amount * rate / HUNDRED
+        else:
+            tax = q2(amount * rate / HUNDRED)
+            result.line_taxes[line_id] += tax
+            result.groups[group] = result.groups.get(group, ZERO) + tax
+
+    if rounding == ROUND_PER_TAX:
+        for tax_base, rate, group in tax_bases.values():
+            result.groups[group] = result.groups.get(group, ZERO) + q2(tax_base * rate / HUNDRED)
+        result.line_taxes = {pk: q2(v) for pk, v in result.line_taxes.items()}
+
+    result.subtotal = q2(result.subtotal)
+    result.tax_total = q2(sum(result.groups.values(), ZERO))
+    result.rates = {g: sorted(r) for g, r in rates.items()}
+    return result
+
+
+def document_taxes(doc, *, lines_attr: str = "lines", base=("amount",), rounding: str = ROUND_PER_LINE,
+                   refresh: bool = False) -> TaxBreakdown:
+    """
+    TaxBreakdown dokumen, di-memo di instance (doc) -> property/print berikutnya tanpa query.
+    """
+    if doc.pk is None:
+        return TaxBreakdown()
+    key = (lines_attr, tuple(base), rounding)
+    memo = doc.__dict__.setdefault(MEMO_ATTR, {})
+    if refresh or key not in memo:
+        memo[key] = compute_taxes(getattr(doc, lines_attr).all(), base=base, rounding=rounding)
+    return memo[key]
+
+
+def forget_taxes(doc) -> None:
+    doc.__dict__.pop(MEMO_ATTR, None)
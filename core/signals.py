@@ -1,8 +1,13 @@
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 from core.models.user_profile import UserProfile
+from core.models.number_sequences import NumberSequence
+from core.services.config_snapshot import SNAPSHOT_MODELS, invalidate_config_snapshot
+from core.services.exchange_rates import invalidate_exchange_rates
+from core.services.lookup_cache import SERVICE_LOOKUP, invalidate_lookup
+from core.services.number_allocator import allocator
 
 User = get_user_model()
 
@@ -10,3 +15,36 @@ User = get_user_model()
 def create_user_profile(sender, instance, created, **kwargs):
     if created:
         UserProfile.objects.create(user=instance)
+
+
+@receiver(post_save, sender=NumberSequence)
+@receiver(post_delete, sender=NumberSequence)
+def number_sequence_changed(sender, instance, **kwargs):
+    # format/prefix/counter diubah admin -> buang blok nomor lokal
+    allocator.clear(instance.app_label, instance.code)
+
+
+def config_changed(sender, instance, **kwargs):
+    # CoreSetting / singleton config berubah -> semua proses reload snapshot
+    invalidate_config_snapshot()
+
+
+for _model in SNAPSHOT_MODELS:
+    post_save.connect(config_changed, sender=_model, dispatch_uid=f"config_snapshot:save:{_model}")
+    post_delete.connect(config_changed, sender=_model, dispatch_uid=f"config_snapshot:delete:{_model}")
+
+
+@receiver(post_save, sender="core.ExchangeRate")
+@receiver(post_delete, sender="core.ExchangeRate")
+@receiver(post_save, sender="core.Currency")
+@receiver(post_delete, sender="core.Currency")
+def exchange_rates_changed(sender, instance, **kwargs):
+    # kurs/currency berubah -> semua proses reload rate curve
+    invalidate_exchange_rates()
+
+
+@receiver(post_save, sender="core.Service")
+@receiver(post_delete, sender="core.Service")
+def service_changed(sender, instance, **kwargs):
+    # daftar dropdown filter service
+    invalidate_lookup(SERVICE_LOOKUP)
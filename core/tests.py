@@ -1,3 +1,179 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from io import StringIO
+from smtplib import SMTPException
 
-# Create your tests here.
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend as LocmemBackend
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from core.models.number_sequences import NumberSequence
+from core.models.outbox import OutboundEmail
+from core.services.email_outbox import enqueue_email, send_outbox
+from core.services.number_allocator import NumberAllocator
+
+
+class NumberAllocatorRollbackTests(TransactionTestCase):
+    """
+    Blok nomor yang di-reserve di dalam transaksi caller tidak boleh dipakai lagi setelah rollback.
+    """
+
+    today = date(2026, 1, 15)
+    defaults = {"format": "{prefix}{seq:04d}", "prefix": "T"}
+
+    def _next(self, allocator):
+        return allocator.next_number("core", "TEST", self.today, block_size=5, defaults=self.defaults)
+
+    def test_rolled_back_block_is_not_reused(self):
+        worker_a = NumberAllocator()
+        worker_b = NumberAllocator()
+        self._next(worker_a)  # buat row sequence (committed), blok T0001..T0005
+
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                worker_a.clear()
+                self.assertEqual(self._next(worker_a), "T0006")
+                raise RuntimeError("rollback")
+
+        # counter di DB mundur ke 5 -> worker lain dapat blok T0006..T0010
+        self.assertEqual(self._next(worker_b), "T0006")
+
+        issued = {self._next(worker_b) for _ in range(4)}
+        self.assertNotIn(self._next(worker_a), issued | {"T0006"})
+
+    def test_rolled_back_savepoint_drops_block(self):
+        worker = NumberAllocator()
+        self._next(worker)
+
+        with transaction.atomic():
+            worker.clear()
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    self.assertEqual(self._next(worker), "T0006")
+                    raise RuntimeError("rollback savepoint")
+            self.assertEqual(self._next(worker), "T0006")
+
+        self.assertEqual(NumberSequence.objects.get(code="TEST").last_number, 10)
+
+    def test_committed_block_is_reused_without_new_reserve(self):
+        worker = NumberAllocator()
+
+        with transaction.atomic():
+            self.assertEqual(self._next(worker), "T0001")
+
+        self.assertEqual(self._next(worker), "T0002")
+        self.assertEqual(NumberSequence.objects.get(code="TEST").last_number, 5)
+
+    def test_uncommitted_block_is_reused_in_same_transaction(self):
+        worker = NumberAllocator()
+
+        with transaction.atomic():
+            numbers = [self._next(worker) for _ in range(3)]
+
+        self.assertEqual(numbers, ["T0001", "T0002", "T0003"])
+        self.assertEqual(NumberSequence.objects.get(code="TEST").last_number, 5)
+
+
+class _FailingBackend(LocmemBackend):
+    def send_messages(self, messages):
+        raise SMTPException("smtp down")
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    EMAIL_OUTBOX_MAX_ATTEMPTS=3,
+    EMAIL_OUTBOX_BACKOFF_SECONDS=60,
+    EMAIL_OUTBOX_BACKOFF_MAX_SECONDS=3600,
+)
+class EmailOutboxTests(TestCase):
+    """
+    enqueue -> send_outbox kirim lewat backend; gagal -> retry dengan backoff, lalu FAILED.
+    """
+
+    def _enqueue(self, **kwargs):
+        return enqueue_email(subject="Invoice INV0001", to="customer@example.com", body="Terlampir.", **kwargs)
+
+    def _send_failing(self):
+        with self.assertLogs("core.services.email_outbox", level="WARNING"):
+            return send_outbox(connection=_FailingBackend())
+
+    def _make_due(self, item):
+        OutboundEmail.objects.filter(pk=item.pk).update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+
+    def test_enqueued_email_is_delivered_by_command(self):
+        item = self._enqueue(cc=["finance@example.com"])
+        self.assertEqual(len(mail.outbox), 0)  # enqueue tidak mengirim
+
+        out = StringIO()
+        call_command("send_outbox", stdout=out)
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, "Invoice INV0001")
+        self.assertEqual(mail.outbox[0].to, ["customer@example.com"])
+        self.assertEqual(mail.outbox[0].cc, ["finance@example.com"])
+        self.assertIn("sent 1", out.getvalue())
+
+        item.refresh_from_db()
+        self.assertEqual(item.status, OutboundEmail.ST_SENT)
+        self.assertEqual(item.attempts, 1)
+        self.assertIsNotNone(item.sent_at)
+
+        # sudah SENT -> tidak dikirim ulang
+        call_command("send_outbox", stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_failed_send_is_retried_with_backoff(self):
+        item = self._enqueue()
+
+        before = timezone.now()
+        result = self._send_failing()
+        self.assertEqual((result.sent, result.retried, result.failed), (0, 1, 0))
+
+        item.refresh_from_db()
+        self.assertEqual(item.status, OutboundEmail.ST_PENDING)
+        self.assertEqual(item.attempts, 1)
+        self.assertIn("smtp down", item.last_error)
+        self.assertGreaterEqual(item.next_attempt_at, before + timedelta(seconds=60))
+        self.assertLess(item.next_attempt_at, before + timedelta(seconds=120))
+
+        # belum jatuh tempo -> tidak di-claim
+        self.assertEqual(send_outbox().batches, 0)
+        self.assertEqual(len(mail.outbox), 0)
+
+        # gagal lagi -> jeda 2x lipat
+        self._make_due(item)
+        before = timezone.now()
+        self._send_failing()
+        item.refresh_from_db()
+        self.assertEqual(item.attempts, 2)
+        self.assertGreaterEqual(item.next_attempt_at, before + timedelta(seconds=120))
+
+        # jatuh tempo + SMTP normal -> terkirim
+        self._make_due(item)
+        result = send_outbox()
+        self.assertEqual(result.sent, 1)
+        self.assertEqual(len(mail.outbox), 1)
+        item.refresh_from_db()
+        self.assertEqual((item.status, item.attempts, item.last_error), (OutboundEmail.ST_SENT, 3, ""))
+
+    def test_marked_failed_after_max_attempts(self):
+        item = self._enqueue()
+        self.assertEqual(item.max_attempts, 3)
+
+        for _ in range(2):
+            self._send_failing()
+            self._make_due(item)
+
+        result = self._send_failing()
+        self.assertEqual((result.retried, result.failed), (0, 1))
+
+        item.refresh_from_db()
+        self.assertEqual(item.status, OutboundEmail.ST_FAILED)
+        self.assertEqual(item.attempts, 3)
+        self.assertIsNone(item.next_attempt_at)
+
+        # FAILED tidak diambil worker lagi
+        self.assertEqual(send_outbox().batches, 0)
+        self.assertEqual(len(mail.outbox), 0)
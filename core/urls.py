@@ -183,3 +183,10 @@ urlpatterns += [
     path("profile/modal/", ProfileModalView.as_view(), name="profile_modal"),
     path("profile/modal/submit/", ProfileModalSubmitView.as_view(), name="profile_modal_submit"),
 ]
+
+
+from core.views.pdf_result import PdfResultView
+
+urlpatterns += [
+    path("pdf/<str:key>/", PdfResultView.as_view(), name="pdf_result"),
+]
@@ -0,0 +1,315 @@
+# core/utils/keyset_pagination.py
+"""
+Keyset ("seek") pagination untuk ListView besar -> pengganti Paginator OFFSET bawaan.
+
+- urutan diambil dari order_by queryset yang sudah ada (mis. -job_date, -id), pk ditambah
+  otomatis sebagai tie-breaker
+- Next/Previous: WHERE (kolom sort) < / > nilai baris terakhir/pertama -> tanpa OFFSET,
+  halaman ke-1000 sama cepatnya dengan halaman 1
+- cursor ikut di parameter ?page= (contoh "3~a~eyJ..."), jadi template lama yang menulis
+  ?page={{ page_obj.next_page_number }} tetap jalan tanpa diubah
+- lompat ke nomor halaman (?page=7 tanpa cursor) tetap bisa -> fallback OFFSET
+- total count di-cache per "signature" filter (SQL query) selama COUNT_CACHE_SECONDS,
+  dan baru dihitung kalau template memang memakai paginator.count / num_pages / page_range
+
+Pakai:
+    class JobOrderListView(KeysetPaginationMixin, LoginRequiredMixin, ListView):
+        paginate_by = 20
+"""
+import base64
+import datetime
+import hashlib
+import json
+import math
+from collections.abc import Sequence
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connection
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+
+
+COUNT_CACHE_SECONDS = 120
+COUNT_CACHE_KEY = "keyset:count:{sig}"
+
+TOKEN_SEP = "~"
+AFTER = "a"
+BEFORE = "b"
+
+
+# ======================================================================
+# Cursor encode / decode
+# ======================================================================
+
+def _encode_value(value):
+    if isinstance(value, (datetime.date, datetime.datetime, datetime.time)):
+        return value.isoformat()  # isoformat penuh (microsecond tidak dipotong)
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def encode_cursor(values) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str):
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        return None
+    return values if isinstance(values, list) else None
+
+
+def parse_page_param(value):
+    """
+    "3" -> (3, None, None); "3~a~<cursor>" -> (3, "a", [nilai...]). Input aneh -> halaman 1.
+    """
+    parts = str(value or "1").split(TOKEN_SEP, 2)
+    try:
+        number = max(int(parts[0]), 1)
+    except ValueError:
+        return 1, None, None
+    if len(parts) == 3 and parts[1] in (AFTER, BEFORE):
+        values = decode_cursor(parts[2])
+        if values is not None:
+            return number, parts[1], values
+    return number, None, None
+
+
+# ======================================================================
+# Sort keys
+# ======================================================================
+
+class SortKey:
+    def __init__(self, model, path: str, desc: bool):
+        self.desc = desc
+        self.path = model._meta.pk.name if path == "pk" else path
+        self.field, self.nullable = self._resolve(model, self.path)
+
+    @staticmethod
+    def _resolve(model, path):
+        field = None
+        nullable = False
+        by_column = False
+        opts = model._meta
+        for name in path.split(LOOKUP_SEP):
+            field = opts.get_field(name)
+            # "customer_id" -> kolom FK langsung (bandingkan id, tanpa JOIN)
+            by_column = field.is_relation and name == getattr(field, "attname", None) != field.name
+            nullable = nullable or getattr(field, "null", False)
+            if field.is_relation and field.related_model is not None:
+                opts = field.related_model._meta
+        if field.is_relation and not by_column:
+            # order_by("customer") diurutkan pakai Meta.ordering model tujuan, bukan id
+            # -> tidak bisa di-seek dengan nilai FK, biarkan fallback ke OFFSET
+            raise ValueError(f"ordering by relation {path!r}")
+        return field, nullable
+
+    def value_of(self, obj):
+        cur = obj
+        names = self.path.split(LOOKUP_SEP)
+        for name in names:
+            if cur is None:
+                return None
+            cur = getattr(cur, name)
+        return cur
+
+    def to_python(self, value):
+        return None if value is None else self.field.to_python(value)
+
+
+def sort_keys(queryset):
+    """
+    Return list SortKey dari order_by queryset (+ pk), atau None kalau urutan tidak
+    bisa di-seek (ekspresi, random, ...).
+    """
+    model = queryset.model
+    ordering = list(queryset.query.order_by or model._meta.ordering or [])
+    keys = []
+    for item in ordering:
+        if not isinstance(item, str) or item == "?":
+            return None
+        desc = item.startswith("-")
+        try:
+            keys.append(SortKey(model, item.lstrip("-+"), desc))
+        except (FieldDoesNotExist, ValueError):
+            return None
+
+    pk_name = model._meta.pk.name
+    if not any(k.path in (pk_name, "id") for k in keys):
+        keys.append(SortKey(model, pk_name, keys[-1].desc if keys else True))
+    return keys
+
+
+def _seek_q(keys, values, forward: bool) -> Q:
+    """
+    (k1, k2, ...) "setelah" (v1, v2, ...) menurut urutan keys:
+    k1 < v1 OR (k1 = v1 AND k2 < v2) OR ...   (arah < / > tergantung desc & forward)
+    """
+    nulls_largest = connection.features.nulls_order_largest
+    q = Q()
+    for i, key in enumerate(keys):
+        older = key.desc == forward  # desc + maju -> nilai lebih kecil
+        cond = Q(**{f"{key.path}__{'lt' if older else 'gt'}": values[i]})
+        if key.nullable and older != nulls_largest:
+            # baris NULL ada di "belakang" urutan ini (MySQL: NULL terkecil) -> ikut
+            cond |= Q(**{f"{key.path}__isnull": True})
+        for prev, val in zip(keys[:i], values[:i]):
+            cond &= Q(**{prev.path: val})
+        q |= cond
+    return q
+
+
+# ======================================================================
+# Paginator / Page (API mirip django.core.paginator)
+# ======================================================================
+
+class KeysetPaginator:
+    def __init__(self, queryset, per_page: int):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self._count = None
+
+    def _signature(self) -> str:
+        sql = str(self.queryset.order_by().query)
+        return hashlib.sha1(f"{self.queryset.model._meta.label}:{sql}".encode("utf-8")).hexdigest()
+
+    @property
+    def count(self) -> int:
+        if self._count is None:
+            key = COUNT_CACHE_KEY.format(sig=self._signature())
+            count = cache.get(key)
+            if count is None:
+                count = self.queryset.order_by().count()
+                cache.set(key, count, COUNT_CACHE_SECONDS)
+            self._count = count
+        return self._count
+
+    @property
+    def num_pages(self) -> int:
+        return max(1, math.ceil(self.count / self.per_page)) if self.per_page else 1
+
+    @property
+    def page_range(self):
+        return range(1, self.num_pages + 1)
+
+
+class KeysetPage(Sequence):
+    def __init__(self, object_list, number, paginator, keys, has_next, has_previous):
+        self.object_list = object_list
+        self.number = number
+        self.paginator = paginator
+        self._keys = keys
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f"<KeysetPage {self.number}>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    def _token(self, number, direction, obj):
+        if obj is None:
+            return number
+        values = [k.value_of(obj) for k in self._keys]
+        if any(v is None for v in values):
+            # NULL di kolom sort -> tidak bisa di-seek, pakai nomor halaman (OFFSET)
+            return number
+        return f"{number}{TOKEN_SEP}{direction}{TOKEN_SEP}{encode_cursor(values)}"
+
+    def next_page_number(self):
+        return self._token(self.number + 1, AFTER, self.object_list[-1] if self.object_list else None)
+
+    def previous_page_number(self):
+        if self.number <= 2:
+            return 1
+        return self._token(self.number - 1, BEFORE, self.object_list[0] if self.object_list else None)
+
+    def start_index(self):
+        if not self.object_list:
+            return 0
+        return (self.number - 1) * self.paginator.per_page + 1
+
+    def end_index(self):
+        return self.start_index() + len(self.object_list) - 1 if self.object_list else 0
+
+
+def keyset_page(queryset, per_page: int, page_param):
+    """
+    Return KeysetPage, atau None kalau urutan queryset tidak bisa di-seek.
+    """
+    keys = sort_keys(queryset)
+    if keys is None:
+        return None
+
+    paginator = KeysetPaginator(queryset, per_page)
+    number, direction, raw_values = parse_page_param(page_param)
+    if raw_values is not None and len(raw_values) != len(keys):
+        direction = None
+
+    ordered = queryset.order_by(*[f"{'-' if k.desc else ''}{k.path}" for k in keys])
+
+    if direction:
+        try:
+            values = [k.to_python(v) for k, v in zip(keys, raw_values)]
+        except Exception:
+            direction = None
+
+    if direction == AFTER:
+        rows = list(ordered.filter(_seek_q(keys, values, forward=True))[: per_page + 1])
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+        has_previous = number > 1
+    elif direction == BEFORE:
+        reverse = ordered.reverse()
+        rows = list(reverse.filter(_seek_q(keys, values, forward=False))[: per_page + 1])
+        has_previous = len(rows) > per_page
+        rows = list(reversed(rows[:per_page]))
+        has_next = True
+        if not has_previous:
+            number = 1
+    else:
+        # lompat langsung ke nomor halaman -> OFFSET biasa
+        offset = (number - 1) * per_page
+        rows = list(ordered[offset: offset + per_page + 1])
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+        has_previous = number > 1
+
+    if number == 1 and not has_next:
+        # halaman tunggal -> count sudah diketahui, tanpa query COUNT
+        paginator._count = len(rows)
+
+    return KeysetPage(rows, number, paginator, keys, has_next, has_previous)
+
+
+class KeysetPaginationMixin:
+    """
+    Mixin ListView: ganti paginate_queryset bawaan (OFFSET + COUNT tiap request)
+    dengan keyset pagination. Urutan = order_by dari get_queryset().
+    """
+
+    def paginate_queryset(self, queryset, page_size):
+        page_param = self.kwargs.get(self.page_kwarg) or self.request.GET.get(self.page_kwarg) or 1
+        page = keyset_page(queryset, page_size, page_param)
+        if page is None:
+            return super().paginate_queryset(queryset, page_size)
+        return page.paginator, page, page.object_list, page.has_other_pages()
@@ -0,0 +1,103 @@
+# core/utils/pdf_engines.py
+"""
+Renderer HTML -> PDF murni (tanpa akses DB), aman dijalankan di process pool.
+Semua argumen harus picklable: html (str) + options (dict str/angka).
+"""
+import io
+import os
+import tempfile
+
+
+def render_weasyprint(html: str, options: dict) -> bytes:
+    from weasyprint import HTML
+
+    return HTML(string=html, base_url=options.get("base_url")).write_pdf()
+
+
+def render_wkhtmltopdf(html: str, options: dict) -> bytes:
+    import pdfkit
+
+    wk_options = dict(options.get("wkhtmltopdf_options") or {})
+    tmp_files = []
+
+    # wkhtmltopdf butuh path file untuk header/footer
+    for opt, key in (("header-html", "header_html"), ("footer-html", "footer_html")):
+        content = options.get(key)
+        if content:
+            tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".html")
+            tmp.write(content.encode("utf-8"))
+            tmp.close()
+            tmp_files.append(tmp.name)
+            wk_options[opt] = tmp.name
+
+    try:
+        cmd = options.get("wkhtmltopdf_cmd")
+        config = pdfkit.configuration(wkhtmltopdf=cmd) if cmd else None
+        return pdfkit.from_string(html, False, options=wk_options, configuration=config)
+    finally:
+        for name in tmp_files:
+            os.unlink(name)
+
+
+def static_link_callback(static_url: str, static_dirs: list[str]):
+    """
+    link_callback xhtml2pdf tanpa Django (aman di process pool, termasuk start method spawn):
+    /static/... dicari di static_dirs (dihitung di proses web, dikirim lewat options).
+    """
+    static_url = "/" + (static_url or "/static/").lstrip("/")
+
+    def callback(uri, rel):
+        subpath = None
+        if uri.startswith(static_url):
+            subpath = uri[len(static_url):]
+        elif not os.path.isabs(uri) and "://" not in uri:
+            subpath = uri
+
+        if subpath:
+            for base in static_dirs:
+                candidate = os.path.join(base, subpath)
+                if os.path.isfile(candidate):
+                    return os.path.abspath(candidate)
+
+        if os.path.isabs(uri) and os.path.isfile(uri):
+            return os.path.abspath(uri)
+
+        # fallback: biarin pisa coba handle
+        return uri
+
+    return callback
+
+
+def render_xhtml2pdf(html: str, options: dict) -> bytes:
+    from xhtml2pdf import pisa
+
+    links = options.get("static_links")
+    buf = io.BytesIO()
+    pdf = pisa.CreatePDF(
+        io.BytesIO(html.encode("utf-8")),
+        dest=buf,
+        encoding="utf-8",
+        link_callback=static_link_callback(links["url"], links["dirs"]) if links else None,
+    )
+    if pdf.err:
+        raise RuntimeError("Gagal membuat PDF.")
+    return buf.getvalue()
+
+
+ENGINES = {
+    "weasyprint": render_weasyprint,
+    "wkhtmltopdf": render_wkhtmltopdf,
+    "xhtml2pdf": render_xhtml2pdf,
+}
+
+
+def render_to_file(engine: str, html: str, options: dict, path: str) -> str:
+    """
+    Render lalu tulis atomic (tmp + rename) -> reader tidak pernah lihat file setengah jadi.
+    """
+    pdf = ENGINES[engine](html, options)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(pdf)
+    os.replace(tmp, path)
+    return path
@@ -0,0 +1,224 @@
+# core/utils/streaming_export.py
+"""
+Export tabel (CSV / XLSX) yang di-stream baris per baris -> memory konstan.
+- rows = iterable (biasanya queryset.iterator(chunk_size=...)), tidak pernah di-list
+- trailer = baris total di akhir (opsional)
+- XLSX ditulis langsung sebagai zip streaming (tanpa openpyxl), sheet pakai inline string
+"""
+import csv
+import datetime
+import re
+import zipfile
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+from django.http import Http404, StreamingHttpResponse
+
+
+CSV_DELIMITER = ";"       # sama dengan export CSV lain (COA, cost type)
+FLUSH_EVERY_ROWS = 500    # XLSX: kirim potongan zip tiap N baris
+
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+# ======================================================================
+# CSV
+# ======================================================================
+
+class _Echo:
+    """Pseudo-buffer: csv.writer menulis -> langsung dikembalikan (tanpa buffer)."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return "" if value is None else value
+
+
+def iter_csv(header, rows, trailer=None):
+    writer = csv.writer(_Echo(), delimiter=CSV_DELIMITER, lineterminator="\n")
+    yield "\ufeff"  # UTF-8 BOM (Excel)
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([_csv_value(v) for v in row])
+    if trailer:
+        yield writer.writerow([_csv_value(v) for v in trailer])
+
+
+# ======================================================================
+# XLSX (SpreadsheetML minimal)
+# ======================================================================
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+# style index: 0 = default, 1 = tanggal, 2 = angka #,##0.00, 3 = bold (header), 4 = bold angka (trailer)
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="5">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="4" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '<xf numFmtId="4" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1" applyNumberFormat="1"/>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = "</sheetData></worksheet>"
+
+_EXCEL_EPOCH = datetime.date(1899, 12, 30)
+_ILLEGAL_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _xlsx_cell(value, bold=False) -> str:
+    if value is None or value == "":
+        return "<c/>"
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, (int, float, Decimal)):
+        style = ' s="4"' if bold else ("" if isinstance(value, int) else ' s="2"')
+        num = format(value, "f") if isinstance(value, Decimal) else value
+        return f"<c{style}><v>{num}</v></c>"
+    if isinstance(value, datetime.datetime):
+        value = value.date()
+    if isinstance(value, datetime.date):
+        return f'<c s="1"><v>{(value - _EXCEL_EPOCH).days}</v></c>'
+
+    text = escape(_ILLEGAL_XML.sub("", str(value)))
+    style = ' s="3"' if bold else ""
+    return f'<c t="inlineStr"{style}><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(values, bold=False) -> str:
+    return "<row>" + "".join(_xlsx_cell(v, bold) for v in values) + "</row>"
+
+
+class _ZipSink:
+    """
+    Target tulis zipfile tanpa seek/tell -> zipfile otomatis mode streaming.
+    take() mengambil byte yang sudah jadi untuk di-yield ke response.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_xlsx(header, rows, trailer=None, sheet_name="Report"):
+    sink = _ZipSink()
+    sheet_name = escape(sheet_name[:31])
+
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _ROOT_RELS)
+        zf.writestr("xl/workbook.xml", _WORKBOOK.format(name=sheet_name))
+        zf.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        zf.writestr("xl/styles.xml", _STYLES)
+
+        with zf.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write((_SHEET_HEAD + _xlsx_row(header, bold=True)).encode("utf-8"))
+            for i, row in enumerate(rows, start=1):
+                sheet.write(_xlsx_row(row).encode("utf-8"))
+                if i % FLUSH_EVERY_ROWS == 0:
+                    data = sink.take()
+                    if data:
+                        yield data
+            if trailer:
+                sheet.write(_xlsx_row(trailer, bold=True).encode("utf-8"))
+            sheet.write(_SHEET_TAIL.encode("utf-8"))
+
+    yield sink.take()
+
+
+# ======================================================================
+# Response
+# ======================================================================
+
+def streaming_export_response(fmt, *, filename, header, rows, trailer=None, sheet_name="Report"):
+    """
+    fmt = "csv" / "xlsx". filename tanpa ekstensi.
+    """
+    fmt = (fmt or "csv").lower()
+    if fmt not in FORMATS:
+        raise Http404("Unknown export format.")
+
+    if fmt == "xlsx":
+        content = iter_xlsx(header, rows, trailer, sheet_name=sheet_name)
+    else:
+        content = iter_csv(header, rows, trailer)
+
+    resp = StreamingHttpResponse(content, content_type=FORMATS[fmt])
+    resp["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    return resp
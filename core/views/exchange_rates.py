@@ -80,6 +80,7 @@ from django.http import JsonResponse
 from django.utils import timezone
 from django.views import View
 from core.models.currencies import Currency
+from core.services.exchange_rates import get_rate_curve
 
 class ExchangeRateLatestAPI(LoginRequiredMixin, View):
 
@@ -109,20 +110,16 @@ class ExchangeRateLatestAPI(LoginRequiredMixin, View):
         if cur.code.upper() == "IDR":
             return JsonResponse({"ok": True, "code": "IDR", "rate_to_idr": "1.000000"})
 
-        row = (
-            ExchangeRate.objects
-            .filter(currency=cur, is_active=True)
-            .order_by("-rate_date", "-id")
-            .first()
-        )
-        if not row:
+        latest = get_rate_curve().latest(cur)
+        if not latest:
             return JsonResponse({"ok": False, "error": "rate not found"}, status=404)
 
+        rate_date, rate_to_idr = latest
         return JsonResponse({
             "ok": True,
             "code": cur.code,
-            "rate_to_idr": f"{Decimal(str(row.rate_to_idr)):.6f}",
-            "rate_date": row.rate_date.isoformat(),
+            "rate_to_idr": f"{Decimal(str(rate_to_idr)):.6f}",
+            "rate_date": rate_date.isoformat(),
         })
 
 
@@ -0,0 +1,13 @@
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.views import View
+
+from core.services.pdf_render import pdf_result
+
+
+class PdfResultView(LoginRequiredMixin, View):
+    """
+    Polling hasil render PDF (dipanggil dari halaman "PDF sedang diproses").
+    """
+
+    def get(self, request, key: str, *args, **kwargs):
+        return pdf_result(request, key)
@@ -23,6 +23,12 @@ else:
     sys.exit("Database not reachable after timeout")
 PY
 
+    # Worker mode: a compose `command:` (e.g. send_outbox --loop) runs as-is, no migrate
+    if [ "$#" -gt 0 ]; then
+        echo "[entrypoint] Starting worker: $*"
+        exec "$@"
+    fi
+
     echo "[entrypoint] Running migrations & collectstatic ..."
     python manage.py migrate --noinput
     python manage.py collectstatic --noinput || true
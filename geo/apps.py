@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class GeoConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'geo'
+
+    def ready(self):
+        from . import signals  # noqa
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from geo.services.hierarchy import invalidate_hierarchy, rebuild_hierarchy
+
+
+class Command(BaseCommand):
+    help = "Recompute Location lft/rght (nested set) and path (ancestor ids) from parent_id"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        changed = rebuild_hierarchy(chunk_size=options["chunk_size"])
+        invalidate_hierarchy()
+        self.stdout.write(self.style.SUCCESS(f"Location hierarchy rebuilt. changed={changed}"))
@@ -1,9 +1,12 @@
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
+from django.db import connection, transaction
 import csv
 import os
+import time
 
 from geo.models import Location
+from geo.services.hierarchy import child_path, invalidate_hierarchy, rebuild_hierarchy
+from geo.services.location_index import invalidate_location_index
 
 
 class Command(BaseCommand):
@@ -17,6 +20,12 @@ class Command(BaseCommand):
         parser.add_argument("--regencies", required=True, help="Path ke regencies.csv")
         parser.add_argument("--districts", required=True, help="Path ke districts.csv")
         parser.add_argument("--villages", required=True, help="Path ke villages.csv")
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Mode streaming: baca CSV per chunk, upsert pakai bulk_create, lalu rebuild lft/rght/path",
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Jumlah baris per bulk upsert (mode --bulk)")
 
     def handle(self, *args, **options):
         provinces_path = options["provinces"]
@@ -30,12 +39,29 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.WARNING("Mulai import wilayah Indonesia (Kemendagri CSV)…"))
 
+        if options["bulk"]:
+            paths = {
+                "province": provinces_path,
+                "regency": regencies_path,
+                "district": districts_path,
+                "village": villages_path,
+            }
+            with transaction.atomic():
+                self._bulk_import(paths, max(options["chunk_size"], 1))
+            # bulk_create tidak kirim signal -> invalidate cache hirarki & index autocomplete manual
+            invalidate_hierarchy()
+            invalidate_location_index()
+            self.stdout.write(self.style.SUCCESS("Import wilayah Indonesia selesai tanpa error."))
+            return
+
         with transaction.atomic():
             self._ensure_country()
             code_map = self._import_provinces(provinces_path)
             self._import_regencies(regencies_path, code_map)
             self._import_districts(districts_path, code_map)
             self._import_villages(villages_path, code_map)
+            # save per baris hanya menjaga path; lft/rght node baru NULL -> hitung sekali di akhir
+            rebuild_hierarchy()
 
         self.stdout.write(self.style.SUCCESS("Import wilayah Indonesia selesai tanpa error."))
 
@@ -280,3 +306,135 @@ class Command(BaseCommand):
 
         f.close()
         self.stdout.write(self.style.SUCCESS(f"Dibuat {created_count} villages."))
+
+    # ---------- Mode bulk (streaming) ----------
+    #
+    # pass top-down per level, per chunk:
+    #    - parent di-resolve dari map kode -> (id, name) di memory (tanpa query)
+    #    - path (id ancestor) = path parent + id parent -> juga tanpa query
+    #    - 1x bulk_create(update_conflicts=True) per chunk
+    #    - id hasil upsert diambil 1 query per chunk (MySQL tidak return PK dari bulk_create),
+    #      hanya untuk level yang punya anak
+    # di akhir 1x rebuild_hierarchy(): lft/rght (nested set) + path dihitung ulang dalam 1 pass,
+    # termasuk baris lama / port / bandara di bawah root yang sama ✅
+
+    # (level, kolom parent, label)
+    BULK_LEVELS = [
+        ("province", None, "provinces"),
+        ("regency", "province_id", "regencies"),
+        ("district", "regency_id", "districts"),
+        ("village", "district_id", "villages"),
+    ]
+
+    UPSERT_FIELDS = [
+        "name", "kind", "parent", "path",
+        "country_code", "status", "source", "display_name", "updated_at",
+    ]
+
+    def _iter_rows(self, path, parent_col):
+        """
+        Stream (code, parent_code, name) dari CSV, baris tidak lengkap dilewati.
+        parent_col None -> parent_code = "ID" (root).
+        """
+        f, reader, headers = self._open_reader(path)
+        required = {"code", "name"} | ({parent_col} if parent_col else set())
+        if not required.issubset(headers.keys()):
+            f.close()
+            raise CommandError(
+                f"Header {os.path.basename(path)} minimal harus punya: {required}. "
+                f"Header sekarang: {reader.fieldnames}"
+            )
+        try:
+            for row in reader:
+                code = (row[headers["code"]] or "").strip()
+                name = (row[headers["name"]] or "").strip()
+                parent_code = (row[headers[parent_col]] or "").strip() if parent_col else "ID"
+                if code and name and parent_code:
+                    yield code, parent_code, name
+        finally:
+            f.close()
+
+    def _display_name(self, level, name, parent_name):
+        if level == "province":
+            return f"{name.title()} (Provinsi)"
+        if level == "district":
+            return f"Kec. {name.title()}, {parent_name.title()}"
+        return f"{name.title()}, {parent_name.title()}"
+
+    def _bulk_upsert(self, objs, keep_ids, nodes):
+        kwargs = {"update_conflicts": True, "update_fields": self.UPSERT_FIELDS}
+        # MySQL: ON DUPLICATE KEY UPDATE tanpa target; sqlite/postgres wajib unique_fields
+        if connection.features.supports_update_conflicts_with_target:
+            kwargs["unique_fields"] = ["code"]
+        Location.objects.bulk_create(objs, batch_size=len(objs), **kwargs)
+
+        if keep_ids:
+            ids = dict(Location.objects.filter(code__in=[o.code for o in objs]).values_list("code", "id"))
+            for o in objs:
+                nodes[o.code] = (ids[o.code], o.name, o.path)
+
+    def _bulk_import(self, paths, chunk_size):
+        started = time.perf_counter()
+
+        self._ensure_country()
+
+        country = Location.objects.get(code="ID")
+        Location.objects.filter(pk=country.pk).update(path=child_path(None, None))
+
+        nodes = {"ID": (country.pk, country.name, child_path(None, None))}  # code -> (id, name, path), level yang punya anak
+        total = 0
+
+        for level, parent_col, label in self.BULK_LEVELS:
+            t0 = time.perf_counter()
+            keep_ids = level != "village"
+            count = 0
+            chunk = []
+
+            for code, parent_code, name in self._iter_rows(paths[level], parent_col):
+                parent = nodes.get(parent_code)
+                if not parent:
+                    raise CommandError(
+                        f"Parent dengan code={parent_code} belum diimport ({level} {code} - {name})"
+                    )
+                parent_id, parent_name, parent_path = parent
+
+                kind = level
+                if level == "regency" and name.upper().startswith("KOTA "):
+                    kind = "city"
+
+                chunk.append(Location(
+                    code=code,
+                    name=name,
+                    kind=kind,
+                    parent_id=parent_id,
+                    path=child_path(parent_path, parent_id),
+                    country_code="ID",
+                    status="active",
+                    source="Kemendagri",
+                    display_name=self._display_name(level, name, parent_name),
+                ))
+                if len(chunk) >= chunk_size:
+                    self._bulk_upsert(chunk, keep_ids, nodes)
+                    count += len(chunk)
+                    chunk = []
+
+            if chunk:
+                self._bulk_upsert(chunk, keep_ids, nodes)
+                count += len(chunk)
+
+            elapsed = time.perf_counter() - t0
+            total += count
+            self.stdout.write(self.style.SUCCESS(
+                f"Upsert {count} {label} dalam {elapsed:.1f}s ({count / elapsed if elapsed else 0:,.0f} rows/s)"
+            ))
+
+        t0 = time.perf_counter()
+        changed = rebuild_hierarchy(chunk_size=chunk_size)
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuild lft/rght/path: {changed} baris dalam {time.perf_counter() - t0:.1f}s"
+        ))
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Total {total} baris dalam {elapsed:.1f}s ({total / elapsed if elapsed else 0:,.0f} rows/s)"
+        ))
@@ -35,6 +35,8 @@ class Location(models.Model):
                                db_column="parent_id", related_name="children")
     lft = models.IntegerField(null=True, blank=True)
     rght = models.IntegerField(null=True, blank=True)
+    # id ancestor dari root, tanpa diri sendiri: "/1/5/203/" (root = "/"), dikelola geo.services.hierarchy
+    path = models.CharField(max_length=255, null=True, blank=True)
     iata_code = models.CharField(max_length=10, null=True, blank=True)
     unlocode  = models.CharField(max_length=10, null=True, blank=True)
     latitude  = models.DecimalField(max_digits=10, decimal_places=7, null=True, blank=True)
@@ -78,6 +80,7 @@ class Location(models.Model):
             models.Index(fields=["unlocode"], name="loc_unlocode_idx"),
             models.Index(fields=["parent", "kind"], name="loc_parent_kind_idx"),
             models.Index(fields=["kind", "name"], name="loc_kind_name_idx"),
+            models.Index(fields=["path"], name="loc_path_idx"),
         ]
         constraints = [
             models.CheckConstraint(
@@ -126,20 +129,29 @@ class Location(models.Model):
     @property
     def full_path(self):
         """Kembalikan path hierarkis, mis: Indonesia > Kalimantan Timur > Berau > Muara Berau"""
-        parts = [self.name]
-        p = self.parent
-        while p:
-            parts.append(p.name)
-            p = p.parent
-        return " > ".join(reversed(parts))
+        return " > ".join([a.name for a in self.ancestors()] + [self.name])
+
+    @property
+    def ancestor_ids(self) -> list[int]:
+        return [int(x) for x in (self.path or "").split("/") if x]
 
     def ancestors(self):
-        """Daftar parent dari atas ke bawah."""
+        """Daftar parent dari atas ke bawah (1 query via path kalau sudah terisi)."""
+        if self.path is not None and self.parent_id:
+            ids = self.ancestor_ids
+            found = Location.objects.in_bulk(ids)
+            if len(found) == len(ids):
+                return [found[i] for i in ids]
+
         out, p = [], self.parent
         while p:
             out.append(p)
             p = p.parent
         return list(reversed(out))
+
+    def descendants(self):
+        """Semua turunan (via path)."""
+        return Location.objects.filter(path__startswith=f"{self.path or '/'}{self.pk}/")
     
     def root(self):
         """Ambil parent tertinggi."""
@@ -0,0 +1,269 @@
+# geo/services/hierarchy.py
+"""
+Hirarki Location:
+- path (id ancestor "/1/5/203/") dijaga di sini per save
+  * insert -> path = path parent + id parent (1 UPDATE baris itu saja)
+  * pindah parent / hapus node yang punya anak -> path subtree diganti prefix-nya (1 UPDATE)
+- lft/rght (nested set) dihitung ulang penuh oleh rebuild_hierarchy()
+  (seed --bulk, `manage.py rebuild_location_hierarchy`), tidak per save:
+  geser interval per insert = UPDATE setengah tabel
+  * node baru / subtree yang pindah / dihapus + ancestor-nya (id dari path) -> lft/rght NULL
+    sampai rebuild berikutnya; lft/rght yang tidak NULL selalu masih benar
+- dropdown bertingkat (provinsi -> kab/kota -> kecamatan -> desa) dilayani dari cache
+  ber-versi + ETag/Cache-Control, versi (core.CacheVersion) di-bump saat Location berubah
+"""
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Q, Value
+from django.db.models.functions import Concat, Substr
+from django.http import HttpResponseNotModified, JsonResponse
+from django.utils.http import quote_etag
+
+from core.services.cache_versions import bump_version, get_version
+from geo.models import Location
+
+
+VERSION_KEY = "geo:hierarchy:version"
+OPTIONS_KEY = "geo:options:v{version}:{scope}"
+CACHE_TTL_SECONDS = 60 * 60 * 24
+HTTP_MAX_AGE = 60
+
+ROOT_PATH = "/"
+
+PROVINCES = "provinces"  # scope khusus: semua provinsi
+
+
+# ======================================================================
+# Versi cache
+# ======================================================================
+
+def current_version() -> str:
+    # versi di DB: LocMem per worker -> bump di satu worker harus terlihat di worker lain ✅
+    return get_version(VERSION_KEY)
+
+
+def invalidate_hierarchy() -> None:
+    bump_version(VERSION_KEY)
+
+
+# ======================================================================
+# Path
+# ======================================================================
+
+def child_path(parent_path: str | None, parent_id: int | None) -> str:
+    if not parent_id:
+        return ROOT_PATH
+    return f"{parent_path or ROOT_PATH}{parent_id}/"
+
+
+def rebuild_hierarchy(chunk_size: int = 1000) -> int:
+    """
+    Hitung ulang lft/rght/path seluruh tabel dari parent_id (preorder, sibling urut code).
+    Hanya baris yang berubah yang di-update. Return jumlah baris ter-update.
+    """
+    rows = list(Location.objects.order_by("code").values_list("id", "parent_id", "lft", "rght", "path"))
+    known = {r[0] for r in rows}
+
+    children = {}
+    roots = []
+    for r in rows:
+        if r[1] and r[1] in known:
+            children.setdefault(r[1], []).append(r[0])
+        else:
+            roots.append(r[0])
+
+    computed = {}
+    counter = 1
+    # iteratif (tanpa recursion): (id, path, selesai?)
+    stack = [(rid, ROOT_PATH, False) for rid in reversed(roots)]
+    while stack:
+        node_id, path, done = stack.pop()
+        if done:
+            lft, _rght, p = computed[node_id]
+            computed[node_id] = (lft, counter, p)
+            counter += 1
+            continue
+
+        computed[node_id] = (counter, None, path)
+        counter += 1
+        stack.append((node_id, path, True))
+        sub = f"{path}{node_id}/"
+        for cid in reversed(children.get(node_id, [])):
+            stack.append((cid, sub, False))
+
+    changed = [
+        Location(id=r[0], lft=computed[r[0]][0], rght=computed[r[0]][1], path=computed[r[0]][2])
+        for r in rows
+        if (r[2], r[3], r[4]) != computed[r[0]]
+    ]
+    if changed:
+        Location.objects.bulk_update(changed, ["lft", "rght", "path"], batch_size=chunk_size)
+    return len(changed)
+
+
+def _replace_prefix(old_prefix: str, new_prefix: str) -> int:
+    """
+    Ganti prefix path semua turunan: "{old_prefix}..." -> "{new_prefix}..." (1 UPDATE).
+    Subtree pindah posisi -> lft/rght lama tidak berlaku lagi -> NULL sampai rebuild.
+    """
+    if old_prefix == new_prefix:
+        return 0
+    return Location.objects.filter(path__startswith=old_prefix).update(
+        path=Concat(Value(new_prefix), Substr("path", len(old_prefix) + 1)),
+        lft=None,
+        rght=None,
+    )
+
+
+def _clear_intervals(*paths: str | None) -> None:
+    """
+    lft/rght ancestor (id diambil dari path) -> NULL: jumlah turunannya berubah.
+    """
+    ids = {int(i) for p in paths if p for i in p.strip("/").split("/") if i}
+    if ids:
+        Location.objects.filter(pk__in=ids).update(lft=None, rght=None)
+
+
+def place_location(loc: Location, created: bool, old_parent_id=None, old_path=None) -> None:
+    """
+    Dipanggil setelah Location disimpan (signal post_save).
+    old_parent_id / old_path = nilai di DB sebelum save (signal pre_save).
+    """
+    if not created and old_parent_id == loc.parent_id:
+        if loc.path != old_path:
+            # instance lama (ancestor sudah pindah) ikut menulis path basi -> kembalikan
+            Location.objects.filter(pk=loc.pk).update(path=old_path)
+            loc.path = old_path
+        return
+
+    parent_path = None
+    if loc.parent_id:
+        parent_path = Location.objects.filter(pk=loc.parent_id).values_list("path", flat=True).first()
+
+    path = child_path(parent_path, loc.parent_id)
+    # node baru / pindah parent -> belum punya interval nested set yang benar
+    Location.objects.filter(pk=loc.pk).update(path=path, lft=None, rght=None)
+    loc.path = path
+    loc.lft = loc.rght = None
+    _clear_intervals(path, None if created else old_path)
+
+    if not created and old_path is not None:
+        # pindah parent -> path subtree ikut
+        _replace_prefix(f"{old_path}{loc.pk}/", f"{path}{loc.pk}/")
+
+
+def detach_location(loc: Location, old_path=None) -> None:
+    """
+    Setelah delete: anak sudah jadi root (SET_NULL) -> prefix path subtree dipotong jadi "/".
+    old_path = path di DB sebelum delete (signal pre_delete). Leaf (kasus umum) -> UPDATE tanpa baris.
+    """
+    _replace_prefix(f"{old_path or ROOT_PATH}{loc.pk}/", ROOT_PATH)
+    _clear_intervals(old_path)
+
+
+# ======================================================================
+# Opsi dropdown ter-cache
+# ======================================================================
+
+def _options_key(version: int, scope) -> str:
+    return OPTIONS_KEY.format(version=version, scope=scope)
+
+
+def _group(rows, parent_ids) -> dict:
+    out = {pid: [] for pid in parent_ids}
+    for r in rows:
+        pid = r.pop("parent_id")
+        if pid in out:
+            out[pid].append(r)
+    return out
+
+
+def options_for(*parent_ids, include_provinces: bool = False) -> dict:
+    """
+    Anak langsung per parent (+ daftar provinsi) dari cache; yang miss diambil dengan 1 query.
+    Return {parent_id: [ {id, name, kind, status} ], "provinces": [...]}.
+    """
+    parent_ids = {int(p) for p in parent_ids if p}
+    scopes = list(parent_ids) + ([PROVINCES] if include_provinces else [])
+    if not scopes:
+        return {}
+
+    version = current_version()
+    keys = {_options_key(version, s): s for s in scopes}
+    hit = cache.get_many(list(keys))
+    result = {keys[k]: v for k, v in hit.items()}
+
+    missing = [s for s in scopes if s not in result]
+    if missing:
+        missing_parents = {s for s in missing if s != PROVINCES}
+        cond = Q(parent_id__in=missing_parents)
+        if PROVINCES in missing:
+            cond |= Q(kind="province")
+
+        rows = list(
+            Location.objects.filter(cond)
+            .order_by("name")
+            .values("id", "name", "kind", "status", "parent_id")
+        )
+
+        fresh = _group(
+            [dict(r) for r in rows if r["parent_id"] in missing_parents],
+            missing_parents,
+        )
+        if PROVINCES in missing:
+            fresh[PROVINCES] = [
+                {k: r[k] for k in ("id", "name", "kind", "status")}
+                for r in rows if r["kind"] == "province"
+            ]
+
+        cache.set_many({_options_key(version, s): v for s, v in fresh.items()}, CACHE_TTL_SECONDS)
+        result.update(fresh)
+
+    return result
+
+
+def children_of(parent_id, kinds=None, active_only=False) -> list[dict]:
+    try:
+        pid = int(parent_id)
+    except (TypeError, ValueError):
+        return []
+    rows = options_for(pid).get(pid, [])
+    return _filter(rows, kinds, active_only)
+
+
+def provinces(active_only=False) -> list[dict]:
+    return _filter(options_for(include_provinces=True).get(PROVINCES, []), None, active_only)
+
+
+def _filter(rows, kinds, active_only) -> list[dict]:
+    if kinds:
+        rows = [r for r in rows if r["kind"] in kinds]
+    if active_only:
+        rows = [r for r in rows if r["status"] == "active"]
+    return rows
+
+
+# ======================================================================
+# HTTP caching
+# ======================================================================
+
+def _etag(request) -> str:
+    raw = f"{current_version()}:{request.get_full_path()}"
+    return quote_etag(hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20])
+
+
+def cached_json_response(request, build, safe=False):
+    """
+    ETag = versi hirarki + URL -> browser dapat 304 tanpa sentuh cache/DB.
+    """
+    etag = _etag(request)
+    inm = request.headers.get("If-None-Match")
+    if inm and etag in {t.strip() for t in inm.split(",")}:
+        resp = HttpResponseNotModified()
+    else:
+        resp = JsonResponse(build(), safe=safe)
+
+    resp["ETag"] = etag
+    resp["Cache-Control"] = f"private, max-age={HTTP_MAX_AGE}"
+    return resp
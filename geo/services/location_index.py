@@ -0,0 +1,369 @@
+# geo/services/location_index.py
+"""
+Index autocomplete Location di memory (per proses), dibangun ulang saat Location berubah.
+
+- semua Location masuk index (termasuk non-active, sama seperti query lama); filter status per view
+  lewat search(active_only=True)
+- token = kata di name + code/iata/unlocode (lowercase, tanpa aksen); display_name & kind juga
+  di-token (dulu ikut di-icontains select2/autocomplete) tapi match-nya di tier kedua
+  -> match di name/code tetap di atas, sama seperti ranking query lama
+- pencarian prefix per kata via bisect di list token yang sudah urut
+- ranking global dihitung sekali saat build: kind -> popularity -> name
+  (popularity = jumlah pemakaian sebagai origin/destination di shipment, leg, sales line, ...)
+- prefix 1-2 huruf punya daftar top-N yang sudah dihitung -> tidak scan ribuan token
+- district/region/province sudah didenormalisasi per entry (tanpa walk parent per hasil)
+"""
+import heapq
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from dataclasses import dataclass
+
+from django.apps import apps
+from django.db import connection
+from django.db.models import Count
+
+from core.services.cache_versions import bump_version, get_version
+from geo.models import Location
+
+
+VERSION_KEY = "geo:location_index:version"
+
+# kecil = lebih atas
+KIND_RANK = {
+    "airport": 0,
+    "port": 0,
+    "offshore-terminal": 0,
+    "city": 1,
+    "regency": 1,
+    "city-admin": 1,
+    "province": 2,
+    "country": 2,
+    "jetty": 3,
+    "anchorage": 3,
+    "district": 4,
+    "locality": 4,
+    "village": 5,
+}
+DEFAULT_KIND_RANK = 4
+
+# (model, field FK ke Location) yang dihitung sebagai popularity
+POPULARITY_SOURCES = [
+    ("shipments.Shipment", ("origin", "destination")),
+    ("shipments.ShipmentLeg", ("from_location", "to_location")),
+    ("sales.SalesQuotationLine", ("origin", "destination")),
+    ("sales.SalesOrderLine", ("origin", "destination")),
+    ("sales.FreightQuotation", ("origin", "destination")),
+    ("sales.FreightOrder", ("origin", "destination")),
+]
+
+SHORT_PREFIX_LEN = 2   # prefix <= 2 huruf pakai daftar top-N
+SHORT_PREFIX_TOP = 200
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    if not text or text.isascii():
+        return (text or "").lower()
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in text if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(normalize(text))
+
+
+@dataclass(slots=True)
+class LocationEntry:
+    id: int
+    name: str
+    display_name: str
+    kind: str
+    status: str
+    code: str           # iata / unlocode / code (yang ditampilkan)
+    district: str | None
+    region: str | None
+    province: str | None
+    codes: tuple = ()   # code, iata_code, unlocode (ter-normalisasi)
+    popularity: int = 0
+
+    @property
+    def label(self) -> str:
+        return f"{self.name}{f' [{self.kind}]' if self.kind else ''}"
+
+
+_ADMIN_SLOT = {"district": 0, "city": 1, "regency": 1, "province": 2}
+
+
+def _parent_chains(rows, by_id) -> dict:
+    """
+    id -> (district, region, province) dari node itu ke atas (via parent).
+    Memo per id -> tiap node dihitung sekali (ribuan village berbagi 1 district).
+    """
+    memo = {}
+    for row in rows:
+        # naik sampai ketemu node yang sudah di-memo (atau root)
+        path, cur, seen = [], row, set()
+        while cur and cur["id"] not in memo and cur["id"] not in seen:
+            seen.add(cur["id"])
+            path.append(cur)
+            cur = by_id.get(cur["parent_id"])
+        above = memo.get(cur["id"], (None, None, None)) if cur else (None, None, None)
+
+        # turun lagi: chain anak = chain parent, slot kind sendiri menang
+        for node in reversed(path):
+            chain = list(above)
+            slot = _ADMIN_SLOT.get((node["kind"] or "").lower())
+            if slot is not None:
+                chain[slot] = node["name"]
+            above = memo[node["id"]] = tuple(chain)
+    return memo
+
+
+def _admin_chain(row, chains) -> tuple:
+    """
+    Chain district/region/province dari parent, fallback parse display_name
+    ("Kramat Jati, Jakarta Timur, DKI Jakarta").
+    """
+    district, region, province = chains.get(row["id"], (None, None, None))
+
+    if row["display_name"]:
+        parts = [p.strip() for p in row["display_name"].split(",") if p.strip()]
+        if parts:
+            district = district or parts[0]
+        if len(parts) >= 2:
+            region = region or parts[1]
+        if len(parts) >= 3:
+            province = province or parts[2]
+
+    return district or row["name"], region, province
+
+
+def _codes(row) -> tuple:
+    codes = ("".join(tokenize(row[f] or "")) for f in ("code", "iata_code", "unlocode"))
+    return tuple({c for c in codes if c})
+
+
+def _popularity() -> dict:
+    """
+    Jumlah pemakaian Location sebagai origin/destination -> {location_id: n}.
+    1 query GROUP BY per field, hanya saat rebuild index.
+    """
+    counts = {}
+    for model_label, fields in POPULARITY_SOURCES:
+        try:
+            model = apps.get_model(model_label)
+        except LookupError:
+            continue
+        for name in fields:
+            rows = (
+                model._base_manager
+                .exclude(**{f"{name}__isnull": True})
+                .values(name)
+                .annotate(n=Count("pk"))
+                .values_list(name, "n")
+            )
+            for loc_id, n in rows:
+                counts[loc_id] = counts.get(loc_id, 0) + n
+    return counts
+
+
+class _TokenTable:
+    """
+    (token, posisi entry) urut -> prefix search via bisect,
+    prefix 1-2 huruf pakai daftar top-N yang sudah dihitung.
+    """
+
+    def __init__(self, pairs: list[tuple[str, int]]):
+        pairs.sort()
+        self.tokens = [t for t, _ in pairs]
+        self.positions = [p for _, p in pairs]
+
+        # (top-N posisi, lengkap?) per prefix pendek -> lengkap = semua entry dengan prefix ini ada di list
+        self.short_top = {}
+        prefixes = {t[:n] for t in set(self.tokens) for n in range(1, min(SHORT_PREFIX_LEN, len(t)) + 1)}
+        for prefix in prefixes:
+            lo, hi = self._range(prefix)
+            uniq = set(self.positions[lo:hi])
+            self.short_top[prefix] = (heapq.nsmallest(SHORT_PREFIX_TOP, uniq), len(uniq) <= SHORT_PREFIX_TOP)
+
+    def _range(self, prefix: str) -> tuple[int, int]:
+        lo = bisect_left(self.tokens, prefix)
+        hi = bisect_left(self.tokens, prefix + "\uffff", lo)
+        return lo, hi
+
+    def count(self, prefix: str) -> int:
+        lo, hi = self._range(prefix)
+        return hi - lo
+
+    def candidates(self, prefix: str, want: int, ok) -> list[int]:
+        """
+        Maks `want` posisi (urut ranking) yang token-nya diawali prefix dan lolos ok().
+        Kurang dari want -> memang itu semua yang match.
+        """
+        if len(prefix) <= SHORT_PREFIX_LEN and prefix in self.short_top:
+            top, complete = self.short_top[prefix]
+            short = [p for p in top if ok(p)]
+            if complete or len(short) >= want:
+                return short[:want]
+        lo, hi = self._range(prefix)
+        return heapq.nsmallest(want, {p for p in self.positions[lo:hi] if ok(p)})
+
+
+class LocationIndex:
+    def __init__(self, entries: list[LocationEntry]):
+        # urutan list = ranking global
+        entries.sort(key=lambda e: (KIND_RANK.get(e.kind, DEFAULT_KIND_RANK), -e.popularity, e.name.lower()))
+        self.entries = entries
+
+        exact = {}
+        for pos, e in enumerate(entries):
+            for code in e.codes:
+                exact.setdefault(code, []).append(pos)
+        self.exact = exact
+
+        # kata per entry untuk filter query multi-kata (name + code, lalu display_name + kind)
+        self.words = [self._entry_words(e) for e in entries]
+
+        # tier 1: name + code; tier 2: semua kata (entry yang match lewat display_name/kind)
+        self.tables = (
+            _TokenTable([(w, pos) for pos, (main, _extra) in enumerate(self.words) for w in main]),
+            _TokenTable([(w, pos) for pos, (main, extra) in enumerate(self.words) for w in main + extra]),
+        )
+
+    @staticmethod
+    def _entry_words(e: LocationEntry) -> tuple[tuple, tuple]:
+        main = set(tokenize(e.name)) | set(e.codes)
+        extra = (set(tokenize(e.display_name)) | set(tokenize(e.kind))) - main
+        return tuple(main), tuple(extra)
+
+    @classmethod
+    def build(cls) -> "LocationIndex":
+        rows = list(
+            Location.objects.values(
+                "id", "code", "name", "display_name", "kind", "status", "parent_id", "iata_code", "unlocode",
+            )
+        )
+        chains = _parent_chains(rows, {r["id"]: r for r in rows})
+        popularity = _popularity()
+
+        entries = []
+        for r in rows:
+            district, region, province = _admin_chain(r, chains)
+            e = LocationEntry(
+                id=r["id"],
+                name=r["name"],
+                display_name=r["display_name"] or "",
+                kind=r["kind"] or "",
+                status=r["status"] or "",
+                code=(r["iata_code"] or r["unlocode"] or r["code"] or "").strip(),
+                district=district,
+                region=region,
+                province=province,
+                codes=_codes(r),
+                popularity=popularity.get(r["id"], 0),
+            )
+            entries.append(e)
+        return cls(entries)
+
+    # ------------------------------------------------------------------
+
+    def _matches_all(self, pos: int, tokens: list[str]) -> bool:
+        main, extra = self.words[pos]
+        return all(any(w.startswith(t) for w in main) or any(w.startswith(t) for w in extra) for t in tokens)
+
+    def search(
+        self, q: str, *, limit: int = 20, offset: int = 0, kinds=None, exclude_kinds=None, active_only=False,
+    ) -> list[LocationEntry]:
+        tokens = tokenize(q)
+        if not tokens:
+            return []
+
+        want = offset + limit
+        entries = self.entries
+
+        def ok(pos, all_tokens=True):
+            e = entries[pos]
+            if kinds and e.kind not in kinds:
+                return False
+            if exclude_kinds and e.kind in exclude_kinds:
+                return False
+            if active_only and e.status != "active":
+                return False
+            return not all_tokens or len(tokens) == 1 or self._matches_all(pos, tokens)
+
+        # 1) exact code / iata / unlocode selalu di paling atas
+        found = [p for p in self.exact.get("".join(tokens), []) if ok(p, all_tokens=False)]
+        seen = set(found)
+
+        # 2) per tier (name/code dulu, baru display_name/kind): token paling selektif jadi kandidat utama
+        for table in self.tables:
+            if len(found) >= want:
+                break
+            best = min(tokens, key=table.count)
+            candidates = table.candidates(best, want - len(found), lambda p: p not in seen and ok(p))
+            found.extend(candidates)
+            seen.update(candidates)
+
+        return [entries[p] for p in found[offset:want]]
+
+
+_lock = threading.Lock()
+_local = {"version": None, "index": None, "building": None}
+
+
+def current_version() -> str:
+    # versi di DB (core.CacheVersion): LocMem per worker tidak terlihat worker lain
+    return get_version(VERSION_KEY)
+
+
+def _rebuild() -> None:
+    try:
+        # versi dibaca di thread ini SEBELUM build (token pending transaksi caller tidak
+        # terlihat di sini) -> data index minimal sebaru versinya
+        version = current_version()
+        index = LocationIndex.build()
+        with _lock:
+            _local["index"] = index
+            _local["version"] = version
+    finally:
+        with _lock:
+            _local["building"] = None
+        connection.close()
+
+
+def get_location_index() -> LocationIndex:
+    """
+    Index dibangun di memory proses (terlalu besar untuk cache backend),
+    versi di DB -> semua worker rebuild setelah Location berubah.
+    - belum ada index -> build sinkron (cold start)
+    - index lama -> tetap dipakai, rebuild jalan di background thread
+    """
+    version = current_version()
+    index = _local["index"]
+    if _local["version"] == version and index is not None:
+        return index
+
+    if index is None:
+        with _lock:
+            if _local["index"] is None:
+                _local["index"] = LocationIndex.build()
+                _local["version"] = version
+            return _local["index"]
+
+    with _lock:
+        if _local["building"] is None:
+            _local["building"] = threading.Thread(target=_rebuild, daemon=True)
+            _local["building"].start()
+    return index
+
+
+def invalidate_location_index() -> None:
+    bump_version(VERSION_KEY)
+    _local["version"] = None
+
+
+def search_locations(q: str, **kwargs) -> list[LocationEntry]:
+    return get_location_index().search(q, **kwargs)
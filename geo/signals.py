@@ -0,0 +1,48 @@
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
+from django.dispatch import receiver
+
+from geo.models import Location
+from geo.services.hierarchy import detach_location, invalidate_hierarchy, place_location
+from geo.services.location_index import invalidate_location_index
+
+
+def _db_state(instance):
+    # (parent_id, path, lft, rght) yang tersimpan di DB; instance bisa saja sudah basi
+    if not instance.pk:
+        return None, None, None, None
+    return (
+        Location.objects.filter(pk=instance.pk).values_list("parent_id", "path", "lft", "rght").first()
+        or (None, None, None, None)
+    )
+
+
+@receiver(pre_save, sender=Location)
+def _location_pre_save(sender, instance, **kwargs):
+    # simpan parent/path lama -> post_save tahu apakah node pindah
+    instance._old_parent_id, instance._old_path, lft, rght = _db_state(instance)
+    # lft/rght milik rebuild_hierarchy(): save biasa menulis ulang nilai DB, bukan nilai instance (bisa basi)
+    instance.lft, instance.rght = lft, rght
+
+
+@receiver(post_save, sender=Location)
+def _location_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        place_location(
+            instance, created,
+            getattr(instance, "_old_parent_id", None),
+            getattr(instance, "_old_path", None),
+        )
+    invalidate_hierarchy()
+    invalidate_location_index()
+
+
+@receiver(pre_delete, sender=Location)
+def _location_pre_delete(sender, instance, **kwargs):
+    _parent_id, instance._old_path, _lft, _rght = _db_state(instance)
+
+
+@receiver(post_delete, sender=Location)
+def _location_deleted(sender, instance, **kwargs):
+    detach_location(instance, getattr(instance, "_old_path", instance.path))
+    invalidate_hierarchy()
+    invalidate_location_index()
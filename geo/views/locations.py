@@ -5,6 +5,8 @@ from django.db.models import Q
 from geo.models import Location  # sesuaikan kalau model-nya beda
 from ..models import Location
 from django.core.cache import cache  # optional, tapi aman
+from geo.services import hierarchy
+from geo.services.location_index import search_locations
 
 
 # geo/views/adds.py
@@ -14,8 +16,15 @@ from django.db.models import Q
 from geo.models import Location  # sesuaikan kalau model-nya beda
 
 def children_by_parent(request, parent_id: int):
-    qs = Location.objects.filter(parent_id=parent_id, status="active").order_by("name").values("id","name","kind")
-    return JsonResponse({"results": list(qs)})
+    return hierarchy.cached_json_response(
+        request,
+        lambda: {"results": _pick(hierarchy.children_of(parent_id, active_only=True), "id", "name", "kind")},
+        safe=True,
+    )
+
+
+def _pick(rows, *fields):
+    return [{f: r[f] for f in fields} for r in rows]
 
 
 
@@ -27,20 +36,15 @@ class LocationAutocompleteView(View):
         if not q:
             return JsonResponse([], safe=False)
 
-        qs = (
-            Location.objects
-            .filter(Q(name__icontains=q) | Q(kind__icontains=q))
-            .order_by("name")[:20]
-        )
-
+        # ✅ index di memory (prefix per kata, ranking kind + popularity)
         data = [
             {
-                "id": obj.pk,
-                "name": obj.name,
-                "kind": getattr(obj, "kind", ""),
-                "label": f"{obj.name}{f' [{obj.kind}]' if getattr(obj, 'kind', '') else ''}",
+                "id": e.id,
+                "name": e.name,
+                "kind": e.kind,
+                "label": e.label,
             }
-            for obj in qs
+            for e in search_locations(q, limit=20)
         ]
         return JsonResponse(data, safe=False)
 
@@ -53,110 +57,70 @@ class LocationAjaxView(View):
     """
     limit = 10
 
-    def get_queryset(self, q: str):
-        qs = Location.objects.all()
-        if q:
-            qs = qs.filter(Q(name__icontains=q))
-        return qs.order_by("name")[: self.limit]
-
     def get(self, request, *args, **kwargs):
         q = (request.GET.get("q") or request.GET.get("term") or "").strip()
-        items = [self.normalize(loc) for loc in self.get_queryset(q)]
+        items = [self.normalize(e) for e in search_locations(q, limit=self.limit)]
         return JsonResponse(items, safe=False)  # LIST → safe=False
-    
-    
-    def normalize(self, loc):
-        kind = getattr(loc, "kind", "") or ""
-        suffix = f" [{kind}]" if kind else ""
-
-        # --- ambil chain (sesuaikan dengan model kamu) ---
-        # Opsi 1: kalau ada field eksplisit
-        district = getattr(loc, "district_name", None) or getattr(loc, "district", None)
-        region = getattr(loc, "region_name", None) or getattr(loc, "region", None)
-        province = getattr(loc, "province_name", None) or getattr(loc, "province", None)
-
-        # Opsi 2: kalau model hierarchical pakai parent
-        # contoh: district -> parent(region) -> parent(province)
-        # (jalankan hanya kalau opsi 1 kosong)
-        if not (district or region or province):
-            district = getattr(loc, "name", None)
-            p1 = getattr(loc, "parent", None)
-            p2 = getattr(p1, "parent", None) if p1 else None
-            region = getattr(p1, "name", None) if p1 else None
-            province = getattr(p2, "name", None) if p2 else None
 
+    def normalize(self, entry):
         return {
-            "id": loc.id,
-            "label": f"{loc.name}{suffix}",
-            "value": loc.name,
-            "name": loc.name,
-            "kind": kind,
-
-            # ✅ tambahan untuk dipakai UI pickup
-            "district": district,
-            "region": region,
-            "province": province,
+            "id": entry.id,
+            "label": entry.label,
+            "value": entry.name,
+            "name": entry.name,
+            "kind": entry.kind,
+
+            # ✅ tambahan untuk dipakai UI pickup (sudah didenormalisasi di index)
+            "district": entry.district,
+            "region": entry.region,
+            "province": entry.province,
         }
 
 
 class ProvincesView(View):
     def get(self, request):
-        qs = Location.objects.filter(kind="province").order_by("name")
-        data = [{"id": obj.id, "name": obj.name} for obj in qs]
-        return JsonResponse(data, safe=False)
+        return hierarchy.cached_json_response(
+            request, lambda: _pick(hierarchy.provinces(), "id", "name"),
+        )
 
 
 class RegenciesView(View):
     def get(self, request):
         pid = request.GET.get("province_id")
-        qs = Location.objects.filter(parent_id=pid, kind__in=["regency", "city"]).order_by("name")
-        return JsonResponse([{"id": x.id, "name": x.name} for x in qs], safe=False)
+        return hierarchy.cached_json_response(
+            request, lambda: _pick(hierarchy.children_of(pid, kinds={"regency", "city"}), "id", "name"),
+        )
 
 
 class DistrictsView(View):
     def get(self, request):
         rid = request.GET.get("regency_id")
-        qs = Location.objects.filter(parent_id=rid, kind="district").order_by("name")
-        return JsonResponse([{"id": x.id, "name": x.name} for x in qs], safe=False)
+        return hierarchy.cached_json_response(
+            request, lambda: _pick(hierarchy.children_of(rid, kinds={"district"}), "id", "name"),
+        )
 
 
 class VillagesView(View):
     def get(self, request):
         did = request.GET.get("district_id")
-        qs = Location.objects.filter(parent_id=did, kind="village").order_by("name")
-        return JsonResponse([{"id": x.id, "name": x.name} for x in qs], safe=False)
-
+        return hierarchy.cached_json_response(
+            request, lambda: _pick(hierarchy.children_of(did, kinds={"village"}), "id", "name"),
+        )
 
 
 class LocationChildrenView(View):
     def get(self, request):
+        # parent kosong / bukan angka -> children_of balikin [] (kab/kota, kec, desa)
         parent_id = request.GET.get("parent")
-        if not parent_id:
-            # Kalau nggak ada parent, balikin array kosong
-            return JsonResponse([], safe=False)
-
-        try:
-            parent_id_int = int(parent_id)
-        except (TypeError, ValueError):
-            return JsonResponse([], safe=False)
-
-        # Anak langsung dari parent tersebut (bisa kab/kota, kec, desa)
-        qs = (
-            Location.objects
-            .filter(parent_id=parent_id_int)
-            .order_by("name")
-            .values("id", "name")  # supaya ringan, cuma ambil id & name
+        return hierarchy.cached_json_response(
+            request, lambda: _pick(hierarchy.children_of(parent_id), "id", "name"),
         )
 
-        data = list(qs)
-        return JsonResponse(data, safe=False)
-
 
 
 import re
 from django.http import JsonResponse
 from django.views import View
-from django.db.models import Q, Case, When, IntegerField
 
 from geo.models import Location
 
@@ -183,8 +147,6 @@ class LocationSelect2View(View):
         page = int(request.GET.get("page") or 1)
         q_l = q.lower()
 
-        qs = Location.objects.all().exclude(kind__in=self.EXCLUDED_KINDS)
-
         if not q:
             return JsonResponse({"results": [], "pagination": {"more": False}})
 
@@ -208,94 +170,30 @@ class LocationSelect2View(View):
         tokens = [t for t in tokens if t not in self.STOPWORDS]
         q_clean = " ".join(tokens).strip() or q  # fallback kalau habis semua
 
-        # --- 3) search utama pakai q_clean ---
-        qs = qs.filter(
-            Q(name__icontains=q_clean) |
-            Q(display_name__icontains=q_clean) |
-            Q(code__icontains=q_clean) |
-            Q(iata_code__icontains=q_clean) |
-            Q(unlocode__icontains=q_clean) |
-            Q(kind__icontains=q_clean)
-        )
-
-        # apply filter tipe kalau ada
-        if kind_filter:
-            qs = qs.filter(kind__in=kind_filter)
-
-        # --- 4) ranking: yang name diawali q_clean naik ke atas ---
-        qs = qs.annotate(
-            rank=Case(
-                When(code__iexact=q_clean, then=50),
-                When(iata_code__iexact=q_clean, then=45),
-                When(unlocode__iexact=q_clean, then=40),
-                When(name__iexact=q_clean, then=35),
-                When(display_name__iexact=q_clean, then=33),
-                When(name__istartswith=q_clean, then=30),
-                When(display_name__istartswith=q_clean, then=25),
-                When(name__icontains=q_clean, then=20),
-                When(display_name__icontains=q_clean, then=15),
-                default=0,
-                output_field=IntegerField(),
-            )
-        ).order_by("-rank", "name")
-
-        # pagination
-        total = qs.count()
+        # --- 3) search via index di memory (prefix per kata, code/iata/unlocode exact di atas) ---
         start = (page - 1) * self.PAGE_SIZE
-        end = start + self.PAGE_SIZE
-        items = qs[start:end]
-
-        results = []
-        for obj in items:
-            code = (obj.iata_code or obj.unlocode or obj.code or "").strip()
-
-            # ✅ ambil chain dari helper
-            district, region, province = self.get_admin_chain(obj)
+        entries = search_locations(
+            q_clean,
+            offset=start,
+            limit=self.PAGE_SIZE + 1,  # +1 untuk cek halaman berikutnya
+            kinds=kind_filter,
+            exclude_kinds=self.EXCLUDED_KINDS,
+        )
+        more = len(entries) > self.PAGE_SIZE
 
-            results.append({
-                "id": obj.pk,
-                "text": obj.name,
-                "subtext": obj.display_name or "",
-                "kind": (obj.kind or "").upper(),
-                "code": code,
+        results = [
+            {
+                "id": e.id,
+                "text": e.name,
+                "subtext": e.display_name,
+                "kind": e.kind.upper(),
+                "code": e.code,
 
                 # ✅ tambahan untuk pickup display
-                "district": district,
-                "region": region,
-                "province": province,
-            })
-                
-        return JsonResponse({"results": results, "pagination": {"more": end < total}})
-
-    def get_admin_chain(self, obj):
-        """
-        Try derive district/region/province from hierarchical parent
-        or fallback parse display_name.
-        """
-        district = region = province = None
-
-        # 1) coba via parent chain (kalau model punya parent)
-        cur = obj
-        while cur:
-            k = (getattr(cur, "kind", "") or "").lower()
-            if k == "district" and not district:
-                district = cur.name
-            elif k in ("city", "regency") and not region:
-                region = cur.name
-            elif k == "province" and not province:
-                province = cur.name
-            cur = getattr(cur, "parent", None)
-
-        # 2) fallback: parse display_name "Kramat Jati, Jakarta Timur, DKI Jakarta"
-        if obj.display_name:
-            parts = [p.strip() for p in obj.display_name.split(",") if p.strip()]
-            if parts:
-                district = district or parts[0]
-            if len(parts) >= 2:
-                region = region or parts[1]
-            if len(parts) >= 3:
-                province = province or parts[2]
-
-        # 3) last fallback
-        district = district or obj.name
-        return district, region, province
+                "district": e.district,
+                "region": e.region,
+                "province": e.province,
+            }
+            for e in entries[: self.PAGE_SIZE]
+        ]
+        return JsonResponse({"results": results, "pagination": {"more": more}})
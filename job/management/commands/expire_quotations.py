@@ -1,10 +1,13 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-from django.db import transaction
 
+from core.services.batch_sweep import run_sweep
 from job.models.quotations import Quotation, QuotationStatus
 
 
+SWEEP_NAME = "job.expire_quotations"
+
+
 class Command(BaseCommand):
     help = "Mark quotations as EXPIRED when valid_until has passed"
 
@@ -14,33 +17,44 @@ class Command(BaseCommand):
             action="store_true",
             help="Show how many would be updated, without updating",
         )
+        parser.add_argument("--batch-size", type=int, default=500, help="Rows per batch / transaction")
+        parser.add_argument("--pause", type=float, default=0, help="Seconds to sleep between batches")
+        parser.add_argument("--max-batches", type=int, default=None, help="Stop after N batches (resume next run)")
+        parser.add_argument("--restart", action="store_true", help="Ignore checkpoint, start from the first id")
 
-    @transaction.atomic
     def handle(self, *args, **options):
         today = timezone.localdate()
-        dry_run = options["dry_run"]
-
-        # Lock kandidat dulu (ambil id)
-        candidate_ids = list(
-            Quotation.objects.select_for_update()
-            .filter(
-                valid_until__isnull=False,
-                valid_until__lt=today,
-                status__in=[QuotationStatus.DRAFT, QuotationStatus.SENT],
-            )
-            .values_list("id", flat=True)
-        )
 
-        count = len(candidate_ids)
+        candidates = Quotation.objects.filter(
+            valid_until__isnull=False,
+            valid_until__lt=today,
+            status__in=[QuotationStatus.DRAFT, QuotationStatus.SENT],
+        )
 
-        if dry_run:
+        if options["dry_run"]:
+            count = candidates.count()
             self.stdout.write(self.style.WARNING(f"[DRY RUN] Would expire: {count} quotation(s)."))
             return
 
-        updated = Quotation.objects.filter(id__in=candidate_ids).update(
-            status=QuotationStatus.EXPIRED,
-            expired_at=timezone.now(),
-            expired_by_system=True,
+        def expire(batch):
+            return batch.update(
+                status=QuotationStatus.EXPIRED,
+                expired_at=timezone.now(),
+                expired_by_system=True,
+            )
+
+        result = run_sweep(
+            SWEEP_NAME,
+            candidates,
+            expire,
+            batch_size=options["batch_size"],
+            pause=options["pause"],
+            restart=options["restart"],
+            max_batches=options["max_batches"],
         )
 
-        self.stdout.write(self.style.SUCCESS(f"Expired quotations updated: {updated} (candidates: {count})"))
+        resumed = f", resumed after id {result.resumed_from}" if result.resumed_from else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"Expired quotations updated: {result.processed} "
+            f"(candidates: {result.candidates}, batches: {result.batches}{resumed})"
+        ))
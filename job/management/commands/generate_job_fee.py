@@ -0,0 +1,88 @@
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+
+from job.models.job_fee import JobFeePeriodStatus
+from job.services.job_fee import generate_job_fee_for_months, next_month_start
+
+
+def _parse_month(value: str) -> date:
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise CommandError(f"Format bulan harus YYYY-MM: {value}")
+
+
+class Command(BaseCommand):
+    help = "Generate / regenerate Sales Fee (JobFeePeriod) untuk satu atau beberapa bulan"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--percent", required=True, help="Persentase fee, contoh: 2.5")
+        parser.add_argument("--month", action="append", default=[], help="YYYY-MM (boleh diulang)")
+        parser.add_argument("--from", dest="month_from", help="YYYY-MM awal range")
+        parser.add_argument("--to", dest="month_to", help="YYYY-MM akhir range (inklusif)")
+        parser.add_argument("--workers", type=int, default=1, help="Jumlah bulan yang diproses paralel")
+        parser.add_argument(
+            "--keep-lines",
+            action="store_true",
+            help="Period DRAFT: pertahankan line lama, hanya tambah job yang belum punya line",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Tampilkan total per sales user, tanpa menulis",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            percent = Decimal(options["percent"])
+        except InvalidOperation:
+            raise CommandError("--percent harus angka")
+
+        months = [_parse_month(m) for m in options["month"]]
+        if options["month_from"] or options["month_to"]:
+            if not (options["month_from"] and options["month_to"]):
+                raise CommandError("--from dan --to harus diisi berdua")
+            m = _parse_month(options["month_from"])
+            end = _parse_month(options["month_to"])
+            while m <= end:
+                months.append(m)
+                m = next_month_start(m)
+
+        if not months:
+            raise CommandError("Isi --month atau --from/--to")
+
+        dry_run = options["dry_run"]
+        results = generate_job_fee_for_months(
+            months,
+            percent,
+            replace_if_draft=not options["keep_lines"],
+            workers=options["workers"],
+            dry_run=dry_run,
+        )
+
+        for month, result in results.items():
+            label = f"{month:%Y-%m}"
+            if dry_run:
+                if result["skipped"]:
+                    self.stdout.write(self.style.WARNING(
+                        f"[DRY RUN] {label}: period {result['skipped']}, dilewati"
+                    ))
+                    continue
+                self.stdout.write(self.style.WARNING(
+                    f"[DRY RUN] {label}: {result['jobs']} job, base {result['total_base']}, fee {result['total_fee']}"
+                ))
+                for u in sorted(result["per_user"].values(), key=lambda x: -x["fee"]):
+                    self.stdout.write(f"    {u['sales_user']}: {u['jobs']} job, base {u['base']}, fee {u['fee']}")
+                continue
+
+            period, n = result
+            if period is None:
+                self.stdout.write(f"{label}: tidak ada job completed")
+            elif n == 0 and period.status != JobFeePeriodStatus.DRAFT:
+                self.stdout.write(self.style.WARNING(f"{label}: period {period.status}, dilewati"))
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f"{label}: {n} line, base {period.total_base_amount}, fee {period.total_fee_amount}"
+                ))
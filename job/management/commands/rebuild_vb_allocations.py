@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from job.services.job_cost_vb import rebuild_allocations
+
+
+class Command(BaseCommand):
+    help = "Recompute VendorBookingLine.amount and JobCost vb_allocated_qty / vb_status per chunk of job orders"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=500, help="Job orders per transaction")
+
+    def handle(self, *args, **options):
+        totals = rebuild_allocations(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"VB allocations rebuilt. lines={totals['lines']} job_costs={totals['job_costs']}"
+        ))
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:54
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_invoice_summary(apps, schema_editor):
+    # salinan inline job.services.invoice_summary.summary_updates -> jaga tetap sama
+    JobOrder = apps.get_model("job", "JobOrder")
+    Invoice = apps.get_model("billing", "Invoice")
+
+    money = models.DecimalField(max_digits=18, decimal_places=2)
+    invoices = Invoice.objects.filter(job_order=OuterRef("pk")).order_by()
+
+    def total(qs, field):
+        sub = qs.values("job_order").annotate(total=Sum(field)).values("total")
+        return Coalesce(Subquery(sub, output_field=money), Value(Decimal("0.00")), output_field=money)
+
+    JobOrder.objects.filter(Exists(invoices)).update(
+        is_invoiced=True,
+        dp_invoiced=Exists(invoices.filter(invoice_type="DP")),
+        final_invoiced=Exists(invoices.filter(invoice_type="FINAL")),
+        invoiced_total=total(invoices.filter(invoice_type__in=["DP", "FINAL"]), "total_amount"),
+        invoice_paid_total=total(invoices, "amount_paid"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job', '0044_alter_joborder_job_source'),
+        ('billing', '0007_invoice_idr_rate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joborder',
+            name='dp_invoiced',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='joborder',
+            name='final_invoiced',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='joborder',
+            name='invoice_paid_total',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), editable=False, max_digits=18),
+        ),
+        migrations.AddField(
+            model_name='joborder',
+            name='invoiced_total',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), editable=False, max_digits=18),
+        ),
+        migrations.RunPython(backfill_invoice_summary, migrations.RunPython.noop),
+    ]
@@ -22,10 +22,47 @@ from django.db import transaction
 from django.utils import formats
 from django_summernote.fields import SummernoteTextField
 from django.db.models import Sum
+from django.db.models.functions import Coalesce, Greatest
 
 class JobOrderQuerySet(models.QuerySet):
     def visible(self):
         return self.exclude(status="QUOTATION")
+
+    def with_invoice_summary(self):
+        """
+        Anotasi invoicing dari kolom ringkasan (tanpa JOIN ke invoices):
+        inv_remaining, inv_outstanding, inv_can_generate_dp, inv_can_generate_final.
+        Logika sama dengan property remaining_invoiceable / can_generate_dp / can_generate_final.
+        """
+        money = models.DecimalField(max_digits=18, decimal_places=2)
+        zero = models.Value(Decimal("0.00"), output_field=money)
+        remaining = models.ExpressionWrapper(
+            Coalesce(models.F("grand_total"), zero) - models.F("invoiced_total"), output_field=money
+        )
+        outstanding = models.ExpressionWrapper(
+            models.F("invoiced_total") - models.F("invoice_paid_total"), output_field=money
+        )
+        has_dp = Q(down_payment_percent__gt=0)
+
+        return self.annotate(
+            inv_remaining=Greatest(remaining, zero),
+            inv_outstanding=Greatest(outstanding, zero),
+        ).annotate(
+            inv_can_generate_dp=models.Case(
+                models.When(Q(status="IN_COSTING") & has_dp & Q(dp_invoiced=False), then=models.Value(True)),
+                default=models.Value(False),
+                output_field=models.BooleanField(),
+            ),
+            inv_can_generate_final=models.Case(
+                models.When(
+                    Q(status="IN_PROGRESS", inv_remaining__gt=0, final_invoiced=False)
+                    & (~has_dp | Q(dp_invoiced=True)),
+                    then=models.Value(True),
+                ),
+                default=models.Value(False),
+                output_field=models.BooleanField(),
+            ),
+        )
     
 class TimeStampedModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -37,6 +74,8 @@ class TimeStampedModel(models.Model):
 
 class JobOrder(TimeStampedModel):
 
+    INVOICE_SUMMARY_FIELDS = ("is_invoiced", "invoiced_total", "invoice_paid_total", "dp_invoiced", "final_invoiced")
+
     objects = JobOrderQuerySet.as_manager()          # default
     all_objects = models.Manager()       
     
@@ -244,6 +283,13 @@ class JobOrder(TimeStampedModel):
         help_text="Sudah dibuat invoice"
     )
 
+    # ✅ ringkasan invoice (denormalisasi) -> dikelola job.services.invoice_summary
+    # via signal Invoice (billing.signals), jangan diisi manual
+    invoiced_total = models.DecimalField(max_digits=18, decimal_places=2, default=Decimal("0.00"), editable=False)
+    invoice_paid_total = models.DecimalField(max_digits=18, decimal_places=2, default=Decimal("0.00"), editable=False)
+    dp_invoiced = models.BooleanField(default=False, editable=False)
+    final_invoiced = models.BooleanField(default=False, editable=False)
+
     ST_QUOTATION = "QUOTATION"  
     ST_DRAFT = "DRAFT"
     ST_IN_COSTING = "IN_COSTING"
@@ -415,12 +461,7 @@ class JobOrder(TimeStampedModel):
 
     @property
     def total_invoiced(self):
-        total = self.invoices.filter(
-            invoice_type__in=["DP", "FINAL"]
-        ).aggregate(
-            total=Sum("total_amount")
-        )["total"]
-        return total or Decimal("0.00")
+        return self.invoiced_total or Decimal("0.00")
     
     @property
     def remaining_invoiceable(self):
@@ -434,11 +475,16 @@ class JobOrder(TimeStampedModel):
 
     @property
     def has_dp_invoice(self):
-        return self.invoices.filter(invoice_type="DP").exists()
+        return self.dp_invoiced
 
     @property
     def has_final_invoice(self):
-        return self.invoices.filter(invoice_type="FINAL").exists()
+        return self.final_invoiced
+
+    @property
+    def invoice_outstanding(self):
+        remaining = (self.invoiced_total or Decimal("0.00")) - (self.invoice_paid_total or Decimal("0.00"))
+        return remaining if remaining > 0 else Decimal("0.00")
 
     @property
     def can_generate_dp(self):
@@ -606,6 +652,10 @@ class JobOrder(TimeStampedModel):
         if not is_new:
             old = type(self).objects.get(pk=self.pk)
 
+            # ringkasan invoice selalu dari DB (instance di memory bisa sudah basi)
+            for name in self.INVOICE_SUMMARY_FIELDS:
+                setattr(self, name, getattr(old, name))
+
             # Jika status berubah
             if old.status != self.status:
 
@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from decimal import Decimal
-from django.db.models import Sum
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 
 from job.models.job_orders import JobOrder  # pastikan path ini benar di project kamu
 from accounting.models.journal import Journal, JournalLine  # pastikan path ini benar di project kamu
@@ -8,6 +10,10 @@ from accounting.models.journal import Journal, JournalLine  # pastikan path ini
 DEC0 = Decimal("0.00")
 
 
+def _money():
+    return DecimalField(max_digits=18, decimal_places=2)
+
+
 @dataclass
 class ProfitRow:
     job: JobOrder
@@ -65,32 +71,103 @@ class ProfitabilityService:
         margin = (gp / revenue * Decimal("100.0")) if revenue else None
         return {"revenue": revenue, "cogs": cogs, "gp": gp, "margin": margin}
 
-    def build(self, *, date_from=None, date_to=None, customer_id=None, status=None, job_id=None):
-        rows: list[ProfitRow] = []
-        totals = {"revenue": DEC0, "cogs": DEC0, "gp": DEC0}
-
-        jobs = self.get_jobs(
-            date_from=date_from,
-            date_to=date_to,
-            customer_id=customer_id,
-            status=status,
-            job_id=job_id,
-        )
+    # ------------------------------------------------------------------
+    # Set-based: revenue/COGS dihitung di DB (1 query untuk rows, 1 untuk totals)
+    # ------------------------------------------------------------------
 
-        for job in jobs:
-            revenue = getattr(job, self.revenue_field, None) or DEC0
-            cogs = self.get_cogs_for_job(job)
-            gp = revenue - cogs
-            margin = (gp / revenue * Decimal("100.0")) if revenue else None
+    def _revenue_expr(self):
+        try:
+            JobOrder._meta.get_field(self.revenue_field)
+        except FieldDoesNotExist:
+            # bukan kolom DB -> sama seperti getattr(...) or 0 di versi per-job
+            return Value(DEC0, output_field=_money())
+        return Coalesce(F(self.revenue_field), Value(DEC0), output_field=_money())
+
+    @staticmethod
+    def _cogs_expr():
+        """
+        SUM(debit) journal complete job (posted only), sebagai subquery per job.
+        """
+        lines = (
+            JournalLine.objects
+            .filter(journal_id=OuterRef("complete_journal_id"), journal__posted=True, debit__gt=0)
+            .order_by()
+            .values("journal_id")
+            .annotate(s=Sum("debit"))
+            .values("s")
+        )
+        return Coalesce(Subquery(lines, output_field=_money()), Value(DEC0), output_field=_money())
+
+    def annotated_jobs(self, **filters):
+        return self.get_jobs(**filters).annotate(
+            pr_revenue=self._revenue_expr(),
+            pr_cogs=self._cogs_expr(),
+        ).annotate(
+            pr_gp=F("pr_revenue") - F("pr_cogs"),
+        )
 
-            rows.append(ProfitRow(job=job, revenue=revenue, cogs=cogs, gp=gp, margin=margin))
+    @staticmethod
+    def _margin(gp, revenue):
+        return (gp / revenue * Decimal("100.0")) if revenue else None
+
+    def _row(self, job) -> ProfitRow:
+        return ProfitRow(
+            job=job,
+            revenue=job.pr_revenue,
+            cogs=job.pr_cogs,
+            gp=job.pr_gp,
+            margin=self._margin(job.pr_gp, job.pr_revenue),
+        )
 
-            totals["revenue"] += revenue
-            totals["cogs"] += cogs
-            totals["gp"] += gp
+    def iter_rows(self, *, chunk_size: int = 2000, **filters):
+        """
+        Generator ProfitRow pakai server-side cursor -> memory konstan untuk range besar.
+        """
+        for job in self.annotated_jobs(**filters).iterator(chunk_size=chunk_size):
+            yield self._row(job)
+
+    def totals(self, **filters) -> dict:
+        agg = self.annotated_jobs(**filters).order_by().aggregate(
+            revenue=Sum("pr_revenue"),
+            cogs=Sum("pr_cogs"),
+            gp=Sum("pr_gp"),
+        )
+        totals = {k: agg[k] or DEC0 for k in ("revenue", "cogs", "gp")}
+        totals["margin"] = self._margin(totals["gp"], totals["revenue"])
+        return totals
 
-        totals["margin"] = (totals["gp"] / totals["revenue"] * Decimal("100.0")) if totals["revenue"] else None
-        return rows, totals
+    def build(self, *, date_from=None, date_to=None, customer_id=None, status=None, job_id=None):
+        filters = {
+            "date_from": date_from,
+            "date_to": date_to,
+            "customer_id": customer_id,
+            "status": status,
+            "job_id": job_id,
+        }
+        rows: list[ProfitRow] = [self._row(job) for job in self.annotated_jobs(**filters)]
+        return rows, self.totals(**filters)
+
+    # ==========================
+    # EXPORT (streaming)
+    # ==========================
+    EXPORT_HEADER = ["Job #", "Date", "Customer", "Revenue", "COGS", "GP", "Margin %"]
+
+    def export_rows(self, *, chunk_size: int = 2000, **filters):
+        for r in self.iter_rows(chunk_size=chunk_size, **filters):
+            yield [
+                r.job.number,
+                r.job.job_date,
+                str(r.job.customer) if r.job.customer_id else "",
+                r.revenue,
+                r.cogs,
+                r.gp,
+                r.margin.quantize(Decimal("0.01")) if r.margin is not None else None,
+            ]
+
+    def export_trailer(self, **filters) -> list:
+        t = self.totals(**filters)
+        margin = t["margin"].quantize(Decimal("0.01")) if t["margin"] is not None else None
+        return ["TOTAL", "", "", t["revenue"], t["cogs"], t["gp"], margin]
 
     def get_cogs_lines_for_job(self, job: JobOrder):
         """
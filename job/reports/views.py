@@ -4,6 +4,20 @@ from .forms import ProfitabilityFilterForm, COGSJournalFilterForm
 from .services import ProfitabilityService, COGSJournalReportService
 from django.shortcuts import get_object_or_404, redirect, render
 from job.models.job_orders import JobOrder
+from django.views import View
+from core.utils.streaming_export import streaming_export_response
+
+
+def profitability_filters(form) -> dict:
+    cd = form.cleaned_data if form.is_bound else {}
+    return {
+        "date_from": cd.get("date_from"),
+        "date_to": cd.get("date_to"),
+        "customer_id": cd.get("customer").id if cd.get("customer") else None,
+        "status": cd.get("status") or None,
+        "job_id": cd.get("job_id") or None,
+    }
+
 
 class ProfitabilityReportView(LoginRequiredMixin, TemplateView):
     template_name = "reports/profitability.html"
@@ -14,16 +28,8 @@ class ProfitabilityReportView(LoginRequiredMixin, TemplateView):
         form = ProfitabilityFilterForm(self.request.GET or None)
         form.is_valid()
 
-        cd = form.cleaned_data if form.is_bound else {}
-
         svc = ProfitabilityService(revenue_field="amount")  # kalau field kamu total_amount, ganti di sini
-        rows, totals = svc.build(
-            date_from=cd.get("date_from"),
-            date_to=cd.get("date_to"),
-            customer_id=cd.get("customer").id if cd.get("customer") else None,
-            status=cd.get("status") or None,
-            job_id=cd.get("job_id") or None,
-        )
+        rows, totals = svc.build(**profitability_filters(form))
 
         ctx.update({
             "form": form,
@@ -34,6 +40,27 @@ class ProfitabilityReportView(LoginRequiredMixin, TemplateView):
 
 
 
+class ProfitabilityReportExportView(LoginRequiredMixin, View):
+    """
+    Export CSV/XLSX (?format=csv|xlsx) di-stream, total di baris terakhir.
+    """
+
+    def get(self, request):
+        form = ProfitabilityFilterForm(request.GET or None)
+        form.is_valid()
+        filters = profitability_filters(form)
+
+        svc = ProfitabilityService(revenue_field="amount")
+        return streaming_export_response(
+            request.GET.get("format"),
+            filename="profitability_report",
+            header=svc.EXPORT_HEADER,
+            rows=svc.export_rows(**filters),
+            trailer=svc.export_trailer(**filters),
+            sheet_name="Profitability",
+        )
+
+
 class JobProfitabilityDetailView(LoginRequiredMixin, TemplateView):
     template_name = "reports/job_profitability_detail.html"
 
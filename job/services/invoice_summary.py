@@ -0,0 +1,60 @@
+# job/services/invoice_summary.py
+"""
+Ringkasan invoice per JobOrder (denormalisasi):
+- is_invoiced / dp_invoiced / final_invoiced / invoiced_total (DP + FINAL) / invoice_paid_total
+- dihitung ulang set-based (1 UPDATE dengan subquery) tiap Invoice berubah -> billing.signals,
+  di dalam transaksi yang sama dengan perubahan invoice
+- JobOrder.has_dp_invoice / total_invoiced / can_generate_* cukup baca kolom, tanpa query
+"""
+from decimal import Decimal
+
+from django.db.models import DecimalField, Exists, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+BILLABLE_TYPES = ("DP", "FINAL")
+
+
+def _sum_subquery(qs, field):
+    money = DecimalField(max_digits=18, decimal_places=2)
+    total = qs.values("job_order").annotate(total=Sum(field)).values("total")
+    return Coalesce(Subquery(total, output_field=money), Value(Decimal("0.00")), output_field=money)
+
+
+def summary_updates(invoice_model) -> dict:
+    """
+    Ekspresi UPDATE untuk JobOrder.
+    Migrasi backfill job 0045 tidak memakai fungsi ini: ekspresinya disalin inline di sana
+    -> kalau aturan di sini berubah, samakan juga di 0045.
+    """
+    invoices = invoice_model.objects.filter(job_order=OuterRef("pk")).order_by()
+    return {
+        "is_invoiced": Exists(invoices),
+        "dp_invoiced": Exists(invoices.filter(invoice_type="DP")),
+        "final_invoiced": Exists(invoices.filter(invoice_type="FINAL")),
+        "invoiced_total": _sum_subquery(invoices.filter(invoice_type__in=BILLABLE_TYPES), "total_amount"),
+        "invoice_paid_total": _sum_subquery(invoices, "amount_paid"),
+    }
+
+
+def refresh_invoice_summary(job_ids=None) -> int:
+    """
+    Hitung ulang ringkasan invoice untuk job_ids (None -> semua job). Return jumlah baris.
+    """
+    from billing.models.customer_invoice import Invoice
+    from job.models.job_orders import JobOrder
+
+    qs = JobOrder.all_objects.all()
+    if job_ids is not None:
+        job_ids = {pk for pk in job_ids if pk}
+        if not job_ids:
+            return 0
+        qs = qs.filter(pk__in=job_ids)
+    return qs.update(**summary_updates(Invoice))
+
+
+def reload_invoice_summary(job) -> None:
+    """
+    Instance JobOrder di memory ikut update setelah refresh (mis. job yang masih dipakai view).
+    """
+    job.refresh_from_db(fields=list(job.INVOICE_SUMMARY_FIELDS))
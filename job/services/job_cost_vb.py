@@ -1,29 +1,114 @@
+"""
+Alokasi Vendor Booking ke JobCost (set-based):
+- vb_allocated_qty = sum(qty) VendorBookingLine per job_cost (VB CANCELLED tidak dihitung) -> 1 UPDATE (subquery)
+- vb_status NONE / PARTIAL / FULL dari vb_allocated_qty vs qty -> 1 UPDATE (CASE)
+- recompute_allocations(vendor_booking=..., job_order=...) sekalian rapikan
+  VendorBookingLine.amount (qty * unit_price) dalam 1 UPDATE
+- rebuild_allocations() untuk seluruh DB, per chunk job order (command rebuild_vb_allocations)
+"""
 from decimal import Decimal
-from django.db.models import Sum
+
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+
+def _allocated_subquery():
+    from work_orders.models.vendor_bookings import VendorBooking, VendorBookingLine
+
+    qty = DecimalField(max_digits=18, decimal_places=2)
+    total = (
+        VendorBookingLine.objects
+        .filter(job_cost_id=OuterRef("pk"))
+        .exclude(vendor_booking__status=VendorBooking.ST_CANCELLED)
+        .order_by()
+        .values("job_cost_id")
+        .annotate(total=Sum("qty"))
+        .values("total")
+    )
+    return Coalesce(Subquery(total, output_field=qty), Value(Decimal("0.00")), output_field=qty)
+
+
+def refresh_job_cost_vb(*, job_cost_ids=None, job_order_ids=None) -> int:
+    """
+    Hitung ulang vb_allocated_qty + vb_status untuk JobCost terpilih
+    (None di keduanya -> semua JobCost). Return jumlah JobCost.
+    """
+    from job.models.job_costs import JobCost
+
+    qs = JobCost.objects.all()
+    if job_cost_ids is not None:
+        qs = qs.filter(pk__in={pk for pk in job_cost_ids if pk})
+    if job_order_ids is not None:
+        qs = qs.filter(job_order_id__in={pk for pk in job_order_ids if pk})
+
+    with transaction.atomic():
+        updated = qs.update(vb_allocated_qty=_allocated_subquery())
+        # status dari kolom yang baru di-update (statement terpisah: MySQL vs DB lain beda
+        # urutan evaluasi SET kalau digabung 1 statement)
+        qs.update(vb_status=Case(
+            When(vb_allocated_qty__lte=0, then=Value(JobCost.VB_NONE)),
+            When(vb_allocated_qty__gte=F("qty"), then=Value(JobCost.VB_FULL)),
+            default=Value(JobCost.VB_PARTIAL),
+        ))
+    return updated
+
 
 def recalc_job_cost_vb(job_cost):
     """
     Hitung ulang alokasi Vendor Booking untuk satu JobCost.
-    - vb_allocated_qty = sum(qty) dari VendorBookingLine terkait
+    - vb_allocated_qty = sum(qty) dari VendorBookingLine terkait (kecuali VB CANCELLED)
     - vb_status: NONE / PARTIAL / FULL
     """
-    from shipments.models.vendor_bookings import VendorBookingLine
-    from job.models.costs import JobCost
+    refresh_job_cost_vb(job_cost_ids=[job_cost.pk])
+    job_cost.refresh_from_db(fields=["vb_allocated_qty", "vb_status"])
 
-    agg = VendorBookingLine.objects.filter(
-        job_cost_id=job_cost.id,
-        is_active=True,
-        vendor_booking__isnull=False,
-    ).aggregate(total=Sum("qty"))
 
-    allocated = agg["total"] or Decimal("0")
-    job_cost.vb_allocated_qty = allocated
+def recompute_allocations(*, vendor_booking=None, job_order=None) -> dict:
+    """
+    Dari 1 vendor booking atau 1 job order:
+    - VendorBookingLine.amount semua VB terkait (1 UPDATE, hanya yang beda)
+    - JobCost.vb_allocated_qty / vb_status semua cost di job order itu (2 UPDATE)
+    JobCost diambil per job order (bukan per line) supaya cost yang line-nya dipindah/dihapus ikut turun.
+    """
+    from work_orders.models.vendor_bookings import VendorBookingLine
+    from work_orders.services.vendor_booking_totals import refresh_line_amounts
+
+    if vendor_booking is None and job_order is None:
+        raise ValueError("vendor_booking atau job_order wajib diisi.")
 
-    if allocated <= 0:
-        job_cost.vb_status = JobCost.VB_NONE
-    elif allocated >= (job_cost.qty or Decimal("0")):
-        job_cost.vb_status = JobCost.VB_FULL
+    if vendor_booking is not None:
+        lines = VendorBookingLine.objects.filter(vendor_booking_id=vendor_booking.pk)
+        job_order_id = vendor_booking.job_order_id
     else:
-        job_cost.vb_status = JobCost.VB_PARTIAL
+        lines = VendorBookingLine.objects.filter(vendor_booking__job_order_id=job_order.pk)
+        job_order_id = job_order.pk
+
+    with transaction.atomic():
+        line_count = refresh_line_amounts(lines)
+        cost_count = refresh_job_cost_vb(job_order_ids=[job_order_id]) if job_order_id else 0
+
+    return {"lines": line_count, "job_costs": cost_count}
+
+
+def rebuild_allocations(*, chunk_size: int = 500) -> dict:
+    """
+    Rebuild seluruh DB, per chunk job order id (transaksi pendek per chunk).
+    """
+    from job.models.job_costs import JobCost
+    from work_orders.models.vendor_bookings import VendorBooking, VendorBookingLine
+    from work_orders.services.vendor_booking_totals import refresh_line_amounts
+
+    totals = {"lines": 0, "job_costs": 0}
+    job_ids = set(JobCost.objects.order_by().values_list("job_order_id", flat=True).distinct())
+    job_ids |= set(VendorBooking.objects.order_by().values_list("job_order_id", flat=True).distinct())
+    job_ids = sorted(job_ids)
 
-    job_cost.save(update_fields=["vb_allocated_qty", "vb_status"])
+    for i in range(0, len(job_ids), chunk_size):
+        chunk = job_ids[i:i + chunk_size]
+        with transaction.atomic():
+            totals["lines"] += refresh_line_amounts(
+                VendorBookingLine.objects.filter(vendor_booking__job_order_id__in=chunk)
+            )
+            totals["job_costs"] += refresh_job_cost_vb(job_order_ids=chunk)
+    return totals
@@ -1,12 +1,16 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal, ROUND_HALF_UP
 from datetime import date
-from django.db import transaction
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
 from django.utils import timezone
 
-from job.models.job_orders import JobOrder, 
+from job.models.job_orders import JobOrder
 from job.models.job_fee import JobFeeLine,JobFeePeriod,JobFeePeriodStatus
 
 TWO = Decimal("0.01")
+BULK_BATCH_SIZE = 1000
 
 
 def month_start(d: date) -> date:
@@ -19,6 +23,76 @@ def next_month_start(d: date) -> date:
     return d.replace(month=d.month + 1, day=1)
 
 
+def _completed_jobs(m0: date, m1: date):
+    return JobOrder.objects.filter(
+        status=JobOrder.ST_COMPLETED,
+        completed_at__gte=m0,
+        completed_at__lt=m1,
+    )
+
+
+def _fee_rows(qs, percent: Decimal):
+    """
+    1 pass di atas values() (tanpa instance model) -> list dict per job.
+    Job tanpa sales_user dilewati (JobFeeLine.sales_user wajib).
+    """
+    pct = Decimal(percent).quantize(TWO, rounding=ROUND_HALF_UP)
+    user_label = f"sales_user__{get_user_model().USERNAME_FIELD}"
+
+    rows = []
+    for r in qs.filter(sales_user__isnull=False).values("id", "sales_user_id", user_label, "total_amount"):
+        base = Decimal(r["total_amount"] or 0).quantize(TWO, rounding=ROUND_HALF_UP)
+        rows.append({
+            "job_order_id": r["id"],
+            "sales_user_id": r["sales_user_id"],
+            "sales_user": r[user_label],
+            "base_amount": base,
+            "percent": pct,
+            "fee_amount": (base * pct / Decimal("100")).quantize(TWO, rounding=ROUND_HALF_UP),
+        })
+    return pct, rows
+
+
+def _summary(m0: date, rows, skipped=None) -> dict:
+    per_user = {}
+    for r in rows:
+        u = per_user.setdefault(r["sales_user_id"], {
+            "sales_user": r["sales_user"], "jobs": 0, "base": Decimal("0.00"), "fee": Decimal("0.00"),
+        })
+        u["jobs"] += 1
+        u["base"] += r["base_amount"]
+        u["fee"] += r["fee_amount"]
+
+    return {
+        "month": m0,
+        "jobs": len(rows),
+        "total_base": sum((r["base_amount"] for r in rows), Decimal("0.00")),
+        "total_fee": sum((r["fee_amount"] for r in rows), Decimal("0.00")),
+        "per_user": per_user,
+        "skipped": skipped,  # status period kalau bulan ini tidak akan di-generate (APPROVED/PAID)
+    }
+
+
+def preview_job_fee_for_month(month: date, percent: Decimal, *, replace_if_draft: bool = True) -> dict:
+    """
+    Dry-run: hitung fee bulan ini tanpa menulis apa pun, aturan sama dengan generate_job_fee_for_month
+    (period APPROVED/PAID dilewati, keep lines -> hanya job yang belum punya line).
+    Return {month, jobs, total_base, total_fee, per_user: {sales_user_id: {sales_user, jobs, base, fee}}, skipped}.
+    """
+    m0 = month_start(month)
+    period = JobFeePeriod.objects.filter(month=m0).values("status").first()
+
+    if period and period["status"] != JobFeePeriodStatus.DRAFT:
+        return _summary(m0, [], skipped=period["status"])
+
+    qs = _completed_jobs(m0, next_month_start(m0))
+    if period and not replace_if_draft:
+        qs = qs.filter(sales_fee_line__isnull=True)
+
+    _pct, rows = _fee_rows(qs, percent)
+    return _summary(m0, rows)
+
+
 @transaction.atomic
 def generate_job_fee_for_month(
     month: date,
@@ -30,11 +104,12 @@ def generate_job_fee_for_month(
     """
     Generate Sales Fee berdasarkan JobOrder yang status='completed' pada bulan completed_at.
     Bulan tanpa job completed => period tidak dibuat (report tidak muncul).
+    Line ditulis dengan bulk_create (bukan create per job).
     """
     m0 = month_start(month)
     m1 = next_month_start(m0)
 
-    period = JobFeePeriod.objects.filter(month=m0).first()
+    period = JobFeePeriod.objects.select_for_update().filter(month=m0).first()
     created = False
 
     if period:
@@ -50,14 +125,15 @@ def generate_job_fee_for_month(
         period = JobFeePeriod(month=m0, percent=percent)
         created = True
 
-    qs = JobOrder.objects.filter(
-        status="completed",
-        completed_at__gte=m0,
-        completed_at__lt=m1,
-    ).select_related("sales_user")
+    qs = _completed_jobs(m0, m1)
+    if not created and not replace_if_draft:
+        # line lama dipertahankan -> job yang sudah punya line tidak dibuat ulang
+        qs = qs.filter(sales_fee_line__isnull=True)
+
+    pct, rows = _fee_rows(qs, percent)
 
     # bulan kosong => period tidak dibuat
-    if not qs.exists():
+    if not rows and (created or replace_if_draft):
         if not created:
             period.delete()
         return None, 0
@@ -66,24 +142,58 @@ def generate_job_fee_for_month(
     period.generated_by = user if getattr(user, "pk", None) else None
     period.save()
 
-    pct = Decimal(percent).quantize(TWO, rounding=ROUND_HALF_UP)
-
-    n = 0
-    for jo in qs:
-        base = Decimal(jo.total_amount or 0).quantize(TWO, rounding=ROUND_HALF_UP)
-        fee = (base * pct / Decimal("100")).quantize(TWO, rounding=ROUND_HALF_UP)
-
-        JobFeeLine.objects.create(
-            period=period,
-            job_order=jo,
-            sales_user=jo.sales_user,
-            base_amount=base,
-            percent=pct,
-            fee_amount=fee,
-        )
-        n += 1
+    JobFeeLine.objects.bulk_create(
+        [
+            JobFeeLine(
+                period=period,
+                job_order_id=r["job_order_id"],
+                sales_user_id=r["sales_user_id"],
+                base_amount=r["base_amount"],
+                percent=pct,
+                fee_amount=r["fee_amount"],
+            )
+            for r in rows
+        ],
+        batch_size=BULK_BATCH_SIZE,
+    )
 
     period.recalc_totals()
     period.save(update_fields=["total_base_amount", "total_fee_amount", "percent", "generated_at", "generated_by"])
 
-    return period, n
+    return period, len(rows)
+
+
+def _run_month(month, percent, user, replace_if_draft, dry_run):
+    try:
+        if dry_run:
+            return preview_job_fee_for_month(month, percent, replace_if_draft=replace_if_draft)
+        return generate_job_fee_for_month(month, percent, user=user, replace_if_draft=replace_if_draft)
+    finally:
+        # thread worker punya koneksi DB sendiri -> tutup supaya tidak bocor
+        if threading.current_thread() is not threading.main_thread():
+            connection.close()
+
+
+def generate_job_fee_for_months(
+    months,
+    percent: Decimal,
+    *,
+    user=None,
+    replace_if_draft: bool = True,
+    workers: int = 1,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Regenerate beberapa bulan; tiap bulan transaksi sendiri.
+    workers > 1 -> bulan diproses paralel (thread, koneksi DB masing-masing).
+    Return {month: (period, n)} atau {month: preview} kalau dry_run.
+    """
+    months = sorted({month_start(m) for m in months})
+    args = (percent, user, replace_if_draft, dry_run)
+
+    if workers <= 1 or len(months) <= 1:
+        return {m: _run_month(m, *args) for m in months}
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(months)), thread_name_prefix="job-fee") as pool:
+        futures = {m: pool.submit(_run_month, m, *args) for m in months}
+        return {m: f.result() for m, f in futures.items()}
@@ -3,7 +3,8 @@ from django.db import transaction
 from django.core.exceptions import ValidationError
 
 from accounting.models.settings import AccountingSettings
-from accounting.models.journal import Journal, JournalLine
+from accounting.models.journal import Journal
+from accounting.services.posting import create_journal
 
 
 def ensure_job_costing_posted(job, *, user=None):
@@ -66,30 +67,23 @@ def ensure_job_costing_posted(job, *, user=None):
         raise ValidationError("Default accrued account belum diset di Core Settings")
 
     with transaction.atomic():
-        journal = Journal.objects.create(
+        # Dr COGS (per cost type mapping), Cr Accrued -> 1x bulk insert
+        lines = [
+            {"account": acc_id, "debit": amount, "credit": 0}
+            for acc_id, amount in cogs_map.items()
+        ]
+        lines.append({"account": accrued, "debit": 0, "credit": total_amount})
+
+        journal = create_journal(
+            number="",
             date=job.completed_at.date(),
             description=f"COGS (Accrual-Estimate) Job {job.number}",
             source_type="JOB",
             source_ref=job.number,
             currency=job.currency,
-            created_by=user,
-        )
-
-        # Dr COGS (per cost type mapping)
-        for acc_id, amount in cogs_map.items():
-            JournalLine.objects.create(
-                journal=journal,
-                account_id=acc_id,
-                debit=amount,
-                credit=0,
-            )
-
-        # Cr Accrued
-        JournalLine.objects.create(
-            journal=journal,
-            account=accrued,
-            debit=0,
-            credit=total_amount,
+            user=user,
+            lines=lines,
+            bulk=True,
         )
 
         # ✅ link balik ke job supaya complete() bisa blok repeat
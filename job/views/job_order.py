@@ -13,9 +13,12 @@ from job.forms.Job_costs import JobCostFormSet
 
 from job.forms.attachment  import JobOrderAttachmentForm
 from django.views.generic import ListView
+from core.utils.keyset_pagination import KeysetPaginationMixin
 
 from partners.models import Customer
+from partners.services.roles import customer_choices
 from core.models.services import Service
+from core.services.lookup_cache import service_choices
 from core.models.currencies import Currency
 from django.views.generic import ListView, CreateView, UpdateView, DetailView
 from core.utils.numbering import get_next_number
@@ -58,7 +61,7 @@ def cost_type_meta_json():
 # ==========================
 # LIST
 # ==========================
-class JobOrderListView(LoginRequiredMixin, ListView):
+class JobOrderListView(KeysetPaginationMixin, LoginRequiredMixin, ListView):
     model = JobOrder
     template_name = "job_order/list.html"
     context_object_name = "job_orders"
@@ -68,6 +71,8 @@ class JobOrderListView(LoginRequiredMixin, ListView):
         qs = (
             JobOrder.objects.visible()
             .select_related("customer", "service", "payment_term", "currency", "sales_user")
+            # remaining/outstanding/can_generate_* dari kolom ringkasan -> tanpa query per baris
+            .with_invoice_summary()
         )
 
         # ===== sorting =====
@@ -129,8 +134,8 @@ class JobOrderListView(LoginRequiredMixin, ListView):
         ctx["filter_date_to"] = self.request.GET.get("date_to", "")
 
         # dropdown data
-        ctx["customers"] = Customer.objects.all().order_by("name")
-        ctx["services"] = Service.objects.all().order_by("name")
+        ctx["customers"] = customer_choices()
+        ctx["services"] = service_choices()
         ctx["status_choices"] = JobOrder.STATUS_CHOICES
 
         # sort current (buat header sort link)
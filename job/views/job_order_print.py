@@ -1,12 +1,10 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from django.template.loader import render_to_string
 from django.views import View
 from django.views.generic import DetailView
 
-from weasyprint import HTML
-
+from core.services.pdf_render import pdf_response
 from job.models.job_orders import JobOrder  # sesuaikan path model kamu
 from job.services.print_context import job_order_print_context
 
@@ -44,10 +42,13 @@ class JobOrderPDFView(LoginRequiredMixin, View):
 
         html = render_to_string("job_order/job_order_pdf.html", ctx, request=request)
 
-        base_url = request.build_absolute_uri("/")
-        pdf_bytes = HTML(string=html, base_url=base_url).write_pdf()
-
         filename = f"job-order-{(getattr(jo, 'job_number', None) or str(pk)).replace('/', '-')}.pdf"
-        resp = HttpResponse(pdf_bytes, content_type="application/pdf")
-        resp["Content-Disposition"] = f'inline; filename="{filename}"'
-        return resp
+
+        # ✅ render di worker pool + cache disk (reprint = langsung dari disk)
+        return pdf_response(
+            request,
+            engine="weasyprint",
+            html=html,
+            filename=filename,
+            options={"base_url": request.build_absolute_uri("/")},
+        )
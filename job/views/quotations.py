@@ -26,10 +26,12 @@ from django.template.loader import render_to_string
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import HttpResponse
-from weasyprint import HTML  # pip install weasyprint
+from core.services.pdf_render import pdf_response
 from django.utils.dateparse import parse_date
 from partners.models import Customer
+from partners.services.roles import customer_choices
 from core.models.services import Service
+from core.services.lookup_cache import service_choices
 from core.models.payment_terms import PaymentTerm
 from core.models.currencies import Currency
 from sales.utils.signature import build_signature_context_for_quotation
@@ -141,8 +143,8 @@ class QuotationListView(LoginRequiredMixin, ListView):
         ctx["filter_date_to"] = self.request.GET.get("date_to", "")
 
         # dropdown data (yang punya quotation saja)
-        ctx["customers"] = Customer.objects.all().order_by("name")
-        ctx["services"] = Service.objects.all().order_by("name")
+        ctx["customers"] = customer_choices()
+        ctx["services"] = service_choices()
         ctx["payment_terms"] = PaymentTerm.objects.all().order_by("name")
         ctx["currencies"] = Currency.objects.all().order_by("name")
         
@@ -432,32 +434,42 @@ class QuotationPrintPreviewView(LoginRequiredMixin, DetailView):
 
         return ctx
 
-class QuotationPDFView(LoginRequiredMixin, View):
-    def get(self, request, pk: int, *args, **kwargs):
-        quotation = get_object_or_404(Quotation, pk=pk)
+def quotation_pdf_html(request, quotation) -> str:
+    """
+    HTML final untuk PDF quotation (dipakai QuotationPDFView + attachment email).
+    """
+    # ambil context existing
+    ctx = _quotation_print_context(quotation) or {}
 
-        # ambil context existing
-        ctx = _quotation_print_context(quotation) or {}
+    # ✅ pastikan template selalu punya object penting (anti "debug kosong")
+    ctx.setdefault("quotation", quotation)
+    ctx.setdefault("q", quotation)  # optional alias kalau template ada pakai q
+    ctx.setdefault("job", quotation.job_order)
+    ctx.setdefault("job_order", quotation.job_order)
+    profile = getattr(request.user, "profile", None)
+    ctx.setdefault("signature_name", (request.user.get_full_name() or request.user.username))
+    ctx.setdefault("signature_title", getattr(profile, "title", "") if profile else "")
+    ctx.setdefault("signature_image", getattr(profile, "signature", None) if profile else None)
 
-        # ✅ pastikan template selalu punya object penting (anti "debug kosong")
-        ctx.setdefault("quotation", quotation)
-        ctx.setdefault("q", quotation)  # optional alias kalau template ada pakai q
-        ctx.setdefault("job", quotation.job_order)
-        ctx.setdefault("job_order", quotation.job_order)
-        profile = getattr(request.user, "profile", None)
-        ctx.setdefault("signature_name", (request.user.get_full_name() or request.user.username))
-        ctx.setdefault("signature_title", getattr(profile, "title", "") if profile else "")
-        ctx.setdefault("signature_image", getattr(profile, "signature", None) if profile else None)
+    return render_to_string("quotations/quote_pdf.html", ctx, request=request)
 
-        html = render_to_string("quotations/quote_pdf.html", ctx, request=request)
 
-        base_url = request.build_absolute_uri("/")
-        pdf_bytes = HTML(string=html, base_url=base_url).write_pdf()
+def quotation_pdf_filename(quotation) -> str:
+    return f"quotation-{(quotation.number or str(quotation.pk)).replace('/', '-')}.pdf"
 
-        filename = f"quotation-{(quotation.number or str(pk)).replace('/', '-')}.pdf"
-        resp = HttpResponse(pdf_bytes, content_type="application/pdf")
-        resp["Content-Disposition"] = f'inline; filename="{filename}"'
-        return resp
+
+class QuotationPDFView(LoginRequiredMixin, View):
+    def get(self, request, pk: int, *args, **kwargs):
+        quotation = get_object_or_404(Quotation, pk=pk)
+
+        # ✅ render di worker pool + cache disk
+        return pdf_response(
+            request,
+            engine="weasyprint",
+            html=quotation_pdf_html(request, quotation),
+            filename=quotation_pdf_filename(quotation),
+            options={"base_url": request.build_absolute_uri("/")},
+        )
 
 class QuotationConvertToOrderView(View):
     @transaction.atomic
@@ -1,13 +1,14 @@
 import logging
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.mail import EmailMessage
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.views import View
 
 from job.models.quotations import Quotation
 from job.forms.quote_email import QuotationEmailForm
+from job.views.quotations import quotation_pdf_filename, quotation_pdf_html
+from core.services.email_outbox import enqueue_email, pdf_attachment
 
 logger = logging.getLogger(__name__)
 
@@ -25,26 +26,33 @@ class QuotationSendEmailView(LoginRequiredMixin, View):
             return redirect("job:quotation_detail", pk=q.id)
 
         try:
-            email = EmailMessage(
+            attachments = []
+            if form.cleaned_data.get("attach_pdf"):
+                # ✅ HTML dirender di sini (cepat); PDF + SMTP dikerjakan worker send_outbox
+                attachments.append(pdf_attachment(
+                    quotation_pdf_filename(q),
+                    html=quotation_pdf_html(request, q),
+                    options={"base_url": request.build_absolute_uri("/")},
+                ))
+
+            enqueue_email(
                 subject=form.cleaned_data["subject"],
                 body=form.cleaned_data["message"],
                 to=form.cleaned_data["to"],
                 cc=form.cleaned_data["cc"],
+                attachments=attachments,
+                ref=f"quotation:{q.pk}",
+                user=request.user,
             )
 
-            if form.cleaned_data.get("attach_pdf"):
-                pdf_bytes, filename = self._render_quotation_pdf_bytes(request, q)
-                email.attach(filename, pdf_bytes, "application/pdf")
-
-            email.send()
-
             messages.success(
                 request,
-                "Email quotation berhasil dikirim.",
+                "Email quotation masuk antrian dan akan segera dikirim.",
                 extra_tags="ui-modal",
             )
 
         except Exception as e:
+            logger.exception("Quotation email enqueue failed")
             messages.error(
                 request,
                 f"Gagal kirim email: {e}",
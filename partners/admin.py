@@ -2,6 +2,7 @@ from django import forms
 from django.contrib import admin
 from django.contrib.admin.widgets import FilteredSelectMultiple
 from .models import Partner, PartnerRole, PartnerRoleTypes
+from .services.roles import sync_role_flags
 
 
 # partners/admin.py
@@ -44,6 +45,10 @@ class PartnerAdminForm(forms.ModelForm):
                 ])
             if to_del:
                 PartnerRole.objects.filter(partner=obj, role_type_id__in=to_del).delete()
+            if to_add or to_del:
+                # bulk_create tidak kirim post_save -> flag is_customer/is_vendor disinkron manual
+                sync_role_flags([obj.pk])
+                obj.refresh_from_db(fields=["is_customer", "is_vendor"])
 
         # kalau commit False, tanggung jawab caller; kalau True, langsung sinkron
         if commit and self.is_valid():
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+CUSTOMER_ROLE_CODES = ["customer"]
+VENDOR_ROLE_CODES = ["vendor", "carrier"]
+
+
+def _codes_q(codes):
+    q = models.Q()
+    for code in codes:
+        q |= models.Q(role_type__code__iexact=code)
+    return q
+
+
+def backfill_role_flags(apps, schema_editor):
+    Partner = apps.get_model("partners", "Partner")
+    PartnerRole = apps.get_model("partners", "PartnerRole")
+
+    customer_ids = PartnerRole.objects.filter(_codes_q(CUSTOMER_ROLE_CODES)).values("partner_id")
+    vendor_ids = PartnerRole.objects.filter(_codes_q(VENDOR_ROLE_CODES)).values("partner_id")
+    Partner.objects.filter(pk__in=customer_ids).update(is_customer=True)
+    Partner.objects.filter(pk__in=vendor_ids).update(is_vendor=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geo', '0008_location_path'),
+        ('partners', '0013_alter_partner_address_alter_partner_address_line1_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='partner',
+            name='is_customer',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='partner',
+            name='is_vendor',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='partner',
+            index=models.Index(fields=['is_customer', 'name'], name='partners_customer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='partner',
+            index=models.Index(fields=['is_vendor', 'name'], name='partners_vendor_idx'),
+        ),
+        migrations.RunPython(backfill_role_flags, migrations.RunPython.noop),
+    ]
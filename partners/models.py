@@ -181,6 +181,10 @@ class Partner(models.Model):
         help_text="Peran partner (Customer, Vendor, Carrier, Agent, dll).",
     )
 
+    # ✅ denormalisasi dari PartnerRole (dijaga partners.signals) -> filter Customer/Vendor tanpa JOIN
+    is_customer = models.BooleanField(default=False, editable=False)
+    is_vendor = models.BooleanField(default=False, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -188,6 +192,8 @@ class Partner(models.Model):
         db_table = "partners"
         indexes = [
             models.Index(fields=["name"], name="partners_name_idx"),
+            models.Index(fields=["is_customer", "name"], name="partners_customer_idx"),
+            models.Index(fields=["is_vendor", "name"], name="partners_vendor_idx"),
         ]
 
     def __str__(self):
@@ -297,12 +303,8 @@ class Partner(models.Model):
 
 class CustomerManager(models.Manager):
     def get_queryset(self):
-        return (
-            super()
-            .get_queryset()
-            .filter(roles__code__iexact="customer")  # aman upper/lower
-            .distinct()
-        )
+        # flag di-sync dari role "customer" (partners.services.roles)
+        return super().get_queryset().filter(is_customer=True)
 
 
 class Customer(Partner):
@@ -316,12 +318,8 @@ class Customer(Partner):
 
 class VendorManager(models.Manager):
     def get_queryset(self):
-        return (
-            super()
-            .get_queryset()
-            .filter(roles__code__in=["vendor", "carrier"])  # sesuaikan kode role
-            .distinct()
-        )
+        # flag di-sync dari role "vendor" / "carrier" (partners.services.roles)
+        return super().get_queryset().filter(is_vendor=True)
 
 
 class Vendor(Partner):
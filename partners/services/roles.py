@@ -0,0 +1,67 @@
+# partners/services/roles.py
+"""
+Flag role ter-denormalisasi di Partner (is_customer / is_vendor):
+- sumber kebenaran tetap PartnerRole (M2M roles)
+- flag dihitung ulang tiap kali PartnerRole / PartnerRoleTypes berubah (partners.signals)
+- Customer/Vendor manager cukup filter flag (indexed), tanpa JOIN + DISTINCT
+"""
+from core.services.lookup_cache import invalidate_lookup, lookup_choices
+
+
+CUSTOMER_ROLE_CODES = {"customer"}
+VENDOR_ROLE_CODES = {"vendor", "carrier"}  # sesuaikan kode role
+
+CUSTOMER_LOOKUP = "partners.customers"
+VENDOR_LOOKUP = "partners.vendors"
+
+
+def sync_role_flags(partner_ids=None) -> int:
+    """
+    Hitung ulang is_customer/is_vendor. partner_ids=None -> semua partner.
+    Hanya baris yang flag-nya berubah yang di-update. Return jumlah partner yang berubah.
+    """
+    from partners.models import Partner, PartnerRole
+
+    qs = Partner.objects.all()
+    if partner_ids is not None:
+        partner_ids = {pid for pid in partner_ids if pid}
+        if not partner_ids:
+            return 0
+        qs = qs.filter(pk__in=partner_ids)
+
+    roles = {}
+    role_qs = PartnerRole.objects.values_list("partner_id", "role_type__code")
+    if partner_ids is not None:
+        role_qs = role_qs.filter(partner_id__in=partner_ids)
+    for pid, code in role_qs:
+        roles.setdefault(pid, set()).add((code or "").lower())
+
+    changed = []
+    for p in qs.only("id", "is_customer", "is_vendor"):
+        codes = roles.get(p.pk, set())
+        is_customer = bool(codes & CUSTOMER_ROLE_CODES)
+        is_vendor = bool(codes & VENDOR_ROLE_CODES)
+        if (p.is_customer, p.is_vendor) != (is_customer, is_vendor):
+            p.is_customer, p.is_vendor = is_customer, is_vendor
+            changed.append(p)
+
+    if changed:
+        Partner.objects.bulk_update(changed, ["is_customer", "is_vendor"], batch_size=1000)
+        invalidate_partner_lookups()
+    return len(changed)
+
+
+def invalidate_partner_lookups() -> None:
+    invalidate_lookup(CUSTOMER_LOOKUP, VENDOR_LOOKUP)
+
+
+def customer_choices() -> list[dict]:
+    from partners.models import Customer
+
+    return lookup_choices(CUSTOMER_LOOKUP, Customer.objects.all())
+
+
+def vendor_choices() -> list[dict]:
+    from partners.models import Vendor
+
+    return lookup_choices(VENDOR_LOOKUP, Vendor.objects.all())
@@ -0,0 +1,65 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from partners.models import Customer, Partner, PartnerRole, PartnerRoleTypes, Vendor
+from partners.services.roles import invalidate_partner_lookups, sync_role_flags
+
+
+def _refresh_flags(partner) -> None:
+    # instance di memory ikut update -> save() berikutnya tidak menimpa flag dengan nilai lama
+    flags = Partner.objects.filter(pk=partner.pk).values_list("is_customer", "is_vendor").first()
+    if flags:
+        partner.is_customer, partner.is_vendor = flags
+
+
+@receiver(post_save, sender=PartnerRole)
+@receiver(post_delete, sender=PartnerRole)
+def _partner_role_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    sync_role_flags([instance.partner_id])
+    if PartnerRole.partner.is_cached(instance):
+        _refresh_flags(instance.partner)
+
+
+@receiver(m2m_changed, sender=Partner.roles.through)
+def _partner_roles_m2m_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    # partner.roles.add()/remove()/clear() tidak memicu post_save PartnerRole
+    if action not in ("post_add", "post_remove", "post_clear", "pre_clear"):
+        return
+
+    if not reverse:
+        if action != "pre_clear":
+            sync_role_flags([instance.pk])
+            _refresh_flags(instance)
+        return
+
+    # role_type.partners.add(...)/clear(): instance = PartnerRoleTypes
+    if action == "pre_clear":
+        # setelah clear baris PartnerRole sudah hilang -> catat partner-nya dulu
+        instance._cleared_partner_ids = list(
+            PartnerRole.objects.filter(role_type=instance).values_list("partner_id", flat=True)
+        )
+    elif action == "post_clear":
+        sync_role_flags(getattr(instance, "_cleared_partner_ids", []))
+    else:
+        sync_role_flags(pk_set or [])
+
+
+@receiver(post_save, sender=PartnerRoleTypes)
+def _role_type_saved(sender, instance, raw=False, **kwargs):
+    # code role diganti -> partner yang memegang role ini bisa berubah flag
+    if not raw:
+        sync_role_flags(PartnerRole.objects.filter(role_type=instance).values_list("partner_id", flat=True))
+
+
+def _partner_changed(sender, instance, **kwargs):
+    # nama partner ada di daftar dropdown customer/vendor
+    if instance.is_customer or instance.is_vendor:
+        invalidate_partner_lookups()
+
+
+# proxy model (Customer/Vendor) mengirim signal dengan sender proxy-nya sendiri
+for _model in (Partner, Customer, Vendor):
+    post_save.connect(_partner_changed, sender=_model, dispatch_uid=f"partner_lookup:save:{_model.__name__}")
+    post_delete.connect(_partner_changed, sender=_model, dispatch_uid=f"partner_lookup:delete:{_model.__name__}")
@@ -5,6 +5,8 @@ from urllib.parse import urlencode
 from django.db.models import Q
 from django.views.generic import ListView
 
+from core.utils.keyset_pagination import KeysetPaginationMixin
+
 from ..models import ProjectCost, CostCategory, Project
 # projects/views/costs.py (tambahkan)
 from django.contrib import messages
@@ -74,7 +76,7 @@ def project_cost_bulk(request):
         messages.error(request, "Unknown action.")
     return redirect(request.META.get("HTTP_REFERER", "projects:cost_list"))
 
-class ProjectCostListView(ListView):
+class ProjectCostListView(KeysetPaginationMixin, ListView):
     model = ProjectCost
     template_name = "projects/cost_list.html"
     context_object_name = "costs"
@@ -110,5 +110,11 @@ class SalesConfig(models.Model):
 
     @classmethod
     def get_solo(cls):
+        from core.services.config_snapshot import solo
+
+        return solo(cls, cls._load_solo)
+
+    @classmethod
+    def _load_solo(cls):
         obj = cls.objects.first()
         return obj if obj else cls.objects.create()
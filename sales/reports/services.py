@@ -25,17 +25,47 @@ class SalesRevenueReportService:
         # 🔥 DESC biar terbaru di atas
         return qs.order_by("-invoice_date", "-number", "-id")
 
-    def build(self, **filters):
-        qs = self.get_queryset(**filters)
-        totals = qs.aggregate(
+    def totals(self, qs) -> dict:
+        totals = qs.order_by().aggregate(
             subtotal=Sum("subtotal_amount"),
             tax=Sum("tax_amount"),
             total=Sum("total_amount"),
             total_idr=Sum("total_idr"),         # ✅ NEW
         )
-        return qs, {
+        return {
             "subtotal": totals["subtotal"] or D0,
             "tax": totals["tax"] or D0,
             "total": totals["total"] or D0,
             "total_idr": totals["total_idr"] or D0,   # ✅ NEW
         }
+
+    def build(self, **filters):
+        qs = self.get_queryset(**filters)
+        return qs, self.totals(qs)
+
+    # ==========================
+    # EXPORT (streaming)
+    # ==========================
+    EXPORT_HEADER = [
+        "Date", "Invoice #", "Customer", "Status", "CUR",
+        "Subtotal", "Tax", "Total", "Kurs", "Total IDR",
+    ]
+
+    def export_rows(self, *, chunk_size=2000, **filters):
+        """
+        Tuple per invoice via server-side cursor (tanpa instance model).
+        """
+        qs = self.get_queryset(**filters).values_list(
+            "invoice_date", "number", "customer__name", "status", "currency__code",
+            "subtotal_amount", "tax_amount", "total_amount", "exchange_rate", "total_idr",
+        )
+        # label = Invoice.list_status di layar (DRAFT/PARTIAL/PAID/UNPAID), dihitung 1x per status
+        labels = {st: Invoice(status=st).list_status for st, _label in Invoice.STATUS_CHOICES}
+        for row in qs.iterator(chunk_size=chunk_size):
+            row = list(row)
+            row[3] = labels.get(row[3], row[3])
+            yield row
+
+    def export_trailer(self, **filters) -> list:
+        t = self.totals(self.get_queryset(**filters))
+        return ["", "", "", "", "Totals", t["subtotal"], t["tax"], t["total"], "Grand Total IDR", t["total_idr"]]
@@ -1,9 +1,10 @@
 from django.urls import path
-from .views import SalesRevenueReportView,SalesRevenueReportPdfView
+from .views import SalesRevenueReportView,SalesRevenueReportPdfView,SalesRevenueReportExportView
 
 app_name = "sales_reports"
 
 urlpatterns = [
     path("revenue/", SalesRevenueReportView.as_view(), name="revenue"),
     path("revenue/pdf/", SalesRevenueReportPdfView.as_view(), name="revenue_pdf"),
+    path("revenue/export/", SalesRevenueReportExportView.as_view(), name="revenue_export"),
 ]
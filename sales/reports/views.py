@@ -1,3 +1,8 @@
+import pdfkit
+from django.conf import settings
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.views import View
 from django.views.generic import TemplateView
 from django.contrib.auth.mixins import LoginRequiredMixin
 
@@ -8,6 +13,16 @@ from billing.models.customer_invoice import Invoice
 from django.db.models import Value
 from partners.models import Customer
 from core.models.currencies import Currency
+from core.utils.streaming_export import streaming_export_response
+
+def revenue_filters(request) -> dict:
+    return {
+        "date_from": request.GET.get("date_from"),
+        "date_to": request.GET.get("date_to"),
+        "customer_id": request.GET.get("customer"),
+        "currency": request.GET.get("currency"),
+    }
+
 
 class SalesRevenueReportView(LoginRequiredMixin, TemplateView):
     template_name = "reports/screen/sales_revenue.html"
@@ -17,12 +32,7 @@ class SalesRevenueReportView(LoginRequiredMixin, TemplateView):
 
         svc = SalesRevenueReportService()
 
-        qs, totals = svc.build(
-            date_from=self.request.GET.get("date_from"),
-            date_to=self.request.GET.get("date_to"),
-            customer_id=self.request.GET.get("customer"),
-            currency=self.request.GET.get("currency"),
-        )
+        qs, totals = svc.build(**revenue_filters(self.request))
 
         currencies = Currency.objects.order_by(
             models.Case(
@@ -44,15 +54,6 @@ class SalesRevenueReportView(LoginRequiredMixin, TemplateView):
 
 
 
-
-import pdfkit
-from django.conf import settings
-from django.http import HttpResponse
-from django.template.loader import render_to_string
-from django.views import View
-
-
-
 class SalesRevenueReportPdfView(View):
     template_name = "reports/pdf/sales_revenue_pdf.html"
 
@@ -100,4 +101,24 @@ class SalesRevenueReportPdfView(View):
 
         response = HttpResponse(pdf, content_type="application/pdf")
         response["Content-Disposition"] = 'inline; filename="sales_revenue_report.pdf"'
-        return response
\ No newline at end of file
+        return response
+
+
+class SalesRevenueReportExportView(LoginRequiredMixin, View):
+    """
+    Export CSV/XLSX (?format=csv|xlsx) di-stream pakai server-side cursor,
+    total di baris terakhir.
+    """
+
+    def get(self, request, *args, **kwargs):
+        svc = SalesRevenueReportService()
+        filters = revenue_filters(request)
+
+        return streaming_export_response(
+            request.GET.get("format"),
+            filename="sales_revenue_report",
+            header=svc.EXPORT_HEADER,
+            rows=svc.export_rows(**filters),
+            trailer=svc.export_trailer(**filters),
+            sheet_name="Sales Revenue",
+        )
@@ -18,6 +18,7 @@ import datetime
 
 from partners.models import Partner, PartnerRole
 from geo.models import Location
+from geo.services import hierarchy as geo_hierarchy
 from core.models.currencies import Currency
 from core.models.services import SalesService
 from core.models.payment_terms import PaymentTerm
@@ -27,6 +28,7 @@ from datetime import timedelta
 
 from core.utils.numbering import get_next_number
 from core.utils.other_utils import get_valid_days_default
+from core.utils.keyset_pagination import KeysetPaginationMixin
 
 from sales.forms.freights import (
     FreightQuotationForm,
@@ -44,7 +46,7 @@ from sales.freight import FreightQuotation, FreightQuotationStatus
 ALLOWED_DELETE_STATUSES = ("DRAFT", "CANCELLED", "EXPIRED")
 
 
-class FqListView(LoginRequiredMixin, ListView):
+class FqListView(KeysetPaginationMixin, LoginRequiredMixin, ListView):
     model = FreightQuotation
     template_name = "sales/quotation_list.html"
     context_object_name = "quotations"
@@ -220,61 +222,41 @@ class FreightQuotationMixin:
         if form is not None and getattr(form, "instance", None):
             fq = form.instance
 
-        # PROVINCE SELALU ADA
-        ctx["provinces"] = Location.objects.filter(
-            kind="province"
-        ).order_by("name")
+        # 1) KASUS FORM BOUND (POST) → pakai data yang dikirim user
+        # 2) KASUS EDIT (GET) → pakai instance yang sudah tersimpan
+        # 3) KASUS ADD (GET pertama) → parent kosong, nanti diisi JS
+        fields = ("shipper_province", "shipper_regency", "shipper_district",
+                  "consignee_province", "consignee_regency", "consignee_district")
+        if form is not None and form.is_bound:
+            parents = {f: form.data.get(f) or None for f in fields}
+        elif fq and fq.pk:
+            parents = {f: getattr(fq, f"{f}_id", None) for f in fields}
+        else:
+            parents = dict.fromkeys(fields)
 
-        def children(parent_id):
-            if not parent_id:
-                return Location.objects.none()
-            return Location.objects.filter(parent_id=parent_id).order_by("name")
+        def _id(value):
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return None
 
-        # DEFAULT: kosong dulu
-        ctx["shipper_regencies"]   = Location.objects.none()
-        ctx["shipper_districts"]   = Location.objects.none()
-        ctx["shipper_villages"]    = Location.objects.none()
-        ctx["consignee_regencies"] = Location.objects.none()
-        ctx["consignee_districts"] = Location.objects.none()
-        ctx["consignee_villages"]  = Location.objects.none()
+        parents = {f: _id(v) for f, v in parents.items()}
 
-        # 1) KASUS FORM BOUND (POST) → pakai data yang dikirim user
-        if form is not None and form.is_bound:
-            sp_prov_id = form.data.get("shipper_province") or None
-            sp_reg_id  = form.data.get("shipper_regency") or None
-            sp_dist_id = form.data.get("shipper_district") or None
-
-            cg_prov_id = form.data.get("consignee_province") or None
-            cg_reg_id  = form.data.get("consignee_regency") or None
-            cg_dist_id = form.data.get("consignee_district") or None
-
-            if sp_prov_id:
-                ctx["shipper_regencies"] = children(sp_prov_id)
-            if sp_reg_id:
-                ctx["shipper_districts"] = children(sp_reg_id)
-            if sp_dist_id:
-                ctx["shipper_villages"] = children(sp_dist_id)
-
-            if cg_prov_id:
-                ctx["consignee_regencies"] = children(cg_prov_id)
-            if cg_reg_id:
-                ctx["consignee_districts"] = children(cg_reg_id)
-            if cg_dist_id:
-                ctx["consignee_villages"] = children(cg_dist_id)
-
-            return ctx
+        # ✅ provinsi + 6 level anak sekaligus: cache ber-versi, miss = 1 query
+        options = geo_hierarchy.options_for(*parents.values(), include_provinces=True)
 
-        # 2) KASUS EDIT (GET) → pakai instance yang sudah tersimpan
-        if fq and fq.pk:
-            ctx["shipper_regencies"]   = children(getattr(fq, "shipper_province_id", None))
-            ctx["shipper_districts"]   = children(getattr(fq, "shipper_regency_id", None))
-            ctx["shipper_villages"]    = children(getattr(fq, "shipper_district_id", None))
+        def children(field):
+            return options.get(parents[field], []) if parents[field] else []
+
+        ctx["provinces"] = options[geo_hierarchy.PROVINCES]
 
-            ctx["consignee_regencies"] = children(getattr(fq, "consignee_province_id", None))
-            ctx["consignee_districts"] = children(getattr(fq, "consignee_regency_id", None))
-            ctx["consignee_villages"]  = children(getattr(fq, "consignee_district_id", None))
+        ctx["shipper_regencies"]   = children("shipper_province")
+        ctx["shipper_districts"]   = children("shipper_regency")
+        ctx["shipper_villages"]    = children("shipper_district")
+        ctx["consignee_regencies"] = children("consignee_province")
+        ctx["consignee_districts"] = children("consignee_regency")
+        ctx["consignee_villages"]  = children("consignee_district")
 
-        # 3) KASUS ADD (GET pertama) → tetap kosong, nanti diisi JS
         return ctx
 
 
@@ -1017,7 +999,7 @@ from sales.freight import (
 )
 
 
-class FoListView(LoginRequiredMixin, ListView):
+class FoListView(KeysetPaginationMixin, LoginRequiredMixin, ListView):
     model = FreightOrder
     template_name = "sales/order_list.html"
     context_object_name = "orders"
@@ -1,17 +1,13 @@
 # misal: sales/views/fq_pdf_html.py
 
-import pdfkit
-import tempfile
-import os
-
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from django.template.loader import render_to_string
 from django.templatetags.static import static
 from django.views import View
 
+from core.services.pdf_render import pdf_response
 from sales.freight import FreightQuotation
 
 
@@ -44,16 +40,6 @@ class FreightQuotationPdfHtmlView(LoginRequiredMixin, View):
             {"footer_url": footer_url},
         )
 
-        # simpan ke file sementara untuk wkhtmltopdf
-        tmp_header = tempfile.NamedTemporaryFile(delete=False, suffix=".html")
-        tmp_footer = tempfile.NamedTemporaryFile(delete=False, suffix=".html")
-
-        tmp_header.write(header_html.encode("utf-8"))
-        tmp_footer.write(footer_html.encode("utf-8"))
-
-        tmp_header.close()
-        tmp_footer.close()
-
         # ============ 3) Render BODY QUOTATION (konten saja) ============
         body_html = render_to_string(
             "sales/fq_print.html",
@@ -75,30 +61,24 @@ class FreightQuotationPdfHtmlView(LoginRequiredMixin, View):
             "margin-left": "0mm",
             "margin-right": "0mm",
 
-            "header-html": tmp_header.name,
-            "footer-html": tmp_footer.name,
             "header-spacing": "0",
             "footer-spacing": "0",
 
             "enable-local-file-access": None,
         }
 
-        wkhtml_path = getattr(settings, "WKHTMLTOPDF_CMD", None)
-        config = pdfkit.configuration(wkhtmltopdf=wkhtml_path) if wkhtml_path else None
-
-        pdf_data = pdfkit.from_string(
-            body_html,
-            False,
-            options=options,
-            configuration=config,
-        )
-
-        # beres: hapus file sementara
-        os.unlink(tmp_header.name)
-        os.unlink(tmp_footer.name)
-
         filename = f"FQ-{fq.number}.pdf" if getattr(fq, "number", None) else "FreightQuotation.pdf"
 
-        response = HttpResponse(pdf_data, content_type="application/pdf")
-        response["Content-Disposition"] = f'inline; filename="{filename}"'
-        return response
+        # ✅ header/footer ditulis ke file sementara oleh worker PDF (core.utils.pdf_engines)
+        return pdf_response(
+            request,
+            engine="wkhtmltopdf",
+            html=body_html,
+            filename=filename,
+            options={
+                "wkhtmltopdf_options": options,
+                "wkhtmltopdf_cmd": getattr(settings, "WKHTMLTOPDF_CMD", None),
+                "header_html": header_html,
+                "footer_html": footer_html,
+            },
+        )
@@ -71,11 +71,16 @@ class PublicShipmentTrackingSerializer(serializers.ModelSerializer):
         ]
 
     def get_timeline(self, obj):
-        qs = obj.events.filter(is_public=True).order_by("event_time", "id")
+        # pakai hasil prefetch (to_attr) kalau ada
+        qs = getattr(obj, "public_events", None)
+        if qs is None:
+            qs = obj.events.filter(is_public=True).order_by("event_time", "id")
         return PublicShipmentEventSerializer(qs, many=True, context=self.context).data
 
     def get_documents(self, obj):
-        qs = obj.documents.filter(is_public=True, doc_type="POD").order_by("-uploaded_at", "-id")
+        qs = getattr(obj, "public_pod_documents", None)
+        if qs is None:
+            qs = obj.documents.filter(is_public=True, doc_type="POD").order_by("-uploaded_at", "-id")
         return PublicShipmentDocumentSerializer(qs, many=True, context=self.context).data
 
     def get_customer_ref(self, obj):
@@ -1,11 +1,59 @@
-from django.shortcuts import get_object_or_404
+from django.db.models import Prefetch
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from shipments.models import Shipment
+from shipments.models import Shipment, ShipmentDocument, ShipmentEvent
 from shipments.api.public.serializers import PublicShipmentTrackingSerializer
 from shipments.services.public_token import verify_public_token
+from shipments.services.tracking_cache import (
+    apply_cache_headers,
+    get_tracking_payload,
+    is_not_modified,
+    last_modified_of,
+    resolve_shipment_id,
+)
+
+
+def load_public_shipment(shipment_id: int):
+    """
+    1 query shipment (+ relasi) + 2 query prefetch (timeline & dokumen public).
+    """
+    return (
+        Shipment.objects
+        .select_related("service", "origin", "destination", "job_order", "job_order__service")
+        .prefetch_related(
+            Prefetch(
+                "events",
+                queryset=ShipmentEvent.objects.filter(is_public=True).order_by("event_time", "id"),
+                to_attr="public_events",
+            ),
+            Prefetch(
+                "documents",
+                queryset=ShipmentDocument.objects.filter(is_public=True, doc_type="POD").order_by("-uploaded_at", "-id"),
+                to_attr="public_pod_documents",
+            ),
+        )
+        .filter(pk=shipment_id)
+        .first()
+    )
+
+
+def absolute_document_urls(request, data):
+    """
+    Payload cache menyimpan URL dokumen relatif -> dibuat absolut per request (scheme/host client ini).
+    """
+    docs = data.get("documents")
+    if not docs:
+        return data
+    return {
+        **data,
+        "documents": [
+            {**d, "url": request.build_absolute_uri(d["url"]) if d.get("url") else d.get("url")}
+            for d in docs
+        ],
+    }
+
 
 class PublicTrackShipmentView(APIView):
     permission_classes = [AllowAny]
@@ -17,14 +65,27 @@ class PublicTrackShipmentView(APIView):
         if not token or not verify_public_token(tracking_no, token):
             return Response({"detail": "Not found."}, status=404)
 
-        shipment = get_object_or_404(Shipment, tracking_no=tracking_no)
+        shipment_id = resolve_shipment_id(tracking_no)
+        if not shipment_id:
+            return Response({"detail": "Not found."}, status=404)
+
+        def build(sid):
+            shipment = load_public_shipment(sid)
+            # gate public: harus punya event public
+            if not shipment or not shipment.public_events:
+                return None
+            # tanpa request di context -> URL dokumen relatif (payload dipakai bersama semua host)
+            data = PublicShipmentTrackingSerializer(shipment, context={}).data
+            return data, last_modified_of(
+                shipment.created_at,
+                *(e.created_at for e in shipment.public_events),
+                *(d.uploaded_at for d in shipment.public_pod_documents),
+            )
 
-        # gate public: harus punya event public
-        if not shipment.events.filter(is_public=True).exists():
+        entry = get_tracking_payload("public_track", shipment_id, build)
+        if entry is None:
             return Response({"detail": "Not found."}, status=404)
 
-        serializer = PublicShipmentTrackingSerializer(
-            shipment,
-            context={"request": request},
-        )
-        return Response(serializer.data)
+        if is_not_modified(request, entry):
+            return apply_cache_headers(Response(status=304), entry)
+        return apply_cache_headers(Response(absolute_document_urls(request, entry["data"])), entry)
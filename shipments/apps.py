@@ -5,4 +5,5 @@ class ShipmentsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "shipments"
 
-    
\ No newline at end of file
+    def ready(self):
+        from . import signals  # noqa
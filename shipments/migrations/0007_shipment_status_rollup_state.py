@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shipments', '0006_remove_vendorbillline_bill_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='shipment',
+            name='status_event_id',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='shipment',
+            name='status_event_time',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -77,6 +77,9 @@ class Shipment(models.Model):
     )
 
     status = models.CharField(max_length=32, choices=ShipmentStatus.choices, default=ShipmentStatus.DRAFT, db_index=True)
+    # rollup state: event terakhir yang sudah diterapkan ke status (lihat services.status_rollup)
+    status_event_time = models.DateTimeField(null=True, blank=True, editable=False)
+    status_event_id = models.BigIntegerField(null=True, blank=True, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name="shipments_created")
@@ -1,8 +1,11 @@
 # shipments/services/events.py
 from django.db import transaction, IntegrityError
+from django.db.models import Q
 from django.utils import timezone
 
 from shipments.models import Shipment, ShipmentEvent
+from shipments.services.status_rollup import apply_status_event, recompute_shipment_status
+from shipments.services.tracking_cache import invalidate_tracking
 
 
 @transaction.atomic
@@ -20,7 +23,7 @@ def create_event(
     dedupe_key: str | None = None,
 ) -> ShipmentEvent:
     """
-    Single entry point untuk create ShipmentEvent + idempotent dedupe + rollup status.
+    Single entry point untuk create ShipmentEvent + idempotent dedupe + rollup status (incremental).
     """
     if event_time is None:
         event_time = timezone.now()
@@ -29,8 +32,7 @@ def create_event(
     if dedupe_key:
         existing = ShipmentEvent.objects.filter(shipment=shipment, dedupe_key=dedupe_key).first()
         if existing:
-            # tetap pastikan status up-to-date
-            _rollup_status_and_update(shipment)
+            # status sudah diterapkan saat event ini dibuat
             return existing
 
     try:
@@ -51,64 +53,12 @@ def create_event(
         ev = ShipmentEvent.objects.filter(shipment=shipment, dedupe_key=dedupe_key).first()
         if not ev:
             raise
+        return ev
 
-    _rollup_status_and_update(shipment)
+    apply_status_event(ev)
     return ev
 
 
-def _rollup_status_and_update(shipment: Shipment) -> None:
-    new_status = rollup_status(shipment)
-    if new_status and shipment.status != new_status:
-        Shipment.objects.filter(pk=shipment.pk).update(status=new_status)
-
-
-def rollup_status(shipment: Shipment) -> str:
-    """
-    Rule:
-    - CANCELED newest -> CANCELED
-    - DELIVERED newest -> DELIVERED
-    - EXCEPTION newest (after last positive) -> EXCEPTION
-    - else map latest positive event -> status
-    - if none -> DRAFT
-    """
-    qs = shipment.events.filter(affects_status=True).order_by("-event_time", "-id")
-
-    # terminal hard overrides
-    if qs.filter(code="CANCELED").exists():
-        # ambil yang terbaru
-        latest_cancel = qs.filter(code="CANCELED").first()
-        if latest_cancel:
-            return "CANCELED"
-
-    latest_delivered = qs.filter(code="DELIVERED").first()
-    if latest_delivered:
-        return "DELIVERED"
-
-    latest_exception = qs.filter(code__startswith="EXCEPTION").first()
-    latest_positive = qs.exclude(code__startswith="EXCEPTION").first()
-
-    if latest_exception and (not latest_positive or latest_exception.event_time >= latest_positive.event_time):
-        return "EXCEPTION"
-
-    if not latest_positive:
-        return "DRAFT"
-
-    STATUS_EVENT_MAP = {
-        "PICKUP_SCHEDULED": "PICKUP",
-        "PICKUP_DISPATCHED": "PICKUP",
-        "DEPARTED": "IN_TRANSIT",
-        "ARRIVED": "IN_TRANSIT",
-        "OUT_FOR_DELIVERY": "OUT_FOR_DELIVERY",
-        "DELIVERED": "DELIVERED",
-        "CANCELED": "CANCELED",
-    }
-    return STATUS_EVENT_MAP.get(latest_positive.code, shipment.status or "DRAFT")
-
-
-from django.db import transaction
-from shipments.models import ShipmentEvent
-from shipments.services.status_rollup import recompute_shipment_status
-
 @transaction.atomic
 def create_shipment_event(**kwargs) -> ShipmentEvent:
     """
@@ -117,8 +67,89 @@ def create_shipment_event(**kwargs) -> ShipmentEvent:
     """
     ev = ShipmentEvent.objects.create(**kwargs)
 
-    # Only recompute if this event affects status
+    # Only apply if this event affects status
     if ev.affects_status:
-        recompute_shipment_status(ev.shipment)
+        apply_status_event(ev)
 
     return ev
+
+
+EVENT_FIELDS = (
+    "code", "event_time", "is_public", "affects_status",
+    "location_text", "note", "dedupe_key", "source", "source_ref",
+)
+
+
+@transaction.atomic
+def create_events_bulk(items: list[dict], *, source: str = "INTEGRATION", created_by=None, batch_size: int = 500) -> dict:
+    """
+    Batch ingestion (carrier feed / GPS dump) lintas banyak shipment.
+
+    items: [{"tracking_no" | "shipment_id", "code", "event_time", "dedupe_key", ...}, ...]
+
+    - resolve shipment: 1 query (+ lock row shipment yang terdampak)
+    - dedupe by (shipment, dedupe_key): 1 query + dedupe di dalam batch
+    - insert: bulk_create
+    - status: recompute 1x per shipment terdampak
+    Return {"created", "duplicates", "errors": [{"index", "error"}], "shipments"}.
+    """
+    tracking_nos = {it["tracking_no"] for it in items if it.get("tracking_no")}
+    shipment_ids = {it["shipment_id"] for it in items if it.get("shipment_id")}
+
+    shipments = list(
+        Shipment.objects
+        .select_for_update()
+        .filter(Q(tracking_no__in=tracking_nos) | Q(pk__in=shipment_ids))
+        .only("id", "tracking_no", "status", "status_event_time", "status_event_id")
+    )
+    by_id = {s.pk: s for s in shipments}
+    by_tracking = {s.tracking_no: s for s in shipments if s.tracking_no}
+
+    keys = {it["dedupe_key"] for it in items if it.get("dedupe_key")}
+    seen = set(
+        ShipmentEvent.objects
+        .filter(shipment_id__in=by_id.keys(), dedupe_key__in=keys)
+        .values_list("shipment_id", "dedupe_key")
+    ) if keys and by_id else set()
+
+    now = timezone.now()
+    to_create = []
+    errors = []
+    duplicates = 0
+
+    for idx, it in enumerate(items):
+        shipment = by_id.get(it.get("shipment_id")) or by_tracking.get(it.get("tracking_no"))
+        if not shipment:
+            errors.append({"index": idx, "error": "shipment not found"})
+            continue
+
+        dedupe_key = it.get("dedupe_key") or None
+        if dedupe_key:
+            if (shipment.pk, dedupe_key) in seen:
+                duplicates += 1
+                continue
+            seen.add((shipment.pk, dedupe_key))
+
+        data = {f: it[f] for f in EVENT_FIELDS if f in it}
+        data.setdefault("event_time", now)
+        data.setdefault("source", source)
+        data["location_text"] = data.get("location_text") or ""
+        data["note"] = data.get("note") or ""
+        data["dedupe_key"] = dedupe_key
+
+        to_create.append(ShipmentEvent(shipment=shipment, created_by=created_by, **data))
+
+    ShipmentEvent.objects.bulk_create(to_create, batch_size=batch_size)
+    # bulk_create tidak memicu signal -> invalidate cache public tracking manual
+    invalidate_tracking(*{ev.shipment_id for ev in to_create})
+
+    affected = {ev.shipment_id for ev in to_create if ev.affects_status}
+    for sid in affected:
+        recompute_shipment_status(by_id[sid])
+
+    return {
+        "created": len(to_create),
+        "duplicates": duplicates,
+        "errors": errors,
+        "shipments": len(affected),
+    }
@@ -1,9 +1,10 @@
 import urllib.parse
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
 from django.utils.timezone import now
 
+from core.services.email_outbox import enqueue_email
+
 
 def build_tracking_urls(tracking_no: str, token: str | None = None) -> tuple[str, str]:
     """
@@ -36,23 +37,24 @@ def build_tracking_email_context(*, shipment, token: str | None = None,
     }
 
 
-def send_tracking_created_email(to_email: str, context: dict):
+def send_tracking_created_email(to_email: str, context: dict, *, user=None):
     """
-    Send dual-language tracking email (plain text + HTML).
+    Queue dual-language tracking email (plain text + HTML).
+    Actual SMTP delivery: `manage.py send_outbox` (core.services.email_outbox).
     """
     subject = f"Tracking Shipment Anda – {context.get('tracking_no', '')}".strip()
 
     text_body = render_to_string("emails/tracking_created_dual.txt", context)
     html_body = render_to_string("emails/tracking_created_dual.html", context)
 
-    msg = EmailMultiAlternatives(
+    return enqueue_email(
         subject=subject,
         body=text_body,
-        from_email=getattr(settings, "DEFAULT_FROM_EMAIL", None),
+        html_body=html_body,
         to=[to_email],
+        ref=f"tracking:{context.get('tracking_no', '')}",
+        user=user,
     )
-    msg.attach_alternative(html_body, "text/html")
-    msg.send()
 
 
 def build_whatsapp_message_dual(*, tracking_no: str, tracking_url: str, track_home_url: str) -> str:
@@ -1,67 +1,136 @@
-from shipments.models import ShipmentStatus
-
-STATUS_RANK = {
-    ShipmentStatus.DRAFT: 10,
-    ShipmentStatus.PICKUP: 20,
-    ShipmentStatus.IN_TRANSIT: 30,
-    ShipmentStatus.OUT_FOR_DELIVERY: 40,
-    ShipmentStatus.DELIVERED: 50,
-    ShipmentStatus.EXCEPTION: 90,
-    ShipmentStatus.CANCELED: 99,
-}
+from django.db import transaction
+
+from shipments.models import Shipment, ShipmentStatus
+from shipments.services.tracking_cache import invalidate_tracking
 
+# event positif -> status. Kode lain (PICKUP_COMPLETED, POD_UPLOADED, ...) tidak mengubah status.
 EVENT_TO_STATUS = {
     "PICKUP_SCHEDULED": ShipmentStatus.PICKUP,
     "PICKUP_DISPATCHED": ShipmentStatus.PICKUP,
-    "PICKUP_COMPLETED": ShipmentStatus.IN_TRANSIT,
 
     "DEPARTED": ShipmentStatus.IN_TRANSIT,
     "ARRIVED": ShipmentStatus.IN_TRANSIT,
 
+    # ops.py pakai OUT_FOR_DELIVERY, EventCode pakai OUTFORDELIVERY -> dua-duanya
+    "OUT_FOR_DELIVERY": ShipmentStatus.OUT_FOR_DELIVERY,
     "OUTFORDELIVERY": ShipmentStatus.OUT_FOR_DELIVERY,
-    "DELIVERED": ShipmentStatus.DELIVERED,
 
-    "EXCEPTION": ShipmentStatus.EXCEPTION,
+    "DELIVERED": ShipmentStatus.DELIVERED,
     "CANCELED": ShipmentStatus.CANCELED,
-
-    # none / non-affect
-    "SHIPMENT_CREATED": None,
-    "POD_UPLOADED": None,
-    "EXCEPTION_RESOLVED": None,  # handled specially
 }
 
-def bump_status(current, target):
-    if not target:
-        return current
-    if STATUS_RANK.get(target, 0) > STATUS_RANK.get(current, 0):
-        return target
-    return current
+# status yang "menang" begitu event-nya ada (urutan = prioritas)
+TERMINAL_CODES = ("CANCELED", "DELIVERED")
+
+
+def is_exception(code) -> bool:
+    # EXCEPTION + EXCEPTION_RESOLVED (sama dengan rule lama: code__startswith="EXCEPTION")
+    return (code or "").startswith("EXCEPTION")
+
+
+def rollup_status(rows, current=None) -> str:
+    """
+    rows = (id, code, event_time) event affects_status=True, urut (event_time, id).
+    Rule:
+    - ada CANCELED -> CANCELED
+    - ada DELIVERED -> DELIVERED
+    - exception terakhir >= event positif terakhir -> EXCEPTION
+    - else map event positif terakhir -> status (tidak ter-map: status sekarang)
+    - tidak ada event -> DRAFT
+    """
+    codes = set()
+    last_exception = last_positive = None
+    for _id, code, ev_time in rows:
+        codes.add(code)
+        if is_exception(code):
+            last_exception = ev_time
+        else:
+            last_positive = (ev_time, code)
+
+    for code in TERMINAL_CODES:
+        if code in codes:
+            return EVENT_TO_STATUS[code]
+
+    if last_exception is not None and (last_positive is None or last_exception >= last_positive[0]):
+        return ShipmentStatus.EXCEPTION
+    if last_positive is None:
+        return ShipmentStatus.DRAFT
+    return EVENT_TO_STATUS.get(last_positive[1], current or ShipmentStatus.DRAFT)
+
+
+def next_status(current, code) -> str:
+    """
+    Status setelah 1 event yang lebih baru (event_time lebih besar) dari semua event sebelumnya.
+    Hanya valid kalau status sekarang bukan CANCELED/DELIVERED (caller replay untuk itu).
+    """
+    if code in TERMINAL_CODES:
+        return EVENT_TO_STATUS[code]
+    if is_exception(code):
+        return ShipmentStatus.EXCEPTION
+    return EVENT_TO_STATUS.get(code, current or ShipmentStatus.DRAFT)
+
+
+def _save_state(shipment, status, last_time, last_id):
+    Shipment.objects.filter(pk=shipment.pk).update(
+        status=status,
+        status_event_time=last_time,
+        status_event_id=last_id,
+    )
+    shipment.status = status
+    shipment.status_event_time = last_time
+    shipment.status_event_id = last_id
+    # .update() tidak memicu signal -> buang cache public tracking manual
+    invalidate_tracking(shipment.pk)
+
 
 def recompute_shipment_status(shipment):
     """
-    Recompute dari semua event affects_status=True agar robust.
+    Full replay semua event affects_status=True (1 query, linear) -> rollup_status().
     """
-    qs = shipment.events.filter(affects_status=True).order_by("event_time", "id")
+    rows = list(
+        shipment.events
+        .filter(affects_status=True)
+        .order_by("event_time", "id")
+        .values_list("id", "code", "event_time")
+    )
+
+    status = rollup_status(rows, shipment.status)
+    last_id, _code, last_time = rows[-1] if rows else (None, None, None)
+
+    if (shipment.status, shipment.status_event_time, shipment.status_event_id) != (status, last_time, last_id):
+        _save_state(shipment, status, last_time, last_id)
+    return status
 
-    status = ShipmentStatus.DRAFT
-    for ev in qs:
-        mapped = EVENT_TO_STATUS.get(ev.code)
 
-        if ev.code == "EXCEPTION_RESOLVED":
-            # balik ke status terbaik dari event sebelum exception (simple + aman)
-            prev = shipment.events.filter(
-                affects_status=True,
-                event_time__lte=ev.event_time,
-            ).exclude(code__in=["EXCEPTION", "EXCEPTION_RESOLVED"]).order_by("event_time", "id")
+@transaction.atomic
+def apply_status_event(ev) -> str:
+    """
+    Incremental: terapkan 1 event baru ke rollup state shipment (O(1)).
+    State = (status, status_event_time, status_event_id) = watermark event terakhir.
+    - event dengan event_time > watermark -> next_status() langsung
+    - event backfill / event_time sama dengan watermark / state belum ada /
+      status CANCELED atau DELIVERED (butuh tahu event mana yang ada) -> full replay
+    """
+    shipment = Shipment.objects.select_for_update().only(
+        "id", "status", "status_event_time", "status_event_id",
+    ).get(pk=ev.shipment_id)
 
-            tmp = ShipmentStatus.DRAFT
-            for pev in prev:
-                tmp = bump_status(tmp, EVENT_TO_STATUS.get(pev.code))
-            mapped = tmp
+    if not ev.affects_status:
+        return shipment.status
 
-        status = bump_status(status, mapped)
+    if (
+        shipment.status_event_id is None
+        or ev.event_time <= shipment.status_event_time
+        or shipment.status in (ShipmentStatus.CANCELED, ShipmentStatus.DELIVERED)
+    ):
+        status = recompute_shipment_status(shipment)
+    else:
+        status = next_status(shipment.status, ev.code)
+        _save_state(shipment, status, ev.event_time, ev.id)
 
-    if shipment.status != status:
-        shipment.status = status
-        shipment.save(update_fields=["status"])
+    # sinkronkan instance milik caller (tanpa query tambahan)
+    if ev._meta.get_field("shipment").is_cached(ev):
+        ev.shipment.status = status
+        ev.shipment.status_event_time = shipment.status_event_time
+        ev.shipment.status_event_id = shipment.status_event_id
     return status
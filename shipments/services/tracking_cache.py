@@ -0,0 +1,114 @@
+# shipments/services/tracking_cache.py
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+from shipments.models import Shipment
+
+
+# cache = LocMem per worker: invalidate hanya sampai di worker yang menulis,
+# worker lain melihat perubahan setelah TTL ini habis (ETag tetap sama kalau isi tidak berubah)
+CACHE_TTL_SECONDS = 60 * 60
+PAYLOAD_TTL_SECONDS = getattr(settings, "TRACKING_CACHE_TTL_SECONDS", 30)
+
+TRACKING_NO_KEY = "shipments:track:tn:{tracking_no}"
+PAYLOAD_KEY = "shipments:track:{kind}:{shipment_id}"
+
+# jenis payload public yang di-cache (1 per endpoint)
+KINDS = ("public_api", "public_track")
+
+
+def resolve_shipment_id(tracking_no: str) -> int | None:
+    """
+    tracking_no -> shipment_id (tidak pernah berubah; TTL supaya shipment yang dihapus tidak nyangkut).
+    """
+    key = TRACKING_NO_KEY.format(tracking_no=tracking_no)
+    sid = cache.get(key)
+    if sid is None:
+        sid = Shipment.objects.filter(tracking_no=tracking_no).values_list("id", flat=True).first()
+        if sid is None:
+            return None
+        cache.set(key, sid, CACHE_TTL_SECONDS)
+    return sid
+
+
+def last_modified_of(*timestamps) -> int:
+    """
+    Last-Modified dari data (bukan jam build cache): timestamp terbaru yang tidak None.
+    """
+    values = [t for t in timestamps if t is not None]
+    return int(max(values).timestamp()) if values else 0
+
+
+def get_tracking_payload(kind: str, shipment_id: int, builder):
+    """
+    Ambil payload public ter-serialize dari cache; build via builder(shipment_id) kalau miss.
+    builder return (data, last_modified epoch) atau None -> dianggap 404 (tidak di-cache).
+    data tidak boleh bergantung pada request (scheme/host): di-cache untuk semua client,
+    URL absolut dibentuk per response oleh view.
+    Return dict {"etag", "last_modified", "data"} atau None.
+    """
+    key = PAYLOAD_KEY.format(kind=kind, shipment_id=shipment_id)
+    entry = cache.get(key)
+    if entry is not None:
+        return entry
+
+    built = builder(shipment_id)
+    if built is None:
+        return None
+    data, last_modified = built
+
+    raw = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True).encode("utf-8")
+    entry = {
+        "etag": quote_etag(hashlib.sha256(raw).hexdigest()[:32]),
+        "last_modified": last_modified,
+        "data": data,
+    }
+    cache.set(key, entry, PAYLOAD_TTL_SECONDS)
+    return entry
+
+
+def is_not_modified(request, entry) -> bool:
+    """
+    Conditional GET: If-None-Match (prioritas) lalu If-Modified-Since.
+    """
+    inm = request.headers.get("If-None-Match")
+    if inm:
+        tags = {t.strip() for t in inm.split(",")}
+        return "*" in tags or entry["etag"] in tags or f"W/{entry['etag']}" in tags
+
+    ims = parse_http_date_safe(request.headers.get("If-Modified-Since") or "")
+    return ims is not None and entry["last_modified"] <= ims
+
+
+def apply_cache_headers(response, entry):
+    response["ETag"] = entry["etag"]
+    response["Last-Modified"] = http_date(entry["last_modified"])
+    # browser wajib revalidate -> dapat 304 murah dari cache server
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+def _delete_payloads(shipment_ids) -> None:
+    keys = [
+        PAYLOAD_KEY.format(kind=kind, shipment_id=sid)
+        for sid in shipment_ids if sid
+        for kind in KINDS
+    ]
+    if keys:
+        cache.delete_many(keys)
+
+
+def invalidate_tracking(*shipment_ids) -> None:
+    """
+    Buang payload setelah transaksi penulis commit: kalau dibuang sekarang, request public yang
+    jalan bersamaan bisa meng-cache ulang data sebelum commit.
+    """
+    shipment_ids = [sid for sid in shipment_ids if sid]
+    if shipment_ids:
+        transaction.on_commit(lambda: _delete_payloads(shipment_ids))
@@ -0,0 +1,20 @@
+# shipments/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from shipments.models import Shipment, ShipmentDocument, ShipmentEvent
+from shipments.services.tracking_cache import invalidate_tracking
+
+
+@receiver(post_save, sender=ShipmentEvent)
+@receiver(post_delete, sender=ShipmentEvent)
+@receiver(post_save, sender=ShipmentDocument)
+@receiver(post_delete, sender=ShipmentDocument)
+def _tracking_child_changed(sender, instance, **kwargs):
+    invalidate_tracking(instance.shipment_id)
+
+
+@receiver(post_save, sender=Shipment)
+@receiver(post_delete, sender=Shipment)
+def _tracking_shipment_changed(sender, instance, **kwargs):
+    invalidate_tracking(instance.pk)
@@ -7,7 +7,7 @@ from . import views
 #from shipments.models.vendor_bookings import VendorBooking, VendorBookingLine
 from shipments.api.public.views import PublicTrackShipmentView
 from shipments.views.ops import TripDispatchPickupView, TripDepartView, TripArriveView
-from shipments.views.ops import ShipmentPODUploadView
+from shipments.views.ops import ShipmentPODUploadView, OpsEventBatchView
 from django.views.decorators.csrf import csrf_exempt
 from django.urls import path
 from .api.internal.pod import ShipmentPodUploadView 
@@ -25,6 +25,7 @@ urlpatterns = [
    # SYSTEM (API)
 #path("api/public/track/<str:tracking_no>/", PublicTrackShipmentView.as_view(), name="public-track"),
 path("api/ops/trips/<int:trip_id>/dispatch/", csrf_exempt(TripDispatchPickupView.as_view()), name="ops-trip-dispatch"),
+path("api/ops/events/batch/", OpsEventBatchView.as_view(), name="ops-events-batch"),
 path("api/token/", obtain_auth_token),  # optional
 path("api/ops/shipments/<str:tracking_no>/pod/", ShipmentPodUploadView.as_view(), name="ops-shipment-pod"),
 
@@ -126,7 +126,7 @@ def cs_public_link_page(request):
                         "cargo_info": "-",
                     }
 
-                    send_tracking_created_email(to_email, context)
+                    send_tracking_created_email(to_email, context, user=request.user)
 
                     result = result or {}
                     result.update({
@@ -8,7 +8,8 @@ from rest_framework.views import APIView
 
 from shipments.models import Shipment, ShipmentDocument, ShipmentLegTrip
 from shipments.services import ops
-from shipments.services.event import create_event
+from shipments.services.event import create_event, create_shipment_event, create_events_bulk
+from shipments.models.event import EventCode
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 
@@ -16,7 +17,7 @@ from django.views.decorators.csrf import csrf_exempt
 from django.db import transaction
 
 from shipments.models import ShipmentEvent
-from shipments.services.status_rollup import recompute_shipment_status
+from shipments.services.status_rollup import apply_status_event
 
 
 @transaction.atomic
@@ -64,9 +65,9 @@ def create_event(
                 "created_by": created_by,
             },
         )
-        # If existing event returned, still ensure status is correct (optional)
-        if ev.affects_status:
-            recompute_shipment_status(shipment)
+        # Existing event returned -> status sudah diterapkan saat dibuat
+        if created and ev.affects_status:
+            apply_status_event(ev)
         return ev
 
     ev = ShipmentEvent.objects.create(
@@ -84,7 +85,7 @@ def create_event(
     )
 
     if ev.affects_status:
-        recompute_shipment_status(shipment)
+        apply_status_event(ev)
 
     return ev
 
@@ -205,3 +206,54 @@ class ShipmentPODUploadView(APIView):
             )
 
         return Response({"ok": True, "doc_id": doc.id}, status=status.HTTP_201_CREATED)
+
+
+class OpsEventBatchItemSerializer(serializers.Serializer):
+    tracking_no = serializers.CharField(required=False)
+    shipment_id = serializers.IntegerField(required=False)
+    code = serializers.ChoiceField(choices=EventCode.choices)
+    event_time = serializers.DateTimeField(required=False)
+    location_text = serializers.CharField(required=False, allow_blank=True, default="")
+    note = serializers.CharField(required=False, allow_blank=True, default="")
+    is_public = serializers.BooleanField(required=False, default=True)
+    affects_status = serializers.BooleanField(required=False, default=True)
+    dedupe_key = serializers.CharField(required=False, allow_blank=True, max_length=120)
+    source_ref = serializers.CharField(required=False, allow_blank=True, max_length=64)
+
+    def validate(self, attrs):
+        if not attrs.get("tracking_no") and not attrs.get("shipment_id"):
+            raise serializers.ValidationError("tracking_no atau shipment_id wajib diisi.")
+        return attrs
+
+
+class OpsEventBatchSerializer(serializers.Serializer):
+    source = serializers.CharField(required=False, default="INTEGRATION", max_length=32)
+    events = OpsEventBatchItemSerializer(many=True, allow_empty=False)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class OpsEventBatchView(APIView):
+    """
+    Bulk ingest event (carrier / trucking partner feed) lintas shipment.
+    Body: {"source": "INTEGRATION", "events": [{...}, ...]}
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    MAX_EVENTS = 5000
+
+    def post(self, request):
+        s = OpsEventBatchSerializer(data=request.data)
+        s.is_valid(raise_exception=True)
+
+        events = s.validated_data["events"]
+        if len(events) > self.MAX_EVENTS:
+            return Response(
+                {"detail": f"Maksimal {self.MAX_EVENTS} event per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        result = create_events_bulk(
+            events,
+            source=s.validated_data["source"],
+            created_by=request.user,
+        )
+        return Response(result, status=status.HTTP_200_OK)
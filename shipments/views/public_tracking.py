@@ -5,6 +5,13 @@ from rest_framework.throttling import ScopedRateThrottle
 from rest_framework import status as http_status
 
 from shipments.models import Shipment, ShipmentEvent
+from shipments.services.tracking_cache import (
+    apply_cache_headers,
+    get_tracking_payload,
+    is_not_modified,
+    last_modified_of,
+    resolve_shipment_id,
+)
 
 
 CODE_ALIASES = {
@@ -20,54 +27,64 @@ class PublicTrackAPIView(APIView):
     throttle_scope = "public_track"
 
     def get(self, request, tracking_no: str):
-        shipment = Shipment.objects.filter(tracking_no=tracking_no).first()
-        if not shipment:
+        shipment_id = resolve_shipment_id(tracking_no)
+        entry = get_tracking_payload("public_api", shipment_id, build_public_timeline) if shipment_id else None
+        if entry is None:
             return Response(
                 {"detail": "Tracking number not found."},
                 status=http_status.HTTP_404_NOT_FOUND,
             )
 
-        events = (
-            ShipmentEvent.objects
-            .filter(shipment=shipment, is_public=True)
-            .order_by("event_time", "id")
-        )
-
-        # ✅ DEDUPE (hapus event double yang persis sama)
-        seen = set()
-        timeline = []
-        best = {}  # key -> event dict
-
-        for e in events:
-            code = CODE_ALIASES.get(e.code, e.code)
-            location_text = e.location_text or ""
-            note = e.note or ""
-
-            # dedupe signature untuk public: code + event_time + location_text
-            key = (code, e.event_time, location_text)
-
-            candidate = {
-                "code": code,
-                "event_time": e.event_time,
-                "location_text": location_text,
-                "note": note,
-            }
-
-            if key not in best:
+        if is_not_modified(request, entry):
+            return apply_cache_headers(Response(status=http_status.HTTP_304_NOT_MODIFIED), entry)
+        return apply_cache_headers(Response(entry["data"], status=http_status.HTTP_200_OK), entry)
+
+
+def build_public_timeline(shipment_id: int):
+    shipment = Shipment.objects.filter(pk=shipment_id).only("id", "tracking_no", "status", "created_at").first()
+    if not shipment:
+        return None
+
+    events = (
+        ShipmentEvent.objects
+        .filter(shipment_id=shipment_id, is_public=True)
+        .order_by("event_time", "id")
+        .values("code", "event_time", "location_text", "note", "created_at")
+    )
+    modified = [shipment.created_at]
+
+    # ✅ DEDUPE (hapus event double yang persis sama)
+    best = {}  # key -> event dict
+
+    for e in events:
+        modified.append(e["created_at"])
+        code = CODE_ALIASES.get(e["code"], e["code"])
+        location_text = e["location_text"] or ""
+        note = e["note"] or ""
+
+        # dedupe signature untuk public: code + event_time + location_text
+        key = (code, e["event_time"], location_text)
+
+        candidate = {
+            "code": code,
+            "event_time": e["event_time"],
+            "location_text": location_text,
+            "note": note,
+        }
+
+        if key not in best:
+            best[key] = candidate
+        else:
+            # pilih yang note lebih informatif
+            if len(candidate["note"]) > len(best[key]["note"]):
                 best[key] = candidate
-            else:
-                # pilih yang note lebih informatif
-                if len(candidate["note"]) > len(best[key]["note"]):
-                    best[key] = candidate
-
-        timeline = list(best.values())
-        timeline.sort(key=lambda x: (x["event_time"], x["code"]))
-
-        return Response(
-            {
-                "tracking_no": shipment.tracking_no,
-                "status": shipment.status,
-                "timeline": timeline,
-            },
-            status=http_status.HTTP_200_OK,
-        )
+
+    timeline = list(best.values())
+    timeline.sort(key=lambda x: (x["event_time"], x["code"]))
+
+    data = {
+        "tracking_no": shipment.tracking_no,
+        "status": shipment.status,
+        "timeline": timeline,
+    }
+    return data, last_modified_of(*modified)
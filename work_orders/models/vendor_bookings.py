@@ -35,16 +35,11 @@ def q2(x):
 def compute_line_tax_amount(line) -> Decimal:
     """
     Hitung total pajak add-on dari VendorBookingLine.taxes
-    Asumsi Tax punya field `rate` (%)
+    -> work_orders.services.vendor_booking_totals (tax engine, memo per VB)
     """
-    base = Decimal(line.amount or 0)
-    total = Decimal("0")
+    from work_orders.services.vendor_booking_totals import compute_line_tax_amount as _compute
 
-    for t in line.taxes.all():
-        rate = Decimal(getattr(t, "rate", 0) or 0) / Decimal("100")
-        total += base * rate
-
-    return q2(total)
+    return _compute(line)
 
 
 def recompute_vendor_booking_totals(vb):
@@ -55,30 +50,9 @@ def recompute_vendor_booking_totals(vb):
     wht      = subtotal * wht_rate
     total    = subtotal + tax - wht
     """
-    subtotal = vb.lines.aggregate(s=Sum("amount"))["s"] or Decimal("0")
-
-    tax_total = Decimal("0")
-    for ln in vb.lines.all().prefetch_related("taxes"):
-        tax_total += compute_line_tax_amount(ln)
-
-    tax_total = q2(tax_total)
-
-    wht_rate = Decimal(getattr(vb, "wht_rate", 0) or 0) / Decimal("100")
-    wht_amount = q2(subtotal * wht_rate)
+    from work_orders.services.vendor_booking_totals import recompute_vendor_booking_totals as _recompute
 
-    vb.subtotal_amount = q2(subtotal)
-    vb.tax_amount = tax_total
-    vb.wht_amount = wht_amount
-    vb.total_amount = q2(vb.subtotal_amount + vb.tax_amount - vb.wht_amount)
-
-    vb.save(
-        update_fields=[
-            "subtotal_amount",
-            "tax_amount",
-            "wht_amount",
-            "total_amount",
-        ]
-    )
+    return _recompute(vb)
 
 
 class ServiceOrderMode(models.TextChoices):
@@ -338,19 +312,17 @@ class VendorBooking(models.Model):
         super().save(*args, **kwargs)
 
 
-    def _tax_amount_group(self, group: str) -> Decimal:
-        total = Decimal("0")
-        q2 = Decimal("0.01")
-        g = (group or "").upper()
+    def tax_breakdown(self, refresh: bool = False):
+        """
+        ✅ Semua pajak VB (PPN/PPH, per line, rate) dalam 1 query, di-memo di instance
+        -> ppn_amount / pph_amount / label rate tidak walk lines berulang kali.
+        """
+        from work_orders.services.vendor_booking_totals import vendor_booking_taxes
 
-        for ln in self.lines.all():   # <-- cukup all()
-            base = Decimal(ln.amount or 0)
-            for t in ln.taxes.all():
-                if (t.group or "").upper() == g:
-                    rate = Decimal(t.rate or 0)
-                    total += (base * (rate / Decimal("100"))).quantize(q2, rounding=ROUND_HALF_UP)
+        return vendor_booking_taxes(self, refresh=refresh)
 
-        return total
+    def _tax_amount_group(self, group: str) -> Decimal:
+        return self.tax_breakdown().group_amount(group)
 
 
     @property
@@ -364,31 +336,11 @@ class VendorBooking(models.Model):
 
     @property
     def ppn_label_rate_display(self) -> str:
-        rates = set()
-        for ln in self.lines.prefetch_related("taxes").all():
-            for t in ln.taxes.all():
-                if (t.group or "").upper() == "PPN":
-                    r = t.rate
-                    if r is not None:
-                        rates.add(str(r.normalize() if hasattr(r, "normalize") else r))
-        if not rates:
-            return "-"
-        rates = sorted(rates, key=lambda x: Decimal(x))
-        return f"PPN " + " + ".join([x + "%" for x in rates])
+        return self.tax_breakdown().rate_label("PPN")
 
     @property
     def pph_label_rate_display(self) -> str:
-        rates = set()
-        for ln in self.lines.prefetch_related("taxes").all():
-            for t in ln.taxes.all():
-                if (t.group or "").upper() == "PPH":
-                    r = t.rate
-                    if r is not None:
-                        rates.add(str(r.normalize() if hasattr(r, "normalize") else r))
-        if not rates:
-            return "-"
-        rates = sorted(rates, key=lambda x: Decimal(x))
-        return f"PPH " + " + ".join([x + "%" for x in rates])
+        return self.tax_breakdown().rate_label("PPH")
 
     @property
     def print_grand_total(self) -> Decimal:
@@ -1,5 +1,7 @@
 from decimal import Decimal, ROUND_HALF_UP
 
+from work_orders.services.vendor_booking_totals import vendor_booking_taxes
+
 Q2 = Decimal("0.01")
 
 def q2(x: Decimal) -> Decimal:
@@ -17,20 +19,10 @@ def calc_booking_totals(vb) -> dict:
       vb.discount_amount, vb.wht_rate
       line.amount already stored, taxes M2M with 'rate' in percent
     """
-    subtotal = Decimal("0")
-    tax_amount = Decimal("0")
-
-    lines_qs = vb.lines.all()
-    for ln in lines_qs:
-        subtotal += Decimal(str(ln.amount or "0"))
-
-        # taxes: each tax has .rate (percent)
-        for tx in ln.taxes.all():
-            rate = Decimal(str(getattr(tx, "rate", 0) or "0")) / Decimal("100")
-            tax_amount += (Decimal(str(ln.amount or "0")) * rate)
-
-    subtotal = q2(subtotal)
-    tax_amount = q2(tax_amount)
+    # subtotal + pajak dari tax engine (1 query, memo di vb)
+    taxes = vendor_booking_taxes(vb)
+    subtotal = taxes.subtotal
+    tax_amount = taxes.tax_total
 
     discount = q2(Decimal(str(vb.discount_amount or "0")))
     taxable_base = q2(subtotal - discount)
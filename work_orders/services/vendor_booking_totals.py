@@ -1,5 +1,12 @@
 from decimal import Decimal
-from django.db.models import Sum
+from django.db.models import DecimalField, F, Q, Sum
+from django.db.models.functions import Round
+
+from core.services.tax_engine import ROUND_PER_LINE, TaxBreakdown, document_taxes
+
+
+VB_TAX_BASE = ("amount",)
+AMOUNT_FIELD = DecimalField(max_digits=18, decimal_places=2)
 
 
 def _d(v, default="0") -> Decimal:
@@ -12,31 +19,37 @@ def _d(v, default="0") -> Decimal:
         return Decimal(default)
 
 
-def _tax_rate_percent(tax) -> Decimal:
+def vendor_booking_taxes(vb, *, refresh: bool = False) -> TaxBreakdown:
     """
-    Ambil rate dari core.Tax.
-    Default pakai 'rate'. Kalau model Tax kamu pakai nama lain,
-    ganti di sini (mis: percent).
+    Breakdown pajak VB (PPN/PPH/...) dari core.services.tax_engine:
+    1 query untuk semua line + taxes, di-memo di instance vb.
+    Pembulatan per line per tax (sama dengan print PPN/PPH).
     """
-    return _d(getattr(tax, "rate", 0) or 0)
+    return document_taxes(vb, base=VB_TAX_BASE, rounding=ROUND_PER_LINE, refresh=refresh)
 
 
 def compute_line_tax_amount(line) -> Decimal:
     """
     Pajak dihitung dari line.amount berdasarkan taxes M2M.
+    Line yang sudah tersimpan ambil dari breakdown VB (memo), tanpa query per line.
     """
-    base = _d(getattr(line, "amount", 0) or 0)
-    total = Decimal("0")
-
-    taxes = getattr(line, "taxes", None)
-    if taxes is None:
+    if line.pk is None or not line.vendor_booking_id:
         return Decimal("0.00")
+    return vendor_booking_taxes(line.vendor_booking).line_tax(line.pk)
 
-    for t in taxes.all():
-        rate = _tax_rate_percent(t) / Decimal("100")
-        total += (base * rate)
 
-    return total.quantize(Decimal("0.01"))
+def refresh_line_amounts(lines) -> int:
+    """
+    Set-based: amount = ROUND(qty * unit_price, 2) untuk queryset VendorBookingLine,
+    1 UPDATE, hanya baris yang beda. Return jumlah baris yang berubah.
+    """
+    expected = Round(F("qty") * F("unit_price"), 2, output_field=AMOUNT_FIELD)
+    return (
+        lines.order_by()
+        .filter(qty__isnull=False, unit_price__isnull=False)
+        .filter(Q(amount__isnull=True) | ~Q(amount=expected))
+        .update(amount=expected)
+    )
 
 
 def recompute_line_amounts(vb) -> None:
@@ -45,21 +58,13 @@ def recompute_line_amounts(vb) -> None:
     Panggil ini sebelum aggregate subtotal jika kamu tidak 100% yakin
     amount selalu dihitung di UpdateView.
     """
-    for ln in vb.lines.all():
-        qty = _d(getattr(ln, "qty", 0) or 0)
-        unit_price = _d(getattr(ln, "unit_price", 0) or 0)
-        amount = (qty * unit_price).quantize(Decimal("0.01"))
-
-        current = _d(getattr(ln, "amount", 0) or 0).quantize(Decimal("0.01"))
-        if current != amount:
-            ln.amount = amount
-            ln.save(update_fields=["amount"])
+    refresh_line_amounts(vb.lines.all())
 
 
 def recompute_vendor_booking_totals(vb, *, recompute_lines: bool = False):
     """
     subtotal = sum(lines.amount)
-    tax_total = sum(line taxes)
+    tax_total = sum(line taxes)  -> vendor_booking_taxes()
     wht_amount = subtotal * wht_rate%
     total_amount = subtotal - discount + tax_total - wht_amount
 
@@ -70,10 +75,7 @@ def recompute_vendor_booking_totals(vb, *, recompute_lines: bool = False):
 
     subtotal = _d(vb.lines.aggregate(s=Sum("amount"))["s"] or 0).quantize(Decimal("0.01"))
 
-    tax_total = Decimal("0")
-    for ln in vb.lines.all().prefetch_related("taxes"):
-        tax_total += compute_line_tax_amount(ln)
-    tax_total = tax_total.quantize(Decimal("0.01"))
+    tax_total = vendor_booking_taxes(vb, refresh=True).tax_total
 
     discount = _d(getattr(vb, "discount_amount", 0) or 0).quantize(Decimal("0.01"))
 
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from job.services.job_cost_vb import recompute_allocations
+from work_orders.models.vendor_bookings import VendorBooking
+
+
+@receiver(post_delete, sender=VendorBooking)
+def _vendor_booking_deleted(sender, instance, **kwargs):
+    # line ikut terhapus (CASCADE) -> alokasi JobCost di job order itu harus turun
+    if instance.job_order_id:
+        recompute_allocations(vendor_booking=instance)
@@ -8,6 +8,7 @@ from django.utils import timezone
 from django.views import View
 
 from work_orders.models.vendor_bookings import VendorBooking
+from job.services.job_cost_vb import recompute_allocations
 from shipments.models.shipping_instruction import (
     ShippingInstructionDocument,
     SeaShippingInstructionDetail,
@@ -191,6 +192,9 @@ class ServiceOrderCancelView(LoginRequiredMixin, View):
         vb.cancel_reason = reason
         vb.save(update_fields=["status", "cancelled_at", "cancelled_by", "cancel_reason"])
 
+        # qty VB cancelled tidak lagi dihitung sebagai alokasi JobCost
+        recompute_allocations(vendor_booking=vb)
+
         doc = getattr(vb, "shipping_instruction", None)
         if doc and doc.status != ShippingInstructionDocument.Status.CANCELLED:
             doc.status = ShippingInstructionDocument.Status.CANCELLED
@@ -1,8 +1,7 @@
 from decimal import Decimal
-from django.http import HttpResponse
 from django.template.loader import render_to_string
 from django.views import View
-from weasyprint import HTML
+from core.services.pdf_render import pdf_response
 from work_orders.models.vendor_bookings import VendorBooking
 
 
@@ -49,10 +48,11 @@ class VendorBookingPdfView(View):
             request=request,
         )
 
-        base_url = request.build_absolute_uri("/")
-        pdf_bytes = HTML(string=html, base_url=base_url).write_pdf()
-
         filename = f"VendorBooking-{vb.vb_number or vb.id}.pdf"
-        resp = HttpResponse(pdf_bytes, content_type="application/pdf")
-        resp["Content-Disposition"] = f'inline; filename="{filename}"'
-        return resp
\ No newline at end of file
+        return pdf_response(
+            request,
+            engine="weasyprint",
+            html=html,
+            filename=filename,
+            options={"base_url": request.build_absolute_uri("/")},
+        )
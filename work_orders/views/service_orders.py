@@ -14,6 +14,7 @@ from job.models.job_costs import JobCost
 
 from work_orders.models.vendor_bookings import VendorBooking, VendorBookingLine
 from django.views.generic import ListView, CreateView, DetailView, UpdateView, View
+from core.utils.keyset_pagination import KeysetPaginationMixin
 
 from work_orders.utils.heading import get_vendor_booking_heading
 from django.db import transaction
@@ -22,6 +23,7 @@ from work_orders.utils.heading import get_vendor_booking_heading
 
 from work_orders.services.vendor_booking_calc import calc_line_amount, calc_booking_totals
 from work_orders.services.vendor_booking_totals import recompute_vendor_booking_totals
+from job.services.job_cost_vb import recompute_allocations
 from work_orders.forms.vendor_bookings import VendorBookingForm, VendorBookingLineFormSet
 #from work_orders.services.vendor_booking_totals import recompute_vendor_booking_totals  as vbt
 
@@ -291,6 +293,7 @@ class VendorBookingFromJobCostWizardView(LoginRequiredMixin, TemplateView):
             ))
 
         VendorBookingLine.objects.bulk_create(vb_lines)
+        recompute_allocations(vendor_booking=vb)
 
         # sementara comment dulu untuk isolasi bug unit_price jadi 1
         # recompute_vendor_booking_totals(vb)
@@ -423,6 +426,9 @@ class VendorBookingUpdateView(View):
         # taxes M2M
         formset.save_m2m()
 
+        # ===== RECOMPUTE ALOKASI JOBCOST (vb_allocated_qty / vb_status, set-based) =====
+        recompute_allocations(vendor_booking=booking)
+
         # ===== RECOMPUTE TOTALS (tax + wht + total) =====
         recompute_vendor_booking_totals(booking)
 
@@ -460,7 +466,7 @@ class VendorBookingUpdateView(View):
         return ctx
 
 
-class VendorBookingListView(LoginRequiredMixin, ListView):
+class VendorBookingListView(KeysetPaginationMixin, LoginRequiredMixin, ListView):
     model = VendorBooking
     template_name = "service_orders/list.html"
     context_object_name = "items"
@@ -733,6 +739,7 @@ class VendorBookingCreateView(LoginRequiredMixin, TemplateView):
             ))
 
         VendorBookingLine.objects.bulk_create(vb_lines)
+        recompute_allocations(vendor_booking=vb)
         
 
         update_url = reverse("work_orders:service_order_update", args=[vb.id])